@@ -4,13 +4,65 @@
  *
  * 依赖：
  * - data-manager.js (dataManager, viewManager)
- * - knowledge-data.js (getDefaultKnowledgeTree, getStatusIcon等)
+ * - knowledge-outline.js 或 knowledge-data.js (getDefaultKnowledgeTree, getStatusIcon等)
  * - ai-adapter.js (callAI, isAIConfigured)
+ * - search-index.js (searchContent)，可选，用于知识点搜索
  */
 
 // ========== 全局状态 ==========
 let currentKnowledgeUnit = null;  // 当前查看的知识点ID
 let knowledgeStartTime = null;    // 学习开始时间
+let knowledgeSearchQuery = '';    // 知识点搜索框内容
+
+// 章节内容分片缓存 {章节ID: Promise<{知识点ID: content}>}
+const knowledgeShardCache = {};
+
+// ========== 知识点内容加载 ==========
+
+/**
+ * 获取知识点内容
+ * 使用 knowledge-outline.js 时知识点树只含大纲，内容按章节从分片延迟加载；
+ * 使用完整的 knowledge-data.js 时直接返回知识点自带的内容
+ * @param {Object} unit - 知识点（可能不含 content）
+ * @returns {Promise<Object>} 知识点内容
+ */
+async function getKnowledgeUnitContent(unit) {
+    if (unit.content) return unit.content;
+
+    // 本地保存的知识点树不含内容时，到默认知识点树中查找所属章节
+    for (const subject of Object.values(getDefaultKnowledgeTree())) {
+        for (const chapter of subject.chapters) {
+            const defaultUnit = chapter.units.find(u => u.id === unit.id);
+            if (!defaultUnit) continue;
+            if (defaultUnit.content) return defaultUnit.content;
+            const shard = await loadKnowledgeShard(chapter.id);
+            return shard[unit.id];
+        }
+    }
+    throw new Error('知识点不存在: ' + unit.id);
+}
+
+/**
+ * 加载章节内容分片（同一章节只请求一次，失败后允许重试）
+ * @param {string} chapterId - 章节ID
+ * @returns {Promise<Object>} {知识点ID: content}
+ */
+function loadKnowledgeShard(chapterId) {
+    if (!knowledgeShardCache[chapterId]) {
+        knowledgeShardCache[chapterId] = fetch(KNOWLEDGE_CHAPTER_SHARDS[chapterId])
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(`无法加载章节内容: ${chapterId}`);
+                }
+                return response.json();
+            })
+            .catch(error => {
+                delete knowledgeShardCache[chapterId];
+                throw error;
+            });
+    }
+    return knowledgeShardCache[chapterId];
+}
 
 // ========== 知识点树渲染 ==========
 
@@ -132,12 +184,88 @@ function toggleChapter(subjectKey, chapterId) {
     }
 }
 
+// ========== 知识点搜索 ==========
+
+let knowledgeSearchTimeout = null;
+
+/**
+ * 搜索框输入（防抖）
+ */
+function debounceKnowledgeSearch() {
+    clearTimeout(knowledgeSearchTimeout);
+    knowledgeSearchTimeout = setTimeout(() => {
+        knowledgeSearchQuery = document.getElementById('knowledgeSearch').value.trim();
+        refreshKnowledgeNav(currentKnowledgeUnit);
+    }, 300);
+}
+
+/**
+ * 渲染左侧导航：有搜索内容时显示搜索结果，否则显示知识点树
+ * @param {string} selectedUnitId - 当前选中的知识点ID
+ */
+async function refreshKnowledgeNav(selectedUnitId = null) {
+    const navContainer = document.querySelector('.knowledge-tree-nodes');
+    if (!navContainer) return;
+
+    const query = knowledgeSearchQuery;
+    if (!query || typeof searchContent !== 'function') {
+        renderKnowledgeTree(navContainer, selectedUnitId);
+        return;
+    }
+
+    const results = await searchContent(query);
+    // 检索期间搜索内容已变化
+    if (query !== knowledgeSearchQuery) return;
+    renderKnowledgeSearchResults(navContainer, results, selectedUnitId);
+}
+
+/**
+ * 渲染搜索结果：知识点可点击打开，真题显示题号和题干开头
+ * @param {HTMLElement} containerEl - 容器元素
+ * @param {Object[]} results - searchContent 的结果
+ * @param {string} selectedUnitId - 当前选中的知识点ID
+ */
+function renderKnowledgeSearchResults(containerEl, results, selectedUnitId = null) {
+    if (results.length === 0) {
+        containerEl.innerHTML = `<div class="knowledge-search-empty">没有找到相关内容（中文至少输入2个字）</div>`;
+        return;
+    }
+
+    const units = results.filter(r => r.kind === 'k');
+    const questions = results.filter(r => r.kind === 'q');
+    let html = '';
+
+    if (units.length > 0) {
+        html += `<div class="knowledge-search-group">知识点 (${units.length})</div>`;
+        html += units.map(r => `
+            <div class="tree-unit ${r.id === selectedUnitId ? 'active' : ''}"
+                 onclick="loadKnowledgeUnit('${r.id}')">
+                <span>${r.title}</span>
+            </div>
+        `).join('');
+    }
+
+    if (questions.length > 0) {
+        html += `<div class="knowledge-search-group">真题 (${questions.length})</div>`;
+        html += questions.map(r => {
+            const title = r.title.replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;');
+            return `
+                <div class="knowledge-search-question" title="${r.id}">
+                    <span class="badge">${r.id}</span> ${title}
+                </div>
+            `;
+        }).join('');
+    }
+
+    containerEl.innerHTML = html;
+}
+
 // ========== 知识点详情 ==========
 
 /**
  * 加载知识点详情
  */
-function loadKnowledgeUnit(unitId) {
+async function loadKnowledgeUnit(unitId) {
     const tree = dataManager.load('knowledgeTree', getDefaultKnowledgeTree());
     const progress = dataManager.load('learningProgress', {});
 
@@ -179,14 +307,21 @@ function loadKnowledgeUnit(unitId) {
     currentKnowledgeUnit = unitId;
     knowledgeStartTime = Date.now();
 
+    let content;
+    try {
+        content = await getKnowledgeUnitContent(unit);
+    } catch (error) {
+        console.error('加载知识点内容失败:', error);
+        return;
+    }
+    // 加载期间已切换到其他知识点
+    if (currentKnowledgeUnit !== unitId) return;
+
     // 渲染详情页面
-    renderKnowledgeDetail(unit, subject, chapter, progress[unitId]);
+    renderKnowledgeDetail({ ...unit, content }, subject, chapter, progress[unitId]);
 
-    // 重新渲染树（更新选中状态）
-    const treeContainer = document.querySelector('.knowledge-tree');
-    if (treeContainer) {
-        renderKnowledgeTree(treeContainer, unitId);
-    }
+    // 重新渲染树或搜索结果（更新选中状态）
+    refreshKnowledgeNav(unitId);
 
     // 渲染MathJax
     if (window.MathJax && window.MathJax.typesetPromise) {
@@ -420,6 +555,7 @@ async function expandWithAI(unitId) {
         }
 
         // 调用AI
+        const unitContent = await getKnowledgeUnitContent(unit);
         const messages = [
             {
                 role: 'user',
@@ -430,7 +566,7 @@ async function expandWithAI(unitId) {
 4. 指出常见易错点
 
 知识点标题：${unit.name}
-基础概念：${unit.content.concept}
+基础概念：${unitContent.concept}
 
 请生成详细的教学讲解。`
             }
@@ -512,6 +648,7 @@ async function generateMoreExamples(unitId) {
         if (!unit) throw new Error('知识点不存在');
 
         // 调用AI
+        const unitContent = await getKnowledgeUnitContent(unit);
         const messages = [
             {
                 role: 'user',
@@ -522,7 +659,7 @@ async function generateMoreExamples(unitId) {
 4. 每题后标注考查要点
 
 知识点：${unit.name}
-基础内容：${unit.content.concept}
+基础内容：${unitContent.concept}
 
 请生成3道练习题。`
             }
@@ -586,7 +723,11 @@ function renderKnowledgeView() {
         <div class="knowledge-container">
             <!-- 左侧知识点树 -->
             <div class="knowledge-tree">
-                <!-- 树形结构将由JavaScript生成 -->
+                <input type="text" id="knowledgeSearch" class="filter-input knowledge-search"
+                       placeholder="搜索知识点和真题..." oninput="debounceKnowledgeSearch()">
+                <div class="knowledge-tree-nodes">
+                    <!-- 树形结构或搜索结果将由JavaScript生成 -->
+                </div>
             </div>
 
             <!-- 右侧知识点详情 -->
@@ -602,9 +743,9 @@ function renderKnowledgeView() {
         </div>
     `;
 
-    // 渲染知识点树
-    const treeContainer = container.querySelector('.knowledge-tree');
-    renderKnowledgeTree(treeContainer);
+    // 渲染知识点树（保留搜索内容）
+    container.querySelector('#knowledgeSearch').value = knowledgeSearchQuery;
+    refreshKnowledgeNav();
 
     // 如果有当前知识点，加载它
     if (currentKnowledgeUnit) {
@@ -0,0 +1,1004 @@
+// 由 scripts/knowledge_compiler.py 根据 js/knowledge-data.js 生成，请勿直接编辑
+/**
+ * 知识点数据模块 - 考研数学学习助手
+ * 包含微积分、线性代数、概率论三大模块的核心知识点
+ *
+ * 数据结构:
+ * - 学科 (subject) -> 章节 (chapter) -> 知识点 (unit)
+ * - 每个知识点包含: 概念、公式、例题、学习要点
+ */
+
+/**
+ * 获取默认知识点树
+ * @returns {Object} 知识点树结构
+ */
+function getDefaultKnowledgeTree() {
+    return {
+        // ==================== 微积分 ====================
+        calculus: {
+            id: 'calculus',
+            name: '微积分',
+            icon: '📐',
+            progress: 0,
+            expanded: true,
+            chapters: [
+                // 第一章 函数与极限
+                {
+                    id: 'calc-ch1',
+                    name: '第一章 函数与极限',
+                    expanded: false,
+                    units: [
+                        {
+                            id: 'calc-1-1',
+                            name: '函数的概念',
+                            difficulty: 'basic',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-1-2',
+                            name: '函数的性质',
+                            difficulty: 'basic',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-1-3',
+                            name: '极限的概念',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-1-4',
+                            name: '极限的计算',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-1-5',
+                            name: '连续与间断',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        }
+                    ]
+                },
+                // 第二章 导数与微分
+                {
+                    id: 'calc-ch2',
+                    name: '第二章 导数与微分',
+                    expanded: false,
+                    units: [
+                        {
+                            id: 'calc-2-1',
+                            name: '导数的概念',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-2-2',
+                            name: '求导法则',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-2-3',
+                            name: '微分',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        }
+                    ]
+                },
+                // 第三章 中值定理与导数应用
+                {
+                    id: 'calc-ch3',
+                    name: '第三章 中值定理与导数应用',
+                    expanded: false,
+                    units: [
+                        {
+                            id: 'calc-3-1',
+                            name: '中值定理',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-3-2',
+                            name: '函数的单调性与极值',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-3-3',
+                            name: '函数凸凹性与拐点',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-3-4',
+                            name: '函数的渐近线',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        }
+                    ]
+                },
+                // 第四章 不定积分
+                {
+                    id: 'calc-ch4',
+                    name: '第四章 不定积分',
+                    expanded: false,
+                    units: [
+                        {
+                            id: 'calc-4-1',
+                            name: '不定积分的概念',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-4-2',
+                            name: '换元积分法',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-4-3',
+                            name: '分部积分法',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-4-4',
+                            name: '有理函数积分',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-4-5',
+                            name: '三角函数积分',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        }
+                    ]
+                },
+                // 第五章 定积分
+                {
+                    id: 'calc-ch5',
+                    name: '第五章 定积分',
+                    expanded: false,
+                    units: [
+                        {
+                            id: 'calc-5-1',
+                            name: '定积分的概念',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-5-2',
+                            name: '定积分的计算技巧',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-5-3',
+                            name: '定积分的应用',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-5-4',
+                            name: '反常积分',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        }
+                    ]
+                },
+                // 第六章 多元函数微分学
+                {
+                    id: 'calc-ch6',
+                    name: '第六章 多元函数微分学',
+                    expanded: false,
+                    units: [
+                        {
+                            id: 'calc-6-1',
+                            name: '多元函数的基本概念',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-6-2',
+                            name: '偏导数与全微分',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-6-3',
+                            name: '多元复合函数求导',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-6-4',
+                            name: '隐函数求导',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        }
+                    ]
+                },
+                // 第七章 多重积分
+                {
+                    id: 'calc-ch7',
+                    name: '第七章 多重积分',
+                    expanded: false,
+                    units: [
+                        {
+                            id: 'calc-7-1',
+                            name: '二重积分的概念',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-7-2',
+                            name: '二重积分的计算',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-7-3',
+                            name: '三重积分',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-7-4',
+                            name: '重积分的应用',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        }
+                    ]
+                },
+                // 第八章 曲线曲面积分
+                {
+                    id: 'calc-ch8',
+                    name: '第八章 曲线曲面积分',
+                    expanded: false,
+                    units: [
+                        {
+                            id: 'calc-8-1',
+                            name: '第一类曲线积分',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-8-2',
+                            name: '第二类曲线积分',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-8-3',
+                            name: '格林公式',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-8-4',
+                            name: '第一类曲面积分',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-8-5',
+                            name: '第二类曲面积分',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-8-6',
+                            name: '高斯公式',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-8-7',
+                            name: '斯托克斯公式',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        }
+                    ]
+                },
+                // 第九章 无穷级数
+                {
+                    id: 'calc-ch9',
+                    name: '第九章 无穷级数',
+                    expanded: false,
+                    units: [
+                        {
+                            id: 'calc-9-1',
+                            name: '级数收敛性',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-9-2',
+                            name: '正项级数',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-9-3',
+                            name: '任意项级数',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-9-4',
+                            name: '幂级数',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-9-5',
+                            name: '傅里叶级数',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        }
+                    ]
+                },
+                // 第十章 微分方程
+                {
+                    id: 'calc-ch10',
+                    name: '第十章 微分方程',
+                    expanded: false,
+                    units: [
+                        {
+                            id: 'calc-10-1',
+                            name: '一阶微分方程',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-10-2',
+                            name: '可降阶方程',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-10-3',
+                            name: '二阶常系数齐次方程',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'calc-10-4',
+                            name: '二阶常系数非齐次方程',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        }
+                    ]
+                }
+            ]
+        },
+
+        // ==================== 线性代数 ====================
+        linearAlgebra: {
+            id: 'linearAlgebra',
+            name: '线性代数',
+            icon: '📊',
+            progress: 0,
+            expanded: false,
+            chapters: [
+                // 第一章 行列式
+                {
+                    id: 'la-ch1',
+                    name: '第一章 行列式',
+                    expanded: false,
+                    units: [
+                        {
+                            id: 'la-1-1',
+                            name: '行列式的概念与性质',
+                            difficulty: 'basic',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'la-1-2',
+                            name: '行列式的计算',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'la-1-3',
+                            name: '行列式计算技巧',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'la-1-4',
+                            name: '克拉默法则',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        }
+                    ]
+                },
+                // 第二章 矩阵
+                {
+                    id: 'la-ch2',
+                    name: '第二章 矩阵',
+                    expanded: false,
+                    units: [
+                        {
+                            id: 'la-2-1',
+                            name: '矩阵的运算',
+                            difficulty: 'basic',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'la-2-2',
+                            name: '逆矩阵',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'la-2-3',
+                            name: '矩阵的秩',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'la-2-4',
+                            name: '分块矩阵',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'la-2-5',
+                            name: '矩阵方程',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        }
+                    ]
+                },
+                // 第三章 向量
+                {
+                    id: 'la-ch3',
+                    name: '第三章 向量',
+                    expanded: false,
+                    units: [
+                        {
+                            id: 'la-3-1',
+                            name: '向量的线性相关性',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'la-3-2',
+                            name: '向量空间与基',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'la-3-3',
+                            name: '施密特正交化',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'la-3-4',
+                            name: '向量空间的基与维数',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'la-3-5',
+                            name: '坐标变换',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        }
+                    ]
+                },
+                // 第四章 线性方程组
+                {
+                    id: 'la-ch4',
+                    name: '第四章 线性方程组',
+                    expanded: false,
+                    units: [
+                        {
+                            id: 'la-4-1',
+                            name: '齐次线性方程组',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'la-4-2',
+                            name: '非齐次线性方程组',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'la-4-3',
+                            name: '方程组解的结构',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        }
+                    ]
+                },
+                // 第五章 特征值与特征向量
+                {
+                    id: 'la-ch5',
+                    name: '第五章 特征值与特征向量',
+                    expanded: false,
+                    units: [
+                        {
+                            id: 'la-5-1',
+                            name: '特征值与特征向量',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'la-5-2',
+                            name: '相似矩阵与对角化',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'la-5-3',
+                            name: '实对称矩阵',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'la-5-4',
+                            name: '相似对角化的应用',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'la-5-5',
+                            name: '正交对角化的应用',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        }
+                    ]
+                },
+                // 第六章 二次型
+                {
+                    id: 'la-ch6',
+                    name: '第六章 二次型',
+                    expanded: false,
+                    units: [
+                        {
+                            id: 'la-6-1',
+                            name: '二次型及其标准形',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'la-6-2',
+                            name: '正定二次型',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'la-6-3',
+                            name: '二次型的规范形',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'la-6-4',
+                            name: '惯性定理',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        }
+                    ]
+                }
+            ]
+        },
+
+        // ==================== 概率论 ====================
+        probability: {
+            id: 'probability',
+            name: '概率论与数理统计',
+            icon: '🎲',
+            progress: 0,
+            expanded: false,
+            chapters: [
+                // 第一章 随机事件与概率
+                {
+                    id: 'prob-ch1',
+                    name: '第一章 随机事件与概率',
+                    expanded: false,
+                    units: [
+                        {
+                            id: 'prob-1-1',
+                            name: '概率的基本概念',
+                            difficulty: 'basic',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'prob-1-2',
+                            name: '条件概率与独立性',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'prob-1-3',
+                            name: '古典概型与几何概型',
+                            difficulty: 'basic',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'prob-1-4',
+                            name: '贝叶斯公式应用',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'prob-1-5',
+                            name: '事件的独立性',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        }
+                    ]
+                },
+                {
+                    id: 'prob-ch2',
+                    name: '第二章 随机变量及其分布',
+                    expanded: false,
+                    units: [
+                        {
+                            id: 'prob-2-1',
+                            name: '离散型随机变量',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'prob-2-2',
+                            name: '连续型随机变量',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'prob-2-3',
+                            name: '常见分布族',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'prob-2-4',
+                            name: '分布函数的性质',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        }
+                    ]
+                },
+                // 第三章 数字特征
+                {
+                    id: 'prob-ch3',
+                    name: '第三章 随机变量的数字特征',
+                    expanded: false,
+                    units: [
+                        {
+                            id: 'prob-3-1',
+                            name: '期望与方差',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'prob-3-2',
+                            name: '协方差与相关系数',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'prob-3-3',
+                            name: '切比雪夫不等式',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'prob-3-4',
+                            name: '矩与矩母函数',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'prob-3-5',
+                            name: '特殊分布的数字特征',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        }
+                    ]
+                },
+                {
+                    id: 'prob-ch4',
+                    name: '第四章 多维随机变量',
+                    expanded: false,
+                    units: [
+                        {
+                            id: 'prob-4-1',
+                            name: '二维随机变量及其分布',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'prob-4-2',
+                            name: '边缘分布与独立性',
+                            difficulty: 'intermediate',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'prob-4-3',
+                            name: '条件分布与随机变量函数',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'prob-4-4',
+                            name: '多维随机变量函数分布',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'prob-4-5',
+                            name: '二维随机变量函数的分布',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        }
+                    ]
+                },
+                {
+                    id: 'prob-ch5',
+                    name: '第五章 大数定律与中心极限定理',
+                    expanded: false,
+                    units: [
+                        {
+                            id: 'prob-5-1',
+                            name: '大数定律',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'prob-5-2',
+                            name: '中心极限定理',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'prob-5-3',
+                            name: '棣莫弗-拉普拉斯定理应用',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        }
+                    ]
+                },
+                // 第六章 数理统计基础
+                {
+                    id: 'prob-ch6',
+                    name: '第六章 数理统计基础',
+                    expanded: false,
+                    units: [
+                        {
+                            id: 'prob-6-1',
+                            name: '统计量与抽样分布',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'prob-6-2',
+                            name: '参数估计',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'prob-6-3',
+                            name: '区间估计与假设检验',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'prob-6-4',
+                            name: '估计量的评价标准',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        },
+                        {
+                            id: 'prob-6-5',
+                            name: '常用假设检验',
+                            difficulty: 'advanced',
+                            aiEnhanced: null,
+                            relatedProblems: []
+                        }
+                    ]
+                }
+            ]
+        }
+    };
+}
+
+// 辅助函数
+
+/**
+ * 获取状态图标
+ * @param {string} status - 状态
+ * @returns {string} - 图标
+ */
+function getStatusIcon(status) {
+    const icons = {
+        'not-started': '🔴',
+        'learning': '🟡',
+        'completed': '🟢',
+        'mastered': '⭐'
+    };
+    return icons[status] || '🔴';
+}
+
+/**
+ * 获取状态文本
+ * @param {string} status - 状态
+ * @returns {string} - 文本
+ */
+function getStatusText(status) {
+    const texts = {
+        'not-started': '未开始',
+        'learning': '学习中',
+        'completed': '已完成',
+        'mastered': '已掌握'
+    };
+    return texts[status] || '未开始';
+}
+
+/**
+ * 获取难度文本
+ * @param {string} difficulty - 难度
+ * @returns {string} - 文本
+ */
+function getDifficultyText(difficulty) {
+    const texts = {
+        'basic': '基础',
+        'intermediate': '中等',
+        'advanced': '进阶'
+    };
+    return texts[difficulty] || '基础';
+}
+
+/**
+ * 计算学科进度
+ * @param {Object} subject - 学科对象
+ * @param {Object} progress - 进度数据
+ * @returns {number} - 进度百分比
+ */
+function calculateSubjectProgress(subject, progress) {
+    let total = 0;
+    let completed = 0;
+
+    subject.chapters.forEach(chapter => {
+        chapter.units.forEach(unit => {
+            total++;
+            const status = progress[unit.id]?.status;
+            if (status === 'completed' || status === 'mastered') {
+                completed++;
+            }
+        });
+    });
+
+    return total > 0 ? Math.round(completed / total * 100) : 0;
+}
+
+// ========== 章节内容分片（生成） ==========
+const KNOWLEDGE_CHAPTER_SHARDS = {
+    'calc-ch1': 'data/knowledge/calc-ch1.bebbe803.json',
+    'calc-ch2': 'data/knowledge/calc-ch2.f0387828.json',
+    'calc-ch3': 'data/knowledge/calc-ch3.7c3aa7e1.json',
+    'calc-ch4': 'data/knowledge/calc-ch4.e41d292b.json',
+    'calc-ch5': 'data/knowledge/calc-ch5.720041d4.json',
+    'calc-ch6': 'data/knowledge/calc-ch6.8be388db.json',
+    'calc-ch7': 'data/knowledge/calc-ch7.156a1301.json',
+    'calc-ch8': 'data/knowledge/calc-ch8.43630a32.json',
+    'calc-ch9': 'data/knowledge/calc-ch9.47899691.json',
+    'calc-ch10': 'data/knowledge/calc-ch10.bbe5eaaf.json',
+    'la-ch1': 'data/knowledge/la-ch1.447ff5cb.json',
+    'la-ch2': 'data/knowledge/la-ch2.658feb8a.json',
+    'la-ch3': 'data/knowledge/la-ch3.1d2f9200.json',
+    'la-ch4': 'data/knowledge/la-ch4.120a2a81.json',
+    'la-ch5': 'data/knowledge/la-ch5.ca44b125.json',
+    'la-ch6': 'data/knowledge/la-ch6.6acbfcc8.json',
+    'prob-ch1': 'data/knowledge/prob-ch1.8244fa18.json',
+    'prob-ch2': 'data/knowledge/prob-ch2.0916b89d.json',
+    'prob-ch3': 'data/knowledge/prob-ch3.8113807d.json',
+    'prob-ch4': 'data/knowledge/prob-ch4.46b6fdb2.json',
+    'prob-ch5': 'data/knowledge/prob-ch5.61dec53d.json',
+    'prob-ch6': 'data/knowledge/prob-ch6.671de327.json'
+};
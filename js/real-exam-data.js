@@ -21,12 +21,71 @@ const examScoreLines = {
     2015: { national: 54, top: 85 }
 };
 
+// ========== 试卷结构与分值 ==========
+// 唯一的分值表：scripts/build_exam_bundle.py 读取此表计算各年份总分，并随数据包下发
+const examScoring = {
+    totalScore: 150,
+    timeLimit: 180, // 分钟
+    choice: { name: '选择题', count: 10, scorePerQuestion: 5 },
+    blank: { name: '填空题', count: 6, scorePerQuestion: 5 },
+    solve: { name: '解答题', count: 9, scores: [6, 6, 6, 8, 8, 8, 8, 10, 10] }
+};
+
 // ========== 真题数据加载 ==========
 let realExamData = {};
 let dataLoadPromises = {};
 
+// 预编译数据包（由 scripts/build_exam_bundle.py 生成），包含所有年份题目及索引
+let examBundle = null;
+let bundleLoadPromise = null;
+
+/**
+ * 加载真题数据包，不存在时返回 null（回退到逐年加载）
+ * @returns {Promise<Object|null>} 数据包
+ */
+function loadExamBundle() {
+    if (!bundleLoadPromise) {
+        bundleLoadPromise = fetch('data/real-exam-bundle.json')
+            .then(response => response.ok ? response.json() : null)
+            .then(bundle => {
+                if (bundle) {
+                    examBundle = bundle;
+                    // 分数线和分值表以数据包为准
+                    Object.assign(examScoreLines, bundle.scoreLines);
+                    Object.assign(examScoring, bundle.scoring);
+                }
+                return bundle;
+            })
+            .catch(() => null);
+    }
+    return bundleLoadPromise;
+}
+
+/**
+ * 将题目列表转换为内部数据结构
+ * @param {number} year - 年份
+ * @param {Object[]} data - 题目列表
+ * @returns {Object} 真题数据
+ */
+function buildExamData(year, data) {
+    const section = type => {
+        const questions = data.filter(q => q.type === type);
+        return { ...examScoring[type], count: questions.length, questions: questions };
+    };
+    return {
+        year: year,
+        totalScore: examScoring.totalScore,
+        timeLimit: examScoring.timeLimit,
+        sections: {
+            choice: section('choice'),
+            blank: section('blank'),
+            solve: section('solve')
+        }
+    };
+}
+
 /**
- * 从JSON文件异步加载指定年份的真题数据
+ * 异步加载指定年份的真题数据：优先从数据包读取，否则请求该年份的JSON文件
  * @param {number} year - 年份
  * @returns {Promise<Object>} 真题数据
  */
@@ -36,40 +95,21 @@ async function loadExamData(year) {
     }
 
     if (!dataLoadPromises[year]) {
-        dataLoadPromises[year] = fetch(`data/real-exam-${year}.json`)
-            .then(response => {
-                if (!response.ok) {
-                    throw new Error(`无法加载 ${year} 年数据`);
+        dataLoadPromises[year] = loadExamBundle()
+            .then(bundle => {
+                const ids = bundle && bundle.index.year[year];
+                if (ids) {
+                    return ids.map(id => bundle.questions[id]);
                 }
-                return response.json();
+                return fetch(`data/real-exam-${year}.json`).then(response => {
+                    if (!response.ok) {
+                        throw new Error(`无法加载 ${year} 年数据`);
+                    }
+                    return response.json();
+                });
             })
             .then(data => {
-                // 转换为内部数据结构
-                realExamData[year] = {
-                    year: year,
-                    totalScore: 150,
-                    timeLimit: 180,
-                    sections: {
-                        choice: {
-                            name: '选择题',
-                            count: data.filter(q => q.type === 'choice').length,
-                            scorePerQuestion: 5,
-                            questions: data.filter(q => q.type === 'choice')
-                        },
-                        blank: {
-                            name: '填空题',
-                            count: data.filter(q => q.type === 'blank').length,
-                            scorePerQuestion: 5,
-                            questions: data.filter(q => q.type === 'blank')
-                        },
-                        solve: {
-                            name: '解答题',
-                            count: data.filter(q => q.type === 'solve').length,
-                            scores: [10, 10, 10, 10, 12, 12, 12, 12, 12],
-                            questions: data.filter(q => q.type === 'solve')
-                        }
-                    }
-                };
+                realExamData[year] = buildExamData(year, data);
                 return realExamData[year];
             })
             .catch(error => {
@@ -81,6 +121,48 @@ async function loadExamData(year) {
     return dataLoadPromises[year];
 }
 
+/**
+ * 按年份、题型、知识点筛选题目ID（使用数据包中的预计算索引，条件之间取交集）
+ * @param {Object} filters - { year, type, knowledgePoint }，省略的条件不参与筛选
+ * @returns {Promise<string[]>} 题目ID数组，数据包不可用时为空数组
+ */
+async function queryExamQuestionIds(filters = {}) {
+    const bundle = await loadExamBundle();
+    if (!bundle) return [];
+
+    const lists = [];
+    if (filters.year !== undefined) lists.push(bundle.index.year[filters.year] || []);
+    if (filters.type !== undefined) lists.push(bundle.index.type[filters.type] || []);
+    if (filters.knowledgePoint !== undefined) lists.push(bundle.index.knowledgePoint[filters.knowledgePoint] || []);
+    if (lists.length === 0) return Object.keys(bundle.questions);
+
+    // 从最短的列表开始求交集
+    lists.sort((a, b) => a.length - b.length);
+    return lists.slice(1).reduce((result, list) => {
+        const allowed = new Set(list);
+        return result.filter(id => allowed.has(id));
+    }, lists[0]);
+}
+
+/**
+ * 获取题目（来自数据包）
+ * @param {string} id - 题目ID
+ * @returns {Object|null} 题目数据
+ */
+function getExamQuestion(id) {
+    return (examBundle && examBundle.questions[id]) || null;
+}
+
+/**
+ * 获取年份统计（题型数量、总分、知识点覆盖次数），无需加载题目
+ * @param {number} year - 年份
+ * @returns {Promise<Object|null>} 统计数据
+ */
+async function getExamStats(year) {
+    const bundle = await loadExamBundle();
+    return (bundle && bundle.stats[year]) || null;
+}
+
 /**
  * 预加载指定年份的数据
  * @param {number|number[]} years - 年份或年份数组
@@ -99,13 +181,11 @@ const legacyRealExamData = {
     // ==================== 2024年真题 ====================
     2024: {
         year: 2024,
-        totalScore: 150,
-        timeLimit: 180, // 分钟
+        totalScore: examScoring.totalScore,
+        timeLimit: examScoring.timeLimit,
         sections: {
             choice: {
-                name: '选择题',
-                count: 10,
-                scorePerQuestion: 5,
+                ...examScoring.choice,
                 questions: [
                     {
                         id: '2024-c-1',
@@ -182,9 +262,7 @@ const legacyRealExamData = {
                 ]
             },
             blank: {
-                name: '填空题',
-                count: 6,
-                scorePerQuestion: 5,
+                ...examScoring.blank,
                 questions: [
                     {
                         id: '2024-b-1',
@@ -217,9 +295,7 @@ const legacyRealExamData = {
                 ]
             },
             solve: {
-                name: '解答题',
-                count: 9,
-                scores: [10, 10, 10, 10, 12, 12, 12, 12, 12], // 每题分值
+                ...examScoring.solve,
                 questions: [
                     {
                         id: '2024-s-1',
@@ -274,108 +350,108 @@ $$|\\lambda E - A| = \\begin{vmatrix} \\lambda-1 & 1 & 0 \\\\ 1 & \\lambda-2 & 1
     // ==================== 2023年真题框架 ====================
     2023: {
         year: 2023,
-        totalScore: 150,
-        timeLimit: 180,
+        totalScore: examScoring.totalScore,
+        timeLimit: examScoring.timeLimit,
         sections: {
-            choice: { name: '选择题', count: 10, scorePerQuestion: 5, questions: [] },
-            blank: { name: '填空题', count: 6, scorePerQuestion: 5, questions: [] },
-            solve: { name: '解答题', count: 9, scores: [10, 10, 10, 10, 12, 12, 12, 12, 12], questions: [] }
+            choice: { ...examScoring.choice, questions: [] },
+            blank: { ...examScoring.blank, questions: [] },
+            solve: { ...examScoring.solve, questions: [] }
         }
     },
 
     // ==================== 2022年真题框架 ====================
     2022: {
         year: 2022,
-        totalScore: 150,
-        timeLimit: 180,
+        totalScore: examScoring.totalScore,
+        timeLimit: examScoring.timeLimit,
         sections: {
-            choice: { name: '选择题', count: 10, scorePerQuestion: 5, questions: [] },
-            blank: { name: '填空题', count: 6, scorePerQuestion: 5, questions: [] },
-            solve: { name: '解答题', count: 9, scores: [10, 10, 10, 10, 12, 12, 12, 12, 12], questions: [] }
+            choice: { ...examScoring.choice, questions: [] },
+            blank: { ...examScoring.blank, questions: [] },
+            solve: { ...examScoring.solve, questions: [] }
         }
     },
 
     // ==================== 2021年真题框架 ====================
     2021: {
         year: 2021,
-        totalScore: 150,
-        timeLimit: 180,
+        totalScore: examScoring.totalScore,
+        timeLimit: examScoring.timeLimit,
         sections: {
-            choice: { name: '选择题', count: 10, scorePerQuestion: 5, questions: [] },
-            blank: { name: '填空题', count: 6, scorePerQuestion: 5, questions: [] },
-            solve: { name: '解答题', count: 9, scores: [10, 10, 10, 10, 12, 12, 12, 12, 12], questions: [] }
+            choice: { ...examScoring.choice, questions: [] },
+            blank: { ...examScoring.blank, questions: [] },
+            solve: { ...examScoring.solve, questions: [] }
         }
     },
 
     // ==================== 2020年真题框架 ====================
     2020: {
         year: 2020,
-        totalScore: 150,
-        timeLimit: 180,
+        totalScore: examScoring.totalScore,
+        timeLimit: examScoring.timeLimit,
         sections: {
-            choice: { name: '选择题', count: 10, scorePerQuestion: 5, questions: [] },
-            blank: { name: '填空题', count: 6, scorePerQuestion: 5, questions: [] },
-            solve: { name: '解答题', count: 9, scores: [10, 10, 10, 10, 12, 12, 12, 12, 12], questions: [] }
+            choice: { ...examScoring.choice, questions: [] },
+            blank: { ...examScoring.blank, questions: [] },
+            solve: { ...examScoring.solve, questions: [] }
         }
     },
 
     // ==================== 2019年真题框架 ====================
     2019: {
         year: 2019,
-        totalScore: 150,
-        timeLimit: 180,
+        totalScore: examScoring.totalScore,
+        timeLimit: examScoring.timeLimit,
         sections: {
-            choice: { name: '选择题', count: 10, scorePerQuestion: 5, questions: [] },
-            blank: { name: '填空题', count: 6, scorePerQuestion: 5, questions: [] },
-            solve: { name: '解答题', count: 9, scores: [10, 10, 10, 10, 12, 12, 12, 12, 12], questions: [] }
+            choice: { ...examScoring.choice, questions: [] },
+            blank: { ...examScoring.blank, questions: [] },
+            solve: { ...examScoring.solve, questions: [] }
         }
     },
 
     // ==================== 2018年真题框架 ====================
     2018: {
         year: 2018,
-        totalScore: 150,
-        timeLimit: 180,
+        totalScore: examScoring.totalScore,
+        timeLimit: examScoring.timeLimit,
         sections: {
-            choice: { name: '选择题', count: 10, scorePerQuestion: 5, questions: [] },
-            blank: { name: '填空题', count: 6, scorePerQuestion: 5, questions: [] },
-            solve: { name: '解答题', count: 9, scores: [10, 10, 10, 10, 12, 12, 12, 12, 12], questions: [] }
+            choice: { ...examScoring.choice, questions: [] },
+            blank: { ...examScoring.blank, questions: [] },
+            solve: { ...examScoring.solve, questions: [] }
         }
     },
 
     // ==================== 2017年真题框架 ====================
     2017: {
         year: 2017,
-        totalScore: 150,
-        timeLimit: 180,
+        totalScore: examScoring.totalScore,
+        timeLimit: examScoring.timeLimit,
         sections: {
-            choice: { name: '选择题', count: 10, scorePerQuestion: 5, questions: [] },
-            blank: { name: '填空题', count: 6, scorePerQuestion: 5, questions: [] },
-            solve: { name: '解答题', count: 9, scores: [10, 10, 10, 10, 12, 12, 12, 12, 12], questions: [] }
+            choice: { ...examScoring.choice, questions: [] },
+            blank: { ...examScoring.blank, questions: [] },
+            solve: { ...examScoring.solve, questions: [] }
         }
     },
 
     // ==================== 2016年真题框架 ====================
     2016: {
         year: 2016,
-        totalScore: 150,
-        timeLimit: 180,
+        totalScore: examScoring.totalScore,
+        timeLimit: examScoring.timeLimit,
         sections: {
-            choice: { name: '选择题', count: 10, scorePerQuestion: 5, questions: [] },
-            blank: { name: '填空题', count: 6, scorePerQuestion: 5, questions: [] },
-            solve: { name: '解答题', count: 9, scores: [10, 10, 10, 10, 12, 12, 12, 12, 12], questions: [] }
+            choice: { ...examScoring.choice, questions: [] },
+            blank: { ...examScoring.blank, questions: [] },
+            solve: { ...examScoring.solve, questions: [] }
         }
     },
 
     // ==================== 2015年真题框架 ====================
     2015: {
         year: 2015,
-        totalScore: 150,
-        timeLimit: 180,
+        totalScore: examScoring.totalScore,
+        timeLimit: examScoring.timeLimit,
         sections: {
-            choice: { name: '选择题', count: 10, scorePerQuestion: 5, questions: [] },
-            blank: { name: '填空题', count: 6, scorePerQuestion: 5, questions: [] },
-            solve: { name: '解答题', count: 9, scores: [10, 10, 10, 10, 12, 12, 12, 12, 12], questions: [] }
+            choice: { ...examScoring.choice, questions: [] },
+            blank: { ...examScoring.blank, questions: [] },
+            solve: { ...examScoring.solve, questions: [] }
         }
     }
 };
@@ -405,10 +481,11 @@ function getRealExamByYearSync(year) {
  * @returns {number[]} 年份数组（降序）
  */
 function getAvailableYears() {
-    // 包含分数线中的年份和已加载的数据年份
+    // 包含分数线中的年份、数据包中的年份和已加载的数据年份
     const scoreYears = Object.keys(examScoreLines).map(Number);
+    const bundleYears = examBundle ? examBundle.years : [];
     const loadedYears = Object.keys(realExamData).map(Number);
-    const allYears = [...new Set([...scoreYears, ...loadedYears])];
+    const allYears = [...new Set([...scoreYears, ...bundleYears, ...loadedYears])];
     return allYears.sort((a, b) => b - a);
 }
 
@@ -469,5 +546,5 @@ function hasExamDataSync(year) {
 
 // ========== 初始化 ==========
 
-// 预加载已有的数据文件
-preloadExamData([2022, 2023, 2024]);
+// 预加载数据：有数据包时加载其中所有年份，否则加载已有的数据文件
+loadExamBundle().then(bundle => preloadExamData(bundle ? bundle.years : [2022, 2023, 2024]));
@@ -0,0 +1,152 @@
+/**
+ * 全文检索模块 - 考研数学学习助手
+ * 使用 scripts/build_search_index.py 离线生成的倒排索引（data/search-index.json）
+ * 检索知识点内容和历年真题，查询时只需对检索词的倒排表求交集
+ *
+ * 检索词：中文字二元组、LaTeX命令、英文单词（与 scripts/search_terms.py 的 tokenize 一致）
+ * 倒排表：按序文档编号的差值，变长整数编码后转为base64
+ */
+
+// 与 scripts/search_terms.py 中的 TERM_PATTERN 一致
+const SEARCH_TERM_PATTERN = /[一-鿿]+|\\[A-Za-z]+|[A-Za-z]{2,}/g;
+
+let searchIndex = null;
+let searchIndexLoadPromise = null;
+
+// 已解码的倒排表 {检索词: 文档编号数组}
+const decodedPostings = {};
+
+/**
+ * 加载检索索引，不存在时返回 null
+ * @returns {Promise<Object|null>} 索引
+ */
+function loadSearchIndex() {
+    if (!searchIndexLoadPromise) {
+        searchIndexLoadPromise = fetch('data/search-index.json')
+            .then(response => response.ok ? response.json() : null)
+            .then(index => {
+                searchIndex = index;
+                return index;
+            })
+            .catch(() => null);
+    }
+    return searchIndexLoadPromise;
+}
+
+/**
+ * 切分检索词（去重）
+ * @param {string} text - 文本
+ * @returns {string[]} 检索词
+ */
+function tokenizeSearchText(text) {
+    const terms = new Set();
+    for (const token of text.match(SEARCH_TERM_PATTERN) || []) {
+        if (token[0] >= '一' && token[0] <= '鿿') {
+            if (token.length === 1) {
+                terms.add(token);
+            }
+            for (let i = 0; i < token.length - 1; i++) {
+                terms.add(token.slice(i, i + 2));
+            }
+        } else {
+            terms.add(token.toLowerCase());
+        }
+    }
+    return [...terms];
+}
+
+/**
+ * 解码倒排表
+ * @param {string} encoded - base64编码的差值变长整数
+ * @returns {number[]} 有序文档编号
+ */
+function decodePostings(encoded) {
+    const bytes = atob(encoded);
+    const numbers = [];
+    let value = 0;
+    let shift = 0;
+    let previous = 0;
+    for (let i = 0; i < bytes.length; i++) {
+        const byte = bytes.charCodeAt(i);
+        value += (byte & 0x7f) * Math.pow(2, shift);
+        if (byte & 0x80) {
+            shift += 7;
+            continue;
+        }
+        previous += value;
+        numbers.push(previous);
+        value = 0;
+        shift = 0;
+    }
+    return numbers;
+}
+
+/**
+ * 获取检索词的倒排表（解码结果缓存）
+ * @param {string} term - 检索词
+ * @returns {number[]} 有序文档编号，检索词不存在时为空数组
+ */
+function getPostings(term) {
+    if (!decodedPostings[term]) {
+        const encoded = searchIndex.terms[term];
+        decodedPostings[term] = encoded ? decodePostings(encoded) : [];
+    }
+    return decodedPostings[term];
+}
+
+/**
+ * 求有序数组的交集
+ * @param {number[]} a - 有序文档编号
+ * @param {number[]} b - 有序文档编号
+ * @returns {number[]} 交集
+ */
+function intersectPostings(a, b) {
+    const result = [];
+    let i = 0;
+    let j = 0;
+    while (i < a.length && j < b.length) {
+        if (a[i] === b[j]) {
+            result.push(a[i]);
+            i++;
+            j++;
+        } else if (a[i] < b[j]) {
+            i++;
+        } else {
+            j++;
+        }
+    }
+    return result;
+}
+
+/**
+ * 检索知识点和真题：返回包含全部检索词的文档，标题中含查询文本的排在前面
+ * 二元组匹配不要求检索词相邻，极少数结果可能只是分别包含各个片段
+ * @param {string} query - 查询文本（中文至少2字）
+ * @param {Object} options - {kind: 'k' 知识点 / 'q' 真题, limit: 最多返回条数}
+ * @returns {Promise<Object[]>} [{kind, id, title, group}]，group 为章节ID或年份
+ */
+async function searchContent(query, options = {}) {
+    const index = await loadSearchIndex();
+    const terms = tokenizeSearchText(query);
+    if (!index || terms.length === 0) return [];
+
+    // 从最短的倒排表开始求交集
+    const lists = terms.map(getPostings).sort((a, b) => a.length - b.length);
+    let matched = lists[0];
+    for (let i = 1; i < lists.length && matched.length > 0; i++) {
+        matched = intersectPostings(matched, lists[i]);
+    }
+
+    const keyword = query.trim().toLowerCase();
+    const results = matched
+        .map(number => {
+            const [kind, id, title, group] = index.docs[number];
+            return { kind, id, title, group };
+        })
+        .filter(doc => !options.kind || doc.kind === options.kind);
+
+    // 稳定排序：标题命中优先，其余保持索引顺序（知识点在前，真题按年份倒序）
+    results.sort((a, b) =>
+        Number(b.title.toLowerCase().includes(keyword)) - Number(a.title.toLowerCase().includes(keyword)));
+    return options.limit ? results.slice(0, options.limit) : results;
+}
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+导入流程基准 - 考研数学学习助手
+用 data/real-exam-*.json 中的题目通过 reportlab 合成指定页数的试卷PDF（文字层页面 / 纯图像页面），
+分别测量 PDFTextExtractor（提取）、QuestionParser（解析）、DataExporter（导出）在多个规模下的吞吐量，
+结果写入JSON，可与之前的结果对比以发现性能回退
+
+用法:
+  python scripts/bench_import.py [--pages 10,50,200] [--repeat 3] [-j 1]
+  python scripts/bench_import.py --compare tmp/bench/import-20240101-120000.json [--threshold 0.15]
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import hashlib
+import platform
+import argparse
+import subprocess
+import tempfile
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Tuple
+
+import fitz
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+from reportlab.pdfgen import canvas
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_question_parser import SECTION_TITLES, format_question, load_questions
+from import_real_exams import (PARSER_VERSION, CandidateStreamWriter, DataExporter, PDFTextExtractor,
+                               QuestionParser)
+
+DEFAULT_OUTPUT_DIR = "tmp/bench"
+PDF_CACHE_DIR = "tmp/bench/pdfs"
+
+# reportlab 内置的中文CID字体，不依赖系统字体文件
+FONT_NAME = "STSong-Light"
+FONT_SIZE = 10
+LINE_HEIGHT = 14
+MARGIN = 50
+
+# 纯图像页面的渲染缩放倍数（1.5x 约 108 DPI）
+IMAGE_ZOOM = 1.5
+
+VARIANTS = ('text', 'image')
+
+BENCH_YEAR = 2024
+
+
+# ========== 合成试卷PDF ==========
+
+def iter_exam_lines(questions: List[Dict]) -> Iterator[str]:
+    """循环使用真题，按试卷排版无限产出文本行（每25题一套，含题型标题）"""
+    index = 0
+    while True:
+        question = questions[index % len(questions)]
+        if index % 25 == 0:
+            yield SECTION_TITLES[question['type']]
+        yield from format_question(index % 25 + 1, question).split("\n")
+        index += 1
+
+
+def wrap_line(c: canvas.Canvas, line: str, max_width: float) -> List[str]:
+    """按字符宽度折行（中文没有空格，逐字累计）"""
+    if not line:
+        return [""]
+    wrapped, current = [], ""
+    for char in line:
+        if current and c.stringWidth(current + char, FONT_NAME, FONT_SIZE) > max_width:
+            wrapped.append(current)
+            current = ""
+        current += char
+    wrapped.append(current)
+    return wrapped
+
+
+def write_text_pdf(questions: List[Dict], page_count: int, output_path: Path):
+    """生成带文字层的试卷PDF"""
+    pdfmetrics.registerFont(UnicodeCIDFont(FONT_NAME))
+    c = canvas.Canvas(str(output_path), pagesize=A4)
+    width, height = A4
+    lines = iter_exam_lines(questions)
+
+    wrapped = (part for line in lines for part in wrap_line(c, line, width - 2 * MARGIN))
+    lines_per_page = int((height - 2 * MARGIN) / LINE_HEIGHT)
+
+    for _ in range(page_count):
+        c.setFont(FONT_NAME, FONT_SIZE)
+        for row in range(lines_per_page):
+            c.drawString(MARGIN, height - MARGIN - row * LINE_HEIGHT, next(wrapped))
+        c.showPage()
+    c.save()
+
+
+def write_image_pdf(text_pdf_path: Path, output_path: Path):
+    """将文字层PDF的每页渲染为图像，生成没有文字层的扫描版PDF"""
+    c = canvas.Canvas(str(output_path), pagesize=A4)
+    width, height = A4
+    with fitz.open(text_pdf_path) as doc:
+        for page in doc:
+            pix = page.get_pixmap(matrix=fitz.Matrix(IMAGE_ZOOM, IMAGE_ZOOM), alpha=False)
+            c.drawImage(ImageReader(io.BytesIO(pix.tobytes("png"))), 0, 0, width=width, height=height)
+            c.showPage()
+    c.save()
+
+
+def synthetic_pdfs(questions: List[Dict], page_count: int, pdf_dir: Path) -> Dict[str, Path]:
+    """生成（或复用已生成的）各类型合成PDF，文件名包含题目数据的哈希"""
+    digest = hashlib.sha256(json.dumps(questions, sort_keys=True).encode('utf-8')).hexdigest()[:8]
+    pdf_dir.mkdir(parents=True, exist_ok=True)
+    paths = {variant: pdf_dir / f"exam-{variant}-{page_count}p-{digest}.pdf" for variant in VARIANTS}
+
+    if not paths['text'].exists():
+        write_text_pdf(questions, page_count, paths['text'])
+    if not paths['image'].exists():
+        write_image_pdf(paths['text'], paths['image'])
+    return paths
+
+
+# ========== 计时 ==========
+
+def best_of(repeat: int, func: Callable) -> Tuple[float, object]:
+    """重复执行，返回最快一次的耗时和结果；导入组件的进度输出不计入显示"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+    return best, result
+
+
+def record(stage: str, variant: str, pages: int, questions: int, seconds: float, **extra) -> Dict:
+    return dict({
+        "stage": stage,
+        "variant": variant,
+        "pages": pages,
+        "questions": questions,
+        "seconds": round(seconds, 6),
+        "pagesPerSec": round(pages / seconds, 2) if seconds else None,
+        "questionsPerSec": round(questions / seconds, 2) if seconds else None,
+    }, **extra)
+
+
+def bench_scale(questions: List[Dict], page_count: int, repeat: int, workers: int, pdf_dir: Path) -> List[Dict]:
+    """单个规模下各阶段的结果"""
+    paths = synthetic_pdfs(questions, page_count, pdf_dir)
+    results = []
+
+    # 提取：不使用页面文本缓存，测量真实的提取（及OCR）开销
+    extractor = PDFTextExtractor(workers=workers, cache=None)
+    text_pages = None
+    for variant in VARIANTS:
+        seconds, pages = best_of(repeat, lambda: extractor.extract_text(str(paths[variant])))
+        results.append(record("extract", variant, len(pages), 0, seconds,
+                              chars=sum(len(text) for _, text in pages),
+                              pdfBytes=paths[variant].stat().st_size))
+        if variant == 'text':
+            text_pages = pages
+
+    # 解析：使用文字层PDF的提取结果
+    parser = QuestionParser()
+    seconds, parsed = best_of(repeat, lambda: parser.parse_questions(text_pages, BENCH_YEAR))
+    results.append(record("parse", "text", len(text_pages), len(parsed), seconds))
+
+    # 导出：写入临时目录，不影响 data/ 和 review/
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for export_format in CandidateStreamWriter.FORMATS:
+            exporter = DataExporter(output_dir=tmp_dir, review_dir=tmp_dir,
+                                    temp_dir=os.path.join(tmp_dir, "pages"), export_format=export_format)
+            seconds, count = best_of(repeat, lambda: exporter.export_candidates(parsed, BENCH_YEAR))
+            results.append(record("export", export_format, len(text_pages), count, seconds,
+                                  outputBytes=exporter.candidate_json_path(BENCH_YEAR).stat().st_size))
+
+    return results
+
+
+def environment(args) -> Dict:
+    """运行环境，便于解释不同机器、不同版本之间的差异"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=Path(__file__).parent).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "timestamp": datetime.now().isoformat(timespec='seconds'),
+        "commit": commit,
+        "parserVersion": PARSER_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpuCount": os.cpu_count(),
+        "pymupdf": fitz.VersionBind,
+        "ocr": PDFTextExtractor.tesseract_available(),
+        "workers": args.workers,
+        "repeat": args.repeat,
+    }
+
+
+# ========== 结果对比 ==========
+
+def result_key(result: Dict) -> Tuple[str, str, int]:
+    return result["stage"], result["variant"], result["pages"]
+
+
+def compare(current: List[Dict], previous: List[Dict]) -> List[Tuple[Dict, Dict, float]]:
+    """按 阶段/类型/页数 匹配两次结果，返回 (本次, 上次, 耗时比)"""
+    previous_by_key = {result_key(r): r for r in previous}
+    pairs = []
+    for result in current:
+        old = previous_by_key.get(result_key(result))
+        if old and old["seconds"]:
+            pairs.append((result, old, result["seconds"] / old["seconds"]))
+    return pairs
+
+
+def print_results(results: List[Dict]):
+    print(f"{'阶段':<8}{'类型':<8}{'页数':>6}{'题数':>8}{'耗时(ms)':>12}{'页/秒':>12}{'题/秒':>12}")
+    for r in results:
+        questions_per_sec = f"{r['questionsPerSec']:.0f}" if r['questions'] else "-"
+        print(f"{r['stage']:<10}{r['variant']:<10}{r['pages']:>6}{r['questions'] or '-':>8}"
+              f"{r['seconds'] * 1000:>12.1f}{r['pagesPerSec']:>12.0f}{questions_per_sec:>12}")
+
+
+def main():
+    """主函数"""
+    arg_parser = argparse.ArgumentParser(description="导入流程基准（提取 / 解析 / 导出）")
+    arg_parser.add_argument("--pages", default="10,50,200", help="合成PDF的页数，逗号分隔（默认10,50,200）")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="每项重复次数，取最快一次（默认3）")
+    arg_parser.add_argument("-j", "--workers", type=int, default=1, help="PDF提取进程数（0表示使用全部CPU核心，默认1）")
+    arg_parser.add_argument("--output", help=f"结果JSON路径（默认 {DEFAULT_OUTPUT_DIR}/import-<时间>.json）")
+    arg_parser.add_argument("--compare", help="与之前的结果JSON对比")
+    arg_parser.add_argument("--threshold", type=float, default=0.15,
+                            help="耗时增加超过该比例视为回退，对比时存在回退则退出码为1（默认0.15）")
+    args = arg_parser.parse_args()
+
+    page_counts = [int(n) for n in args.pages.split(",") if n.strip()]
+    questions = load_questions()
+    if not questions:
+        print("❌ data/ 中没有 real-exam-YYYY.json 文件")
+        sys.exit(1)
+
+    print(f"🚀 导入流程基准: {len(questions)} 道真题合成 {', '.join(map(str, page_counts))} 页PDF")
+    env = environment(args)
+    if not env["ocr"]:
+        print("⚠️ tesseract 不可用，纯图像页面只计入渲染和文字层检查，不含OCR")
+
+    results = []
+    for page_count in page_counts:
+        print(f"📄 {page_count} 页...")
+        results.extend(bench_scale(questions, page_count, args.repeat, args.workers, Path(PDF_CACHE_DIR)))
+
+    print()
+    print_results(results)
+
+    output_path = Path(args.output) if args.output else \
+        Path(DEFAULT_OUTPUT_DIR) / f"import-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump({"environment": env, "results": results}, f, ensure_ascii=False, indent=2)
+    print(f"\n✅ 结果已写入 {output_path}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+        pairs = compare(results, previous["results"])
+        print(f"\n📊 与 {args.compare} 对比（{previous['environment'].get('commit') or '未知版本'}）:")
+        regressions = 0
+        for result, old, ratio in pairs:
+            mark = ""
+            if ratio > 1 + args.threshold:
+                mark = " ⚠️ 回退"
+                regressions += 1
+            print(f"  {result['stage']:<8}{result['variant']:<8}{result['pages']:>6} 页  "
+                  f"{old['seconds'] * 1000:9.1f} → {result['seconds'] * 1000:9.1f} ms  ({ratio:.2f}x){mark}")
+        if regressions:
+            print(f"\n❌ {regressions} 项耗时增加超过 {args.threshold:.0%}")
+            sys.exit(1)
+        print("\n🎉 没有发现性能回退")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+题目解析器吞吐量基准 - 考研数学学习助手
+用 data/real-exam-*.json 中的题目合成试卷页面文本，
+对比词法分析器版 QuestionParser 与旧版逐行正则解析器的吞吐量。
+旧版会把整页合并成一行、只产出每页一个题目候选，按页计的速度不能直接比较，
+因此同时统计题干与原题一致的题目数，并按正确题目计算吞吐量；
+计时前先检查 REGRESSION_CASES，解析结果不符时以状态码 1 退出
+
+用法: python scripts/bench_question_parser.py [--pages N] [--repeat N] [--check]
+"""
+
+import re
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from collections import Counter
+from typing import List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from import_real_exams import QuestionCandidate, QuestionParser
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+SECTION_TITLES = {'choice': '一、选择题', 'blank': '二、填空题', 'solve': '三、解答题'}
+
+# 解析回归用例：(页面文本, [(题型, 题干, 选项)])
+REGRESSION_CASES = [
+    # 题干中空格之后的 "A、"、"B 为" 不是选项
+    ("22. (本题满分11分) 设 A、B 为两个随机事件，且 P(A)=0.5，求 P(A∪B)",
+     [('solve', '设 A、B 为两个随机事件，且 P(A)=0.5，求 P(A∪B)', None)]),
+    # 题干中的 "A. 求" 不是选项
+    ("23. 设矩阵 A. 求 A 的特征值",
+     [('solve', '设矩阵 A. 求 A 的特征值', None)]),
+    # 解答题部分行首的 "A." 不是选项，并回题干
+    ("三、解答题\n19. (10分) 已知 A、B 为 n 阶矩阵\nA. 矩阵 A 可逆\n证明 AB=BA",
+     [('solve', '已知 A、B 为 n 阶矩阵\nA. 矩阵 A 可逆\n证明 AB=BA', None)]),
+    # 行首的 A 开始选项，同一行内依次出现的 (B)、(D) 仍是选项
+    ("一、选择题\n1. 设 A、B 为随机事件，则\n(A) P(A)=0 (B) P(B)=0\n(C) P(AB)=0 (D) P(A∪B)=1",
+     [('choice', '设 A、B 为随机事件，则',
+       ['A. P(A)=0', 'B. P(B)=0', 'C. P(AB)=0', 'D. P(A∪B)=1'])]),
+    # 题干行首的 "A、B 均为" 被之后真正的 (A) 取代，并回题干
+    ("1. 下列说法正确的是\nA、B 均为方阵时\n(A) AB=BA\n(B) |AB|=|A||B|\n(C) A+B 可逆\n(D) AB 可逆",
+     [('choice', '下列说法正确的是\nA、B 均为方阵时',
+       ['A. AB=BA', 'B. |AB|=|A||B|', 'C. A+B 可逆', 'D. AB 可逆'])]),
+]
+
+
+class LegacyQuestionParser:
+    """旧版逐行正则解析器（词法分析器引入前的实现），仅作为基准对比的参照"""
+
+    def __init__(self):
+        # 题目类型识别模式
+        self.choice_pattern = re.compile(r'^(\d+)\.?\s*\(?([A-D])\)?', re.MULTILINE)
+        self.blank_pattern = re.compile(r'(\d+)\.\s*\([^)]*____[^)]*\)', re.MULTILINE)
+        self.solve_pattern = re.compile(r'(\d+)\.\s*\([^)]*分[^)]*\)', re.MULTILINE)
+
+        # 选项识别模式
+        self.option_pattern = re.compile(r'^([A-D])\.?\s*(.+)$', re.MULTILINE)
+
+        # 答案识别模式
+        self.answer_pattern = re.compile(r'答案[：:]\s*([A-D]|\d+|[^。\n]+)', re.MULTILINE)
+
+        # 分数识别模式
+        self.score_pattern = re.compile(r'\((\d+)分\)', re.MULTILINE)
+
+    def parse_questions(self, pages_text: List[Tuple[int, str]], year: int) -> List[QuestionCandidate]:
+        """解析题目"""
+        questions = []
+
+        for page_num, text in pages_text:
+            page_questions = self._parse_page_questions(text, year, page_num)
+            questions.extend(page_questions)
+
+        return questions
+
+    def _parse_page_questions(self, text: str, year: int, page_num: int) -> List[QuestionCandidate]:
+        """解析单页题目"""
+        questions = []
+
+        # 清理文本
+        text = self._clean_text(text)
+
+        # 分割题目（通常以数字开头）
+        question_blocks = self._split_questions(text)
+
+        for i, block in enumerate(question_blocks):
+            question = self._parse_single_question(block, year, i + 1, page_num)
+            if question:
+                questions.append(question)
+
+        return questions
+
+    def _clean_text(self, text: str) -> str:
+        """清理文本"""
+        # 移除多余空白
+        text = re.sub(r'\n+', '\n', text)
+        text = re.sub(r'\s+', ' ', text)
+        return text.strip()
+
+    def _split_questions(self, text: str) -> List[str]:
+        """分割题目块"""
+        # 按题号分割
+        questions = []
+        lines = text.split('\n')
+
+        current_question = []
+        for line in lines:
+            # 检查是否是新题目的开始
+            if re.match(r'^\d+\.', line.strip()):
+                if current_question:
+                    questions.append('\n'.join(current_question))
+                current_question = [line]
+            else:
+                if current_question:
+                    current_question.append(line)
+
+        if current_question:
+            questions.append('\n'.join(current_question))
+
+        return questions
+
+    def _parse_single_question(self, block: str, year: int, question_num: int, page_num: int) -> Optional[QuestionCandidate]:
+        """解析单个题目"""
+        try:
+            # 确定题目类型
+            question_type = self._determine_question_type(block)
+
+            if not question_type:
+                return None
+
+            # 生成题目ID
+            type_prefix = {'choice': 'c', 'blank': 'b', 'solve': 's'}[question_type]
+            question_id = f"{year}-{type_prefix}-{question_num}"
+
+            question = QuestionCandidate(
+                id=question_id,
+                type=question_type,
+                content=block,
+                page_num=page_num,
+                confidence=0.5,  # 基础置信度
+                parsing_notes="自动解析，需要人工审核"
+            )
+
+            # 根据类型解析具体内容
+            if question_type == 'choice':
+                self._parse_choice_question(question, block)
+            elif question_type == 'blank':
+                self._parse_blank_question(question, block)
+            elif question_type == 'solve':
+                self._parse_solve_question(question, block)
+
+            return question
+
+        except Exception as e:
+            print(f"Error parsing question {question_num}: {e}")
+            return None
+
+    def _determine_question_type(self, block: str) -> Optional[str]:
+        """确定题目类型"""
+        # 检查是否有选项（选择题特征）
+        if self.option_pattern.search(block):
+            return 'choice'
+
+        # 检查是否有填空符号
+        if '____' in block or '（　　）' in block:
+            return 'blank'
+
+        # 检查是否有分数（解答题特征）
+        if self.score_pattern.search(block):
+            return 'solve'
+
+        # 默认当作解答题
+        return 'solve'
+
+    def _parse_choice_question(self, question: QuestionCandidate, block: str):
+        """解析选择题"""
+        lines = block.split('\n')
+        content_lines = []
+        options = []
+
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+
+            # 检查是否是选项
+            option_match = self.option_pattern.match(line)
+            if option_match:
+                options.append(f"{option_match.group(1)}. {option_match.group(2)}")
+            else:
+                content_lines.append(line)
+
+        question.content = '\n'.join(content_lines)
+        question.options = options[:4]  # 最多4个选项
+
+        # 尝试提取答案
+        answer_match = self.answer_pattern.search(block)
+        if answer_match:
+            question.answer = answer_match.group(1).strip()
+
+    def _parse_blank_question(self, question: QuestionCandidate, block: str):
+        """解析填空题"""
+        # 填空题内容就是整个block
+        question.content = block
+
+        # 尝试提取答案
+        answer_match = self.answer_pattern.search(block)
+        if answer_match:
+            answer = answer_match.group(1).strip()
+            question.answer = answer
+            question.accepted_answers = [answer]
+
+    def _parse_solve_question(self, question: QuestionCandidate, block: str):
+        """解析解答题"""
+        lines = block.split('\n')
+        content_lines = []
+
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+
+            # 提取分数
+            score_match = self.score_pattern.search(line)
+            if score_match:
+                question.score = int(score_match.group(1))
+                # 移除分数信息
+                line = self.score_pattern.sub('', line).strip()
+
+            content_lines.append(line)
+
+        question.content = '\n'.join(content_lines)
+
+        # 解答题通常需要完整的答案和解题步骤
+        # 这里暂时只设置基本结构
+
+
+def load_questions() -> List[dict]:
+    """读取所有年份的真题"""
+    questions = []
+    for json_file in sorted(DATA_DIR.glob("real-exam-[0-9][0-9][0-9][0-9].json")):
+        with open(json_file, 'r', encoding='utf-8') as f:
+            questions.extend(json.load(f))
+    return questions
+
+
+def format_question(num: int, question: dict) -> str:
+    """按试卷排版格式化一道题"""
+    lines = [f"{num}. {question['content']}"]
+    if question['type'] == 'solve':
+        lines[0] += f" ({question.get('score', 10)}分)"
+    for option in question.get('options', []):
+        letter, _, text = option.partition('. ')
+        lines.append(f"({letter}) {text}")
+    lines.append(f"答案：{question.get('answer', '')}")
+    return "\n".join(lines)
+
+
+def build_pages(questions: List[dict], page_count: int, questions_per_page: int = 4) -> List[Tuple[int, str]]:
+    """循环使用真题合成指定页数的页面文本"""
+    pages = []
+    index = 0
+    for page_num in range(1, page_count + 1):
+        blocks = []
+        for _ in range(questions_per_page):
+            question = questions[index % len(questions)]
+            if index % 25 == 0:
+                blocks.append(SECTION_TITLES[question['type']])
+            blocks.append(format_question(index % 25 + 1, question))
+            index += 1
+        pages.append((page_num, "\n".join(blocks)))
+    return pages
+
+
+def normalize_content(content: str) -> str:
+    return ' '.join(content.split())
+
+
+def expected_contents(questions: List[dict], count: int) -> Counter:
+    """build_pages 合成的前 count 道题的题干（空白归一化）"""
+    return Counter(normalize_content(questions[index % len(questions)]['content']) for index in range(count))
+
+
+def count_correct(parsed: List[QuestionCandidate], expected: Counter) -> int:
+    """题干与原题一致的题目数（每道原题最多计一次）"""
+    remaining = Counter(expected)
+    correct = 0
+    for question in parsed:
+        content = normalize_content(question.content)
+        if remaining[content] > 0:
+            remaining[content] -= 1
+            correct += 1
+    return correct
+
+
+def check_regressions(parser: QuestionParser) -> List[str]:
+    """逐个解析回归用例，返回不符的描述"""
+    failures = []
+    for text, expected in REGRESSION_CASES:
+        actual = [(q.type, q.content, q.options) for q in parser.parse_questions([(1, text)], 2024)]
+        if actual != expected:
+            failures.append(f"{text!r}\n    期望: {expected}\n    实际: {actual}")
+    return failures
+
+
+def bench(parser, pages: List[Tuple[int, str]], repeat: int) -> Tuple[float, List[QuestionCandidate]]:
+    """返回最快一次的耗时和解析出的题目"""
+    best = float('inf')
+    parsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parsed = parser.parse_questions(pages, 2024)
+        best = min(best, time.perf_counter() - start)
+    return best, parsed
+
+
+def main():
+    """主函数"""
+    arg_parser = argparse.ArgumentParser(description="题目解析器吞吐量基准")
+    arg_parser.add_argument("--pages", type=int, default=500, help="合成页数（默认500）")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="重复次数，取最快一次（默认5）")
+    arg_parser.add_argument("--check", action="store_true", help="只检查回归用例，不计时")
+    args = arg_parser.parse_args()
+
+    failures = check_regressions(QuestionParser())
+    if failures:
+        print(f"❌ {len(failures)} 个回归用例不符:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print(f"✅ {len(REGRESSION_CASES)} 个回归用例通过")
+    if args.check:
+        return
+
+    questions = load_questions()
+    pages = build_pages(questions, args.pages)
+    expected = expected_contents(questions, args.pages * 4)
+    total_mb = sum(len(text.encode('utf-8')) for _, text in pages) / 1024 / 1024
+    print(f"合成页面: {len(pages)} 页, {total_mb:.2f} MB, {sum(expected.values())} 道题")
+    print("-" * 60)
+
+    results = {}
+    for name, parser in [("legacy", LegacyQuestionParser()), ("lexer", QuestionParser())]:
+        seconds, parsed = bench(parser, pages, args.repeat)
+        correct = count_correct(parsed, expected)
+        results[name] = (seconds, len(parsed), correct)
+        print(f"{name:8s} {seconds * 1000:9.1f} ms  {len(pages) / seconds:10.0f} 页/秒  "
+              f"{total_mb / seconds:7.1f} MB/秒  {len(parsed) / seconds:8.0f} 题/秒  "
+              f"{len(parsed)} 个题目候选, 题干正确 {correct} 道")
+
+    print("-" * 60)
+    legacy_seconds, legacy_count, legacy_correct = results['legacy']
+    lexer_seconds, lexer_count, lexer_correct = results['lexer']
+    print(f"加速比（按页）: {legacy_seconds / lexer_seconds:.2f}x")
+    print(f"加速比（按题目候选）: {(lexer_count / lexer_seconds) / (legacy_count / legacy_seconds):.2f}x")
+    if legacy_correct:
+        print(f"加速比（按题干正确的题目）: {(lexer_correct / lexer_seconds) / (legacy_correct / legacy_seconds):.2f}x")
+    else:
+        print(f"加速比（按题干正确的题目）: 旧版为 0 道，词法分析器版 {lexer_correct / lexer_seconds:.0f} 道/秒")
+
+if __name__ == "__main__":
+    main()
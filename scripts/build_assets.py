@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+静态资源构建 - 考研数学学习助手
+将页面中连续引用的本地脚本和样式表按原顺序压缩、合并为一个文件，文件名带内容哈希，
+改写HTML中的引用，输出到 dist/，并为所有文本资源生成 .gz 预压缩文件，最后报告节省的字节数；
+真题数据包（data/real-exam-bundle.json）不是最新时拒绝构建，避免前端读到与年份数据不一致的旧数据包
+
+压缩只做保守处理：去除注释、缩进、空行和标点两侧的空白，
+字符串、模板字符串和正则表达式原样保留，可能影响自动分号插入的换行也会保留
+
+用法: python scripts/build_assets.py [HTML文件 ...] [--output dist]
+"""
+
+import re
+import sys
+import gzip
+import shutil
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from build_exam_bundle import DEFAULT_OUTPUT as EXAM_BUNDLE_PATH, stale_reason
+
+ROOT_DIR = Path(__file__).parent.parent
+DEFAULT_PAGES = ["考研数学学习助手.html", "考研数学一模拟题.html"]
+DEFAULT_OUTPUT = "dist"
+ASSET_DIR = "assets"
+
+# 构建时写入输出目录的标记文件：只有带此标记的目录才会在下次构建前被清空
+BUILD_MARKER = ".build-assets"
+
+# 随页面发布、运行时通过 fetch 加载的数据（不含导入生成的候选数据）
+DATA_DIR = "data"
+DATA_EXCLUDE = re.compile(r'\.candidate\.')
+
+GZIP_SUFFIXES = {'.html', '.js', '.css', '.json'}
+
+# 连续的本地脚本 / 样式表引用（之间只有空白和HTML注释）
+SEPARATOR = r'(?:\s|<!--.*?-->)*'
+SCRIPT_TAG = r'<script src="(?!https?:|//)[^"]+"></script>'
+STYLESHEET_TAG = r'<link rel="stylesheet" href="(?!https?:|//)[^"]+">'
+SCRIPT_RUN_PATTERN = re.compile(rf'{SCRIPT_TAG}(?:{SEPARATOR}{SCRIPT_TAG})*', re.DOTALL)
+STYLESHEET_RUN_PATTERN = re.compile(rf'{STYLESHEET_TAG}(?:{SEPARATOR}{STYLESHEET_TAG})*', re.DOTALL)
+SCRIPT_SRC_PATTERN = re.compile(r'<script src="([^"]+)"></script>')
+STYLESHEET_HREF_PATTERN = re.compile(r'<link rel="stylesheet" href="([^"]+)">')
+
+# ========== JavaScript 压缩 ==========
+
+# 这些字符之后出现的 / 是正则表达式的开始，而不是除号
+REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+REGEX_KEYWORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete',
+                  'void', 'throw', 'yield', 'await', 'instanceof'}
+
+# 两侧空白可以安全去除的标点（不含 + - / 等可能与相邻符号粘连的运算符）
+JS_PUNCTUATION = r'[{}()\[\];,:=?&|<>!]'
+JS_SPACE_PATTERN = re.compile(rf'[ \t]*({JS_PUNCTUATION})[ \t]*')
+
+# 上一行以这些字符结尾，或下一行以这些字符开头时，合并两行不会改变自动分号插入的结果
+JOIN_AFTER = set('{;,([')
+JOIN_BEFORE = set('}).]')
+
+LITERAL_PATTERN = re.compile(r'\x00(\d+)\x01')
+
+
+class MinifyError(ValueError):
+    """压缩时遇到无法识别的语法"""
+
+
+def _scan_string(src: str, i: int) -> int:
+    quote = src[i]
+    i += 1
+    while i < len(src):
+        c = src[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == quote:
+            return i + 1
+        if c == '\n':
+            break
+        i += 1
+    raise MinifyError(f"未闭合的字符串 (位置 {i})")
+
+
+def _scan_template(src: str, i: int) -> int:
+    i += 1
+    while i < len(src):
+        c = src[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '`':
+            return i + 1
+        if c == '$' and src.startswith('{', i + 1):
+            i = _scan_expression(src, i + 2)
+            continue
+        i += 1
+    raise MinifyError(f"未闭合的模板字符串 (位置 {i})")
+
+
+def _scan_expression(src: str, i: int) -> int:
+    """跳过模板字符串中的 ${...} 表达式，返回右括号之后的位置"""
+    depth = 0
+    while i < len(src):
+        c = src[i]
+        if c in '"\'':
+            i = _scan_string(src, i)
+            continue
+        if c == '`':
+            i = _scan_template(src, i)
+            continue
+        if c == '{':
+            depth += 1
+        elif c == '}':
+            if depth == 0:
+                return i + 1
+            depth -= 1
+        i += 1
+    raise MinifyError(f"未闭合的模板表达式 (位置 {i})")
+
+
+def _scan_regex(src: str, i: int) -> int:
+    i += 1
+    in_class = False
+    while i < len(src):
+        c = src[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '\n':
+            break
+        if c == '[':
+            in_class = True
+        elif c == ']':
+            in_class = False
+        elif c == '/' and not in_class:
+            i += 1
+            while i < len(src) and (src[i].isalpha()):
+                i += 1
+            return i
+        i += 1
+    raise MinifyError(f"未闭合的正则表达式 (位置 {i})")
+
+
+def _regex_allowed(code: List[str]) -> bool:
+    """根据前面的代码判断 / 是否为正则表达式的开始"""
+    tail = "".join(code[-40:]).rstrip()
+    if not tail:
+        return True
+    last = tail[-1]
+    if last in REGEX_PRECEDERS:
+        return True
+    word = re.search(r'[A-Za-z_$][\w$]*$', tail)
+    return bool(word) and word.group() in REGEX_KEYWORDS
+
+
+def _mask_js(src: str) -> Tuple[str, List[str]]:
+    """去除注释，将字符串、模板字符串、正则表达式替换为占位符，返回 (代码, 字面量列表)"""
+    code: List[str] = []
+    literals: List[str] = []
+    i = 0
+    while i < len(src):
+        c = src[i]
+        if c in '"\'`' or (c == '/' and not src.startswith(('//', '/*'), i) and _regex_allowed(code)):
+            end = _scan_template(src, i) if c == '`' else _scan_regex(src, i) if c == '/' else _scan_string(src, i)
+            code.append(f"\x00{len(literals)}\x01")
+            literals.append(src[i:end])
+            i = end
+        elif src.startswith('//', i):
+            end = src.find('\n', i)
+            i = len(src) if end < 0 else end
+        elif src.startswith('/*', i):
+            end = src.find('*/', i + 2)
+            if end < 0:
+                raise MinifyError(f"未闭合的注释 (位置 {i})")
+            code.append(' ')
+            i = end + 2
+        else:
+            code.append(c)
+            i += 1
+    return "".join(code), literals
+
+
+def minify_js(source: str) -> str:
+    """保守压缩JavaScript"""
+    code, literals = _mask_js(source)
+
+    lines = []
+    for line in code.split('\n'):
+        line = re.sub(r'[ \t]+', ' ', line).strip()
+        if not line:
+            continue
+        line = JS_SPACE_PATTERN.sub(r'\1', line)
+        if lines and (lines[-1][-1] in JOIN_AFTER or line[0] in JOIN_BEFORE):
+            lines[-1] += line
+        else:
+            lines.append(line)
+
+    return LITERAL_PATTERN.sub(lambda m: literals[int(m.group(1))], "\n".join(lines))
+
+
+# ========== CSS 压缩 ==========
+
+CSS_TOKEN_PATTERN = re.compile(r'"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'|/\*.*?\*/', re.DOTALL)
+
+
+def minify_css(source: str) -> str:
+    """压缩CSS：去除注释，合并空白，去除 { } ; , > 两侧和 : 之后的空白"""
+    literals: List[str] = []
+
+    def mask(match):
+        text = match.group()
+        if text.startswith('/*'):
+            return ' '
+        literals.append(text)
+        return f"\x00{len(literals) - 1}\x01"
+
+    css = CSS_TOKEN_PATTERN.sub(mask, source)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r' ?([{};,>]) ?', r'\1', css)
+    css = re.sub(r': ', ':', css)
+    css = css.replace(';}', '}').strip()
+    return LITERAL_PATTERN.sub(lambda m: literals[int(m.group(1))], css)
+
+
+# ========== 构建 ==========
+
+class AssetBuilder:
+    """静态资源构建器"""
+
+    def __init__(self, output_dir: Path):
+        self.output_dir = output_dir
+        self.assets: Dict[str, Dict] = {}  # 输出文件名 -> 统计信息
+        self.requests_before = 0
+        self.requests_after = 0
+
+    def bundle(self, sources: List[str], kind: str) -> str:
+        """合并压缩一组源文件，返回输出文件相对于页面的路径"""
+        originals = [(ROOT_DIR / src).read_text(encoding='utf-8') for src in sources]
+        if kind == 'js':
+            check_js_declarations(sources, originals)
+            # 分号隔开各文件，防止上一个文件末尾缺少分号
+            minified = ";\n".join(minify_js(text) for text in originals) + "\n"
+            name = "scripts"
+        else:
+            minified = "\n".join(minify_css(text) for text in originals) + "\n"
+            name = "styles"
+
+        data = minified.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()[:10]
+        filename = f"{name}.{digest}.min.{kind}"
+        (self.output_dir / ASSET_DIR / filename).write_bytes(data)
+
+        self.assets[filename] = {
+            "sources": sources,
+            "original": sum(len(text.encode('utf-8')) for text in originals),
+            "minified": len(data),
+        }
+        self.requests_before += len(sources)
+        self.requests_after += 1
+        return f"{ASSET_DIR}/{filename}"
+
+    def build_page(self, page: str):
+        html = (ROOT_DIR / page).read_text(encoding='utf-8')
+
+        def replace_scripts(match):
+            sources = SCRIPT_SRC_PATTERN.findall(match.group())
+            return f'<script src="{self.bundle(sources, "js")}"></script>'
+
+        def replace_stylesheets(match):
+            sources = STYLESHEET_HREF_PATTERN.findall(match.group())
+            return f'<link rel="stylesheet" href="{self.bundle(sources, "css")}">'
+
+        html = SCRIPT_RUN_PATTERN.sub(replace_scripts, html)
+        html = STYLESHEET_RUN_PATTERN.sub(replace_stylesheets, html)
+        (self.output_dir / page).write_text(html, encoding='utf-8')
+
+    def copy_data(self):
+        for path in sorted((ROOT_DIR / DATA_DIR).rglob("*")):
+            if path.is_file() and not DATA_EXCLUDE.search(path.name):
+                target = self.output_dir / path.relative_to(ROOT_DIR)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(path, target)
+
+    def precompress(self) -> Tuple[int, int]:
+        """为所有文本资源生成 .gz，返回 (原始总字节, 压缩后总字节)"""
+        total, compressed_total = 0, 0
+        for path in sorted(self.output_dir.rglob("*")):
+            if not path.is_file() or path.suffix not in GZIP_SUFFIXES:
+                continue
+            data = path.read_bytes()
+            # mtime=0 使相同内容的构建结果完全一致
+            compressed = gzip.compress(data, compresslevel=9, mtime=0)
+            total += len(data)
+            if len(compressed) < len(data):
+                path.with_name(path.name + ".gz").write_bytes(compressed)
+                compressed_total += len(compressed)
+            else:
+                compressed_total += len(data)
+            if path.name in self.assets:
+                self.assets[path.name]["gzip"] = min(len(compressed), len(data))
+        return total, compressed_total
+
+
+def check_js_declarations(sources: List[str], texts: List[str]):
+    """合并后顶层 const/let/class 重名会导致整个文件语法错误，构建前检查"""
+    declared = {}
+    for src, text in zip(sources, texts):
+        for name in re.findall(r'^(?:const|let|class)\s+([A-Za-z_$][\w$]*)', text, re.MULTILINE):
+            if name in declared:
+                raise MinifyError(f"{src} 与 {declared[name]} 重复声明顶层变量 {name}，不能合并")
+            declared[name] = src
+
+
+def prepare_output_dir(output_dir: Path, pages: List[str]):
+    """清空并重建输出目录；拒绝清空仓库根目录、其上级目录、包含源文件的目录以及非本脚本生成的目录"""
+    root = ROOT_DIR.resolve()
+    if output_dir == root or output_dir in root.parents:
+        raise ValueError(f"输出目录不能是仓库根目录或其上级目录: {output_dir}")
+    sources = [(ROOT_DIR / page).resolve() for page in pages] + [(ROOT_DIR / DATA_DIR).resolve()]
+    for source in sources:
+        if source == output_dir or output_dir in source.parents:
+            raise ValueError(f"输出目录包含源文件 {source}，不能清空: {output_dir}")
+
+    if output_dir.exists():
+        if not output_dir.is_dir():
+            raise ValueError(f"输出路径不是目录: {output_dir}")
+        if any(output_dir.iterdir()) and not (output_dir / BUILD_MARKER).is_file():
+            raise ValueError(f"输出目录不是由本脚本生成的（缺少 {BUILD_MARKER}），"
+                             f"请确认后手动删除或换一个目录: {output_dir}")
+        shutil.rmtree(output_dir)
+    (output_dir / ASSET_DIR).mkdir(parents=True)
+    (output_dir / BUILD_MARKER).write_text("由 scripts/build_assets.py 生成，下次构建前会被清空\n", encoding='utf-8')
+
+
+def main():
+    """主函数"""
+    arg_parser = argparse.ArgumentParser(description="静态资源构建：合并压缩、内容哈希、预压缩")
+    arg_parser.add_argument("pages", nargs="*", default=DEFAULT_PAGES, help="要构建的HTML页面")
+    arg_parser.add_argument("--output", default=DEFAULT_OUTPUT,
+                            help="输出目录（相对仓库根目录，每次构建前清空，默认dist）")
+    args = arg_parser.parse_args()
+
+    reason = stale_reason(ROOT_DIR / DATA_DIR, ROOT_DIR / EXAM_BUNDLE_PATH)
+    if reason:
+        print(f"❌ 真题数据包不是最新（{reason}），请先运行 python scripts/build_exam_bundle.py")
+        sys.exit(1)
+
+    output_dir = (ROOT_DIR / args.output).resolve()
+    try:
+        prepare_output_dir(output_dir, args.pages)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    builder = AssetBuilder(output_dir)
+    for page in args.pages:
+        builder.build_page(page)
+    builder.copy_data()
+    total, compressed_total = builder.precompress()
+
+    print(f"✅ 已构建到 {output_dir}/")
+    print(f"{'文件':<34}{'源文件':>6}{'原始':>11}{'压缩':>11}{'gzip':>11}")
+    original_sum = minified_sum = gzip_sum = 0
+    for filename, info in builder.assets.items():
+        print(f"{filename:<34}{len(info['sources']):>6}{info['original'] / 1024:>10.1f}K"
+              f"{info['minified'] / 1024:>10.1f}K{info['gzip'] / 1024:>10.1f}K")
+        original_sum += info['original']
+        minified_sum += info['minified']
+        gzip_sum += info['gzip']
+    if original_sum:
+        print(f"脚本和样式: {original_sum / 1024:.1f} KB → 压缩 {minified_sum / 1024:.1f} KB → "
+              f"gzip {gzip_sum / 1024:.1f} KB (节省 {1 - gzip_sum / original_sum:.0%})")
+    print(f"请求数: {builder.requests_before} → {builder.requests_after}")
+    print(f"全部文本资源（含数据）: {total / 1024:.1f} KB → gzip {compressed_total / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+真题数据包构建 - 考研数学学习助手
+将 data/real-exam-YYYY.json 合并为单个带版本号的数据包 data/real-exam-bundle.json，
+预先计算 年份 / 题型 / 知识点 → 题目ID 的索引、各年份统计以及分数线表，
+前端只需加载一次数据包即可按索引筛选，无需逐年请求和遍历题目
+
+各题分值取自 js/real-exam-data.js 的 examScoring 分值表（与前端共用同一张表），并随数据包下发
+
+用法:
+  python scripts/build_exam_bundle.py [--data-dir data] [--output data/real-exam-bundle.json]
+  python scripts/build_exam_bundle.py --check    # 检查数据包是否与年份数据一致（发布构建前也会检查）
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from knowledge_data import JSLiteralParser
+
+BUNDLE_FORMAT = 1
+
+REAL_EXAM_DATA_PATH = Path(__file__).parent.parent / "js" / "real-exam-data.js"
+
+YEAR_FILE_PATTERN = re.compile(r'^real-exam-(\d{4})\.json$')
+
+DEFAULT_OUTPUT = "data/real-exam-bundle.json"
+
+
+def load_js_constant(name: str, path: Path = REAL_EXAM_DATA_PATH):
+    """读取 real-exam-data.js 中 const 声明的对象字面量（如 examScoreLines、examScoring）"""
+    source = Path(path).read_text(encoding='utf-8')
+    match = re.search(rf'const\s+{name}\s*=\s*', source)
+    if not match:
+        raise ValueError(f"未在 {path} 中找到 {name}")
+    value, _ = JSLiteralParser(source).parse(match.end())
+    return value
+
+
+def load_score_lines(path: Path = REAL_EXAM_DATA_PATH) -> Dict[str, Dict]:
+    """读取 real-exam-data.js 中的 examScoreLines 分数线表"""
+    return load_js_constant('examScoreLines', path)
+
+
+def load_scoring(path: Path = REAL_EXAM_DATA_PATH) -> Dict:
+    """读取 real-exam-data.js 中的 examScoring 分值表"""
+    return load_js_constant('examScoring', path)
+
+
+def load_years(data_dir: Path) -> Dict[int, List[Dict]]:
+    """读取所有已确认的年份数据（不含 .candidate 候选文件）"""
+    years = {}
+    for path in sorted(data_dir.iterdir()):
+        match = YEAR_FILE_PATTERN.match(path.name)
+        if match:
+            with open(path, 'r', encoding='utf-8') as f:
+                years[int(match.group(1))] = json.load(f)
+    return years
+
+
+def question_score(scoring: Dict, question_type: str, index: int) -> int:
+    """分值表中某题型第 index 题（从0开始）的分值，与前端判分一致"""
+    section = scoring[question_type]
+    if 'scores' in section:
+        if index >= len(section['scores']):
+            raise ValueError(f"{section['name']}第 {index + 1} 题超出分值表（共 {len(section['scores'])} 题）")
+        return section['scores'][index]
+    return section['scorePerQuestion']
+
+
+def year_stats(questions: List[Dict], scoring: Dict) -> Dict:
+    """单个年份的统计：题型数量、总分（按分值表）、知识点覆盖次数"""
+    by_type = {}
+    knowledge_points = {}
+    total_score = 0
+    for q in questions:
+        total_score += question_score(scoring, q['type'], by_type.get(q['type'], 0))
+        by_type[q['type']] = by_type.get(q['type'], 0) + 1
+        for kp in q.get('knowledgePoints', []):
+            knowledge_points[kp] = knowledge_points.get(kp, 0) + 1
+    return {
+        "questionCount": len(questions),
+        "byType": by_type,
+        "totalScore": total_score,
+        "knowledgePoints": knowledge_points,
+    }
+
+
+def build_bundle(years: Dict[int, List[Dict]], score_lines: Dict[str, Dict], scoring: Dict) -> Dict:
+    """构建数据包（不含版本号）"""
+    questions = {}
+    by_year, by_type, by_knowledge_point = {}, {}, {}
+
+    for year in sorted(years, reverse=True):
+        for q in years[year]:
+            if q['id'] in questions:
+                raise ValueError(f"题目ID重复: {q['id']}")
+            questions[q['id']] = q
+            by_year.setdefault(str(year), []).append(q['id'])
+            by_type.setdefault(q['type'], []).append(q['id'])
+            for kp in q.get('knowledgePoints', []):
+                by_knowledge_point.setdefault(kp, []).append(q['id'])
+
+    return {
+        "format": BUNDLE_FORMAT,
+        "years": sorted(years, reverse=True),
+        "scoreLines": score_lines,
+        "scoring": scoring,
+        "stats": {str(year): year_stats(years[year], scoring) for year in sorted(years, reverse=True)},
+        "index": {
+            "year": by_year,
+            "type": by_type,
+            "knowledgePoint": dict(sorted(by_knowledge_point.items())),
+        },
+        "questions": questions,
+    }
+
+
+def serialize_bundle(bundle: Dict) -> Tuple[str, str]:
+    """数据包序列化，版本号为内容哈希；内容未变化时版本号不变。返回 (版本号, 文本)"""
+    body = json.dumps(bundle, ensure_ascii=False, separators=(',', ':'))
+    version = hashlib.sha256(body.encode('utf-8')).hexdigest()[:12]
+    # 版本号放在最前，便于前端和缓存策略读取
+    return version, f'{{"version":"{version}",' + body[1:]
+
+
+def stale_reason(data_dir: Path = Path("data"), output_path: Path = Path(DEFAULT_OUTPUT)) -> Optional[str]:
+    """数据包与年份数据、分值表、分数线不一致时返回原因，一致时返回 None"""
+    if not output_path.exists():
+        return f"{output_path} 不存在"
+    version, _ = serialize_bundle(build_bundle(load_years(data_dir), load_score_lines(), load_scoring()))
+    with open(output_path, 'r', encoding='utf-8') as f:
+        current = json.load(f).get('version')
+    if current != version:
+        return f"{output_path} 版本 {current} 与数据生成的版本 {version} 不一致"
+    return None
+
+
+def write_bundle(bundle: Dict, output_path: Path) -> str:
+    """写入数据包，返回版本号"""
+    version, text = serialize_bundle(bundle)
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, output_path)
+    return version
+
+
+def main():
+    """主函数"""
+    arg_parser = argparse.ArgumentParser(description="构建前端真题数据包")
+    arg_parser.add_argument("--data-dir", default="data", help="真题JSON目录（默认data）")
+    arg_parser.add_argument("--output", default=DEFAULT_OUTPUT, help="数据包输出路径")
+    arg_parser.add_argument("--check", action="store_true", help="只检查数据包是否为最新")
+    args = arg_parser.parse_args()
+
+    if args.check:
+        reason = stale_reason(Path(args.data_dir), Path(args.output))
+        if reason:
+            print(f"❌ 数据包不是最新（{reason}），请运行 python scripts/build_exam_bundle.py")
+            sys.exit(1)
+        print(f"✅ {args.output} 与年份数据一致")
+        return
+
+    years = load_years(Path(args.data_dir))
+    if not years:
+        print(f"❌ {args.data_dir} 中没有 real-exam-YYYY.json 文件")
+        sys.exit(1)
+
+    bundle = build_bundle(years, load_score_lines(), load_scoring())
+    output_path = Path(args.output)
+    version = write_bundle(bundle, output_path)
+
+    print(f"✅ 已生成 {output_path} (版本 {version}, {output_path.stat().st_size / 1024:.1f} KB)")
+    for year, stats in bundle["stats"].items():
+        types = ", ".join(f"{t} {n}" for t, n in stats["byType"].items())
+        print(f"  {year}: {stats['questionCount']} 题 ({types}), 总分 {stats['totalScore']}, "
+              f"知识点 {len(stats['knowledgePoints'])} 个")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+全文检索索引构建 - 考研数学学习助手
+为 js/knowledge-data.js 的知识点内容和 data/real-exam-YYYY.json 的真题建立倒排索引，
+写入 data/search-index.json，前端检索时只需对几个倒排表求交集，无需遍历全文
+
+检索词与知识点标注、题目数据库相同：中文字二元组、LaTeX命令、英文单词。
+每个检索词的倒排表为按序的文档编号，相邻编号取差值后以变长整数（每字节7位）编码，再转为base64
+
+用法:
+  python scripts/build_search_index.py                  # 生成 data/search-index.json
+  python scripts/build_search_index.py --query 条件收敛  # 用已生成的索引检索
+"""
+
+import os
+import sys
+import json
+import base64
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+from knowledge_data import iter_units, load_knowledge_tree
+from search_terms import question_text, tokenize
+from build_exam_bundle import load_years
+
+INDEX_FORMAT = 1
+
+DEFAULT_INDEX_PATH = "data/search-index.json"
+
+# 真题文档标题截取的题干长度
+TITLE_LENGTH = 40
+
+
+def iter_strings(value: Any) -> Iterator[str]:
+    """递归产出知识点内容中的全部字符串（概念、公式、例题、要点等）"""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from iter_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from iter_strings(item)
+
+
+def collect_documents(tree: Dict, years: Dict[int, List[Dict]]) -> Iterator[Tuple[List, str]]:
+    """产出 ([类型, ID, 标题, 分组], 文本)；知识点在前，真题按年份倒序"""
+    for _, chapter, unit in iter_units(tree):
+        text = "\n".join([unit.get('name', '')] + list(iter_strings(unit.get('content', {}))))
+        yield ['k', unit['id'], unit.get('name', ''), chapter['id']], text
+
+    for year in sorted(years, reverse=True):
+        for q in years[year]:
+            title = " ".join((q.get('content') or "").split())[:TITLE_LENGTH]
+            text = question_text(q.get('content'), q.get('options'), q.get('explanation'))
+            yield ['q', q['id'], title, str(year)], text
+
+
+def encode_postings(doc_numbers: List[int]) -> str:
+    """有序文档编号 → 差值变长整数编码的base64文本"""
+    data = bytearray()
+    previous = 0
+    for number in doc_numbers:
+        delta = number - previous
+        previous = number
+        while delta >= 0x80:
+            data.append((delta & 0x7F) | 0x80)
+            delta >>= 7
+        data.append(delta)
+    return base64.b64encode(bytes(data)).decode('ascii')
+
+
+def decode_postings(encoded: str) -> List[int]:
+    """encode_postings 的逆过程"""
+    numbers = []
+    value = shift = previous = 0
+    for byte in base64.b64decode(encoded):
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        previous += value
+        numbers.append(previous)
+        value = shift = 0
+    return numbers
+
+
+def build_index(tree: Dict, years: Dict[int, List[Dict]]) -> Dict:
+    """构建索引（不含版本号）"""
+    docs = []
+    postings: Dict[str, List[int]] = {}
+    for number, (doc, text) in enumerate(collect_documents(tree, years)):
+        docs.append(doc)
+        for term in set(tokenize(text)):
+            postings.setdefault(term, []).append(number)
+
+    return {
+        "format": INDEX_FORMAT,
+        "docs": docs,
+        "terms": {term: encode_postings(postings[term]) for term in sorted(postings)},
+    }
+
+
+def write_index(index: Dict, output_path: Path) -> str:
+    """写入索引，版本号为内容哈希。返回版本号"""
+    body = json.dumps(index, ensure_ascii=False, separators=(',', ':'))
+    version = hashlib.sha256(body.encode('utf-8')).hexdigest()[:12]
+
+    text = f'{{"version":"{version}",' + body[1:]
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, output_path)
+    return version
+
+
+def search(index: Dict, query: str) -> List[List]:
+    """返回包含全部检索词的文档（与前端 searchContent 的匹配规则相同）"""
+    terms = set(tokenize(query))
+    if not terms or any(term not in index["terms"] for term in terms):
+        return []
+
+    # 从最短的倒排表开始求交集
+    lists = sorted((decode_postings(index["terms"][term]) for term in terms), key=len)
+    matched = set(lists[0])
+    for numbers in lists[1:]:
+        matched.intersection_update(numbers)
+    return [index["docs"][number] for number in sorted(matched)]
+
+
+def main():
+    """主函数"""
+    arg_parser = argparse.ArgumentParser(description="构建前端全文检索索引")
+    arg_parser.add_argument("--data-dir", default="data", help="真题JSON目录（默认data）")
+    arg_parser.add_argument("--output", default=DEFAULT_INDEX_PATH, help="索引输出路径")
+    arg_parser.add_argument("--query", help="不重新构建，用已生成的索引检索（中文至少2字）")
+    args = arg_parser.parse_args()
+
+    output_path = Path(args.output)
+
+    if args.query:
+        if not output_path.exists():
+            print(f"❌ 索引不存在: {output_path}，请先运行 python scripts/build_search_index.py")
+            sys.exit(1)
+        with open(output_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        results = search(index, args.query)
+        for kind, doc_id, title, group in results:
+            print(f"{'知识点' if kind == 'k' else '真题':<4} {doc_id:<12} {group:<10} {title}")
+        print(f"共 {len(results)} 条")
+        return
+
+    index = build_index(load_knowledge_tree(), load_years(Path(args.data_dir)))
+    version = write_index(index, output_path)
+
+    counts = {kind: sum(1 for doc in index["docs"] if doc[0] == kind) for kind in ('k', 'q')}
+    postings_size = sum(len(encoded) for encoded in index["terms"].values())
+    print(f"✅ 已生成 {output_path} (版本 {version}, {output_path.stat().st_size / 1024:.1f} KB)")
+    print(f"  文档 {len(index['docs'])} 个（知识点 {counts['k']}，真题 {counts['q']}），"
+          f"检索词 {len(index['terms'])} 个，倒排表 {postings_size / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,13 +3,21 @@
 """
 检测仓库中文本文件的编码格式
 输出非 UTF-8 编码的文件列表
+
+先按严格 UTF-8 分块解码（绝大多数文件在这一步即可确定），
+解码失败的文件再交给 chardet 的 UniversalDetector 分块检测，置信后即停止读取
 """
 
 import os
 import sys
+import codecs
+import argparse
 import chardet
+from chardet import UniversalDetector
 from pathlib import Path
+from collections import Counter
 import io
+from encoding_scanner import ScanCache, iter_files, scan_files
 
 # Ensure stdout is UTF-8 encoded to avoid terminal garbling when printing Unicode.
 # This makes the script more robust when run in terminals whose default encoding is not UTF-8.
@@ -30,7 +38,17 @@ TEXT_EXTENSIONS = {
 # 排除的目录
 EXCLUDE_DIRS = {
     '.git', 'node_modules', '__pycache__', '.cursor',
-    'encoding-backup', 'temp_images'
+    'encoding-backup', 'temp_images', 'tmp'
+}
+
+# 分块读取的大小
+CHUNK_SIZE = 64 * 1024
+
+# 检测途径的显示名称
+METHOD_LABELS = {
+    'utf8': 'UTF-8快速解码',
+    'chardet': 'chardet增量检测',
+    'error': '读取错误',
 }
 
 def is_text_file(filepath):
@@ -49,45 +67,96 @@ def is_text_file(filepath):
     except Exception:
         return False
 
+def _check_utf8(f):
+    """严格 UTF-8 分块解码：成功时返回 (编码, 置信度)，失败返回 None
+
+    带 BOM 返回 ('UTF-8-SIG', 1.0)，纯 ASCII（含空文件）返回 ('ascii', 1.0)，
+    其他合法 UTF-8 一律返回 ('utf-8', 0.99)，与文件长度无关。
+    chardet 对同一文件的结果不一定相同：chardet 5 及以前对多字节字符很少的短文件置信度较低（如 0.505），
+    空文件则不返回编码或置信度很低
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='strict')
+    first = True
+    has_bom = False
+    is_ascii = True
+    try:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if first:
+                has_bom = chunk.startswith(codecs.BOM_UTF8)
+                first = False
+            if not chunk:
+                decoder.decode(b'', final=True)
+                break
+            decoder.decode(chunk)
+            is_ascii = is_ascii and chunk.isascii()
+    except UnicodeDecodeError:
+        return None
+
+    if has_bom:
+        return 'UTF-8-SIG', 1.0
+    if is_ascii:
+        return 'ascii', 1.0
+    return 'utf-8', 0.99
+
+def _detect_chardet(f):
+    """chardet 增量检测：分块送入 UniversalDetector，置信后提前结束"""
+    detector = UniversalDetector()
+    while not detector.done:
+        chunk = f.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        detector.feed(chunk)
+    return detector.close()
+
 def detect_file_encoding(filepath):
-    """检测单个文件的编码"""
+    """检测单个文件的编码，method 为检测途径（utf8 / chardet / error）"""
     try:
         with open(filepath, 'rb') as f:
-            raw_data = f.read()
-
-        # 使用chardet检测编码
-        result = chardet.detect(raw_data)
+            utf8 = _check_utf8(f)
+            if utf8:
+                encoding, confidence = utf8
+                return {
+                    'filepath': str(filepath),
+                    'encoding': encoding,
+                    'confidence': confidence,
+                    'language': '',
+                    'method': 'utf8'
+                }
+
+            # 非 UTF-8，从头交给 chardet
+            f.seek(0)
+            result = _detect_chardet(f)
 
         return {
             'filepath': str(filepath),
             'encoding': result['encoding'],
             'confidence': result['confidence'],
-            'language': result.get('language', '')
+            'language': result.get('language') or '',
+            'method': 'chardet'
         }
     except Exception as e:
         return {
             'filepath': str(filepath),
             'encoding': None,
             'confidence': 0.0,
-            'error': str(e)
+            'error': str(e),
+            'method': 'error'
         }
 
 def should_check_file(filepath):
-    """判断是否应该检测此文件"""
-    # 检查扩展名
-    if filepath.suffix.lower() not in TEXT_EXTENSIONS:
-        return False
-
-    # 检查是否在排除目录中
-    for part in filepath.parts:
-        if part in EXCLUDE_DIRS:
-            return False
-
-    return True
+    """判断是否应该检测此文件（排除目录在遍历时已跳过）"""
+    return filepath.suffix.lower() in TEXT_EXTENSIONS
 
 def main():
     """主函数"""
+    arg_parser = argparse.ArgumentParser(description="检测仓库中文本文件的编码格式")
+    arg_parser.add_argument("-j", "--workers", type=int, default=0, help="并行进程数（0表示使用全部CPU核心，默认0）")
+    arg_parser.add_argument("--no-cache", action="store_true", help="不使用扫描缓存，重新检测全部文件")
+    args = arg_parser.parse_args()
+
     repo_root = Path(__file__).parent.parent
+    cache = None if args.no_cache else ScanCache(repo_root)
 
     print("检测仓库中文本文件编码...")
     print(f"仓库根目录: {repo_root}")
@@ -96,17 +165,13 @@ def main():
     non_utf8_files = []
     error_files = []
     total_checked = 0
+    method_stats = Counter()
 
-    # 遍历所有文件
-    for filepath in repo_root.rglob('*'):
-        if not filepath.is_file():
-            continue
-
-        if not should_check_file(filepath):
-            continue
-
+    # 遍历所有文件（跳过排除目录），未变化的文件取缓存结果，其余并行检测，按遍历顺序输出
+    files = iter_files(repo_root, EXCLUDE_DIRS, should_check_file)
+    for filepath, result in scan_files(files, detect_file_encoding, workers=args.workers, cache=cache):
         total_checked += 1
-        result = detect_file_encoding(filepath)
+        method_stats[result['method']] += 1
 
         # 检查是否为UTF-8
         is_utf8 = (result['encoding'] and
@@ -122,7 +187,7 @@ def main():
         else:
             status = "[UTF-8]"
 
-        print("30")
+        print(f"{status} {filepath.relative_to(repo_root)}")
 
         # 每处理100个文件显示进度
         if total_checked % 100 == 0:
@@ -133,6 +198,12 @@ def main():
     print(f"总检查文件数: {total_checked}")
     print(f"非UTF-8文件数: {len(non_utf8_files)}")
     print(f"检测错误文件数: {len(error_files)}")
+    print("检测途径:")
+    for method, label in METHOD_LABELS.items():
+        print(f"  {label}: {method_stats[method]} 个文件")
+    if cache:
+        cache.save()
+        print(cache.format_stats())
 
     if non_utf8_files:
         print(f"\n发现 {len(non_utf8_files)} 个非UTF-8编码的文件:")
@@ -160,7 +231,9 @@ def main():
             f.write("="*50 + "\n\n")
             f.write(f"检测时间: {os.popen('date').read().strip() if os.name != 'nt' else 'Windows系统'}\n")
             f.write(f"总检查文件数: {total_checked}\n")
-            f.write(f"非UTF-8文件数: {len(non_utf8_files)}\n\n")
+            f.write(f"非UTF-8文件数: {len(non_utf8_files)}\n")
+            f.write("检测途径: " + ", ".join(f"{label} {method_stats[method]}"
+                                          for method, label in METHOD_LABELS.items()) + "\n\n")
 
             f.write("编码分布:\n")
             for encoding, count in sorted(encoding_stats.items()):
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+编码转换备份 - 考研数学学习助手
+normalize_encodings.py 转换前的原文件按内容寻址存储，重复运行几乎不占额外空间：
+
+  encoding-backup/objects/<sha256前2位>/<sha256其余位>   文件内容，相同内容只存一份
+  encoding-backup/runs/<运行ID>.json                     每次运行的清单（相对路径 -> 内容哈希）
+  encoding-backup/runs/<运行ID>.journal                  运行中逐条追加的清单，提交后删除；
+                                                         运行中断时保留，list/restore 按它恢复已替换的文件
+
+用法：
+  python scripts/encoding_backup.py list                 列出全部备份
+  python scripts/encoding_backup.py restore <运行ID>     一次性恢复该次运行转换过的全部文件
+  python scripts/encoding_backup.py prune --keep 5       只保留最近5次运行，删除不再引用的内容
+  python scripts/encoding_backup.py import-legacy        导入旧版 backup_<时间戳>/ 目录
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+DEFAULT_STORE_DIR = "encoding-backup"
+MANIFEST_VERSION = 1
+CHUNK_SIZE = 64 * 1024
+
+
+def _write_json(path: Path, data: Dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _read_journal(path: Path) -> Dict:
+    """读取未提交运行的日志：首行为运行信息，其后每行一个文件；中断时写了一半的末行忽略"""
+    manifest = None
+    files = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            if manifest is None:
+                manifest = record
+            else:
+                files.append(record)
+    manifest = manifest or {"version": MANIFEST_VERSION, "run": path.stem, "created": "", "note": ""}
+    manifest["files"] = files
+    manifest["incomplete"] = True
+    return manifest
+
+
+class BackupStore:
+    """内容寻址的备份仓库，路径均相对于仓库根目录"""
+
+    def __init__(self, repo_root: Path, store_dir: str = DEFAULT_STORE_DIR):
+        self.repo_root = Path(repo_root)
+        self.root = self.repo_root / store_dir
+        self.objects_dir = self.root / "objects"
+        self.runs_dir = self.root / "runs"
+
+    def object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    def put_file(self, path: Path) -> str:
+        """流式计算哈希并写入内容，已存在相同内容时不再写入；返回 sha256"""
+        writer = BlobWriter(self)
+        try:
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                    writer.write(chunk)
+            return writer.finish()
+        except BaseException:
+            writer.abort()
+            raise
+
+    def begin_run(self, note: str = "") -> "BackupRun":
+        run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        suffix = 1
+        while (self.runs_dir / f"{run_id}.json").exists() or (self.runs_dir / f"{run_id}.journal").exists():
+            suffix += 1
+            run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{suffix}"
+        return BackupRun(self, run_id, note)
+
+    def run_ids(self) -> List[str]:
+        """全部运行ID，包括中断后只留下日志的运行"""
+        if not self.runs_dir.exists():
+            return []
+        return sorted({path.stem for pattern in ("*.json", "*.journal") for path in self.runs_dir.glob(pattern)})
+
+    def load_run(self, run_id: str) -> Dict:
+        path = self.runs_dir / f"{run_id}.json"
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        journal_path = self.runs_dir / f"{run_id}.journal"
+        if journal_path.exists():
+            return _read_journal(journal_path)
+        raise FileNotFoundError(f"备份不存在: {run_id}")
+
+    def restore(self, run_id: str, dry_run: bool = False) -> Iterator[Dict]:
+        """恢复一次运行的全部文件；先把当前内容另存为一次新运行，便于撤销恢复"""
+        manifest = self.load_run(run_id)
+        missing = [entry["path"] for entry in manifest["files"]
+                   if not self.object_path(entry["sha256"]).exists()]
+        if missing:
+            raise FileNotFoundError(f"备份内容缺失，未恢复任何文件: {', '.join(missing)}")
+        if dry_run:
+            for entry in manifest["files"]:
+                yield {"path": entry["path"], "status": "dry_run"}
+            return
+
+        undo = self.begin_run(note=f"恢复 {run_id} 前的内容")
+        try:
+            for entry in manifest["files"]:
+                target = self.repo_root / entry["path"]
+                if target.exists():
+                    if self.put_file(target) == entry["sha256"]:
+                        yield {"path": entry["path"], "status": "unchanged"}
+                        continue
+                    undo.add(target)
+
+                target.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+                with os.fdopen(fd, 'wb') as out, open(self.object_path(entry["sha256"]), 'rb') as f:
+                    shutil.copyfileobj(f, out, CHUNK_SIZE)
+                os.chmod(tmp_name, entry.get("mode", 0o644))
+                os.replace(tmp_name, target)
+                yield {"path": entry["path"], "status": "restored"}
+        finally:
+            undo.commit()
+
+    def prune(self, keep: int) -> Dict:
+        """只保留最近 keep 次运行，删除未被引用的内容和残留的临时文件"""
+        run_ids = self.run_ids()
+        removed_runs = run_ids[:-keep] if keep > 0 else run_ids
+        for run_id in removed_runs:
+            for suffix in (".json", ".journal"):
+                path = self.runs_dir / f"{run_id}{suffix}"
+                if path.exists():
+                    path.unlink()
+
+        referenced = set()
+        for run_id in self.run_ids():
+            referenced.update(entry["sha256"] for entry in self.load_run(run_id)["files"])
+
+        removed_objects = 0
+        freed_bytes = 0
+        if self.objects_dir.exists():
+            for path in self.objects_dir.rglob("*"):
+                if not path.is_file():
+                    continue
+                digest = path.parent.name + path.name
+                if path.name.startswith(".incoming-") or digest not in referenced:
+                    freed_bytes += path.stat().st_size
+                    path.unlink()
+                    removed_objects += 1
+            for directory in self.objects_dir.iterdir():
+                if directory.is_dir() and not any(directory.iterdir()):
+                    directory.rmdir()
+        return {"runs": len(removed_runs), "objects": removed_objects, "bytes": freed_bytes}
+
+    def import_legacy(self, remove: bool = False) -> List[str]:
+        """把旧版 backup_<时间戳>/ 整树副本导入为运行清单"""
+        imported = []
+        for legacy_dir in sorted(self.root.glob("backup_*")):
+            if not legacy_dir.is_dir():
+                continue
+            run_id = legacy_dir.name[len("backup_"):]
+            try:
+                created = datetime.strptime(run_id, "%Y%m%d_%H%M%S").strftime("%Y-%m-%d %H:%M:%S")
+            except ValueError:
+                created = None
+            run = BackupRun(self, run_id, note=f"导入自 {legacy_dir.name}/", created=created)
+            if (self.runs_dir / f"{run.run_id}.json").exists():
+                continue
+            for path in sorted(legacy_dir.rglob("*")):
+                if path.is_file() and path.name != "restore.bat":
+                    run.add(path, path.relative_to(legacy_dir).as_posix())
+            run.commit()
+            imported.append(run.run_id)
+            if remove:
+                shutil.rmtree(legacy_dir)
+        return imported
+
+
+class BlobWriter:
+    """流式写入一个内容对象：边写边计算哈希，finish 时落盘并按哈希放到 objects/ 下"""
+
+    def __init__(self, store: BackupStore):
+        self.store = store
+        self.hasher = hashlib.sha256()
+        store.objects_dir.mkdir(parents=True, exist_ok=True)
+        fd, self.tmp_name = tempfile.mkstemp(dir=store.objects_dir, prefix=".incoming-")
+        self.file = os.fdopen(fd, 'wb')
+
+    def write(self, chunk: bytes):
+        self.hasher.update(chunk)
+        self.file.write(chunk)
+
+    def finish(self) -> str:
+        """返回 sha256；已存在相同内容时丢弃本次写入"""
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        digest = self.hasher.hexdigest()
+        target = self.store.object_path(digest)
+        if target.exists():
+            os.unlink(self.tmp_name)
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(self.tmp_name, target)
+        return digest
+
+    def abort(self):
+        self.file.close()
+        if os.path.exists(self.tmp_name):
+            os.unlink(self.tmp_name)
+
+
+class BackupRun:
+    """一次运行的备份清单，commit 后写入 runs/<运行ID>.json
+
+    每登记一个文件就追加到 runs/<运行ID>.journal 并落盘，调用方在此之后才替换原文件，
+    运行中断时已替换文件的原内容仍可按日志恢复
+    """
+
+    def __init__(self, store: BackupStore, run_id: str, note: str = "", created: Optional[str] = None):
+        self.store = store
+        self.run_id = run_id
+        self.note = note
+        self.created = created or time.strftime("%Y-%m-%d %H:%M:%S")
+        self.files: Dict[str, Dict] = {}
+        self.journal_path = store.runs_dir / f"{run_id}.journal"
+        self._journal = None
+
+    def add(self, path: Path, rel_path: Optional[str] = None) -> str:
+        """备份文件当前内容（同一路径只记录第一次），返回 sha256"""
+        rel_path = rel_path or self._rel_path(path)
+        if rel_path in self.files:
+            return self.files[rel_path]["sha256"]
+        stat = os.stat(path)
+        digest = self.store.put_file(path)
+        self.record(path, digest, stat, rel_path)
+        return digest
+
+    def record(self, path: Path, digest: str, stat: os.stat_result, rel_path: Optional[str] = None):
+        """登记已由 BlobWriter 写入的内容（用于边读边转换的场景），返回前已追加到日志并落盘"""
+        rel_path = rel_path or self._rel_path(path)
+        if rel_path in self.files:
+            return
+        entry = self.files[rel_path] = {"path": rel_path, "sha256": digest, "size": stat.st_size,
+                                        "mode": stat.st_mode & 0o777}
+        self._append_journal(entry)
+
+    def _append_journal(self, entry: Dict):
+        if self._journal is None:
+            self.store.runs_dir.mkdir(parents=True, exist_ok=True)
+            self._journal = open(self.journal_path, 'a', encoding='utf-8')
+            self._journal.write(json.dumps({"version": MANIFEST_VERSION, "run": self.run_id,
+                                            "created": self.created, "note": self.note},
+                                           ensure_ascii=False) + "\n")
+        self._journal.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+
+    def _rel_path(self, path: Path) -> str:
+        return Path(path).resolve().relative_to(self.store.repo_root.resolve()).as_posix()
+
+    def commit(self) -> Optional[Path]:
+        """写入清单并删除日志；没有备份任何文件时不生成运行记录"""
+        if not self.files:
+            return None
+        path = self.store.runs_dir / f"{self.run_id}.json"
+        _write_json(path, {
+            "version": MANIFEST_VERSION,
+            "run": self.run_id,
+            "created": self.created,
+            "note": self.note,
+            "files": list(self.files.values()),
+        })
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+            self.journal_path.unlink()
+        return path
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="编码转换备份：列出、恢复、清理")
+    arg_parser.add_argument("--store", default=DEFAULT_STORE_DIR, help=f"备份目录（相对仓库根目录，默认 {DEFAULT_STORE_DIR}）")
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="列出全部备份")
+    restore_parser = commands.add_parser("restore", help="恢复一次运行转换过的全部文件")
+    restore_parser.add_argument("run", help="运行ID（见 list 输出）")
+    restore_parser.add_argument("--dry-run", action="store_true", help="只列出将恢复的文件")
+    prune_parser = commands.add_parser("prune", help="删除旧备份和不再引用的内容")
+    prune_parser.add_argument("--keep", type=int, default=5, help="保留最近几次运行（默认5）")
+    legacy_parser = commands.add_parser("import-legacy", help="导入旧版 backup_<时间戳>/ 目录")
+    legacy_parser.add_argument("--remove", action="store_true", help="导入后删除旧目录")
+    args = arg_parser.parse_args()
+
+    store = BackupStore(Path(__file__).parent.parent, args.store)
+
+    try:
+        if args.command == "list":
+            run_ids = store.run_ids()
+            if not run_ids:
+                print("没有备份")
+            for run_id in run_ids:
+                manifest = store.load_run(run_id)
+                size = sum(entry["size"] for entry in manifest["files"])
+                note = f"  {manifest['note']}" if manifest.get("note") else ""
+                if manifest.get("incomplete"):
+                    note += "  （运行未正常结束）"
+                print(f"{run_id}  {manifest['created']}  {len(manifest['files'])} 个文件, {size / 1024:.1f} KB{note}")
+
+        elif args.command == "restore":
+            counts = {}
+            for result in store.restore(args.run, dry_run=args.dry_run):
+                counts[result["status"]] = counts.get(result["status"], 0) + 1
+                print(f"  {result['status']}: {result['path']}")
+            print(f"恢复完成: " + ", ".join(f"{status} {count}" for status, count in counts.items()))
+
+        elif args.command == "prune":
+            result = store.prune(args.keep)
+            print(f"删除 {result['runs']} 次运行, {result['objects']} 个内容对象, 释放 {result['bytes'] / 1024:.1f} KB")
+
+        elif args.command == "import-legacy":
+            imported = store.import_legacy(remove=args.remove)
+            print(f"导入 {len(imported)} 个旧备份: {', '.join(imported) or '无'}")
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
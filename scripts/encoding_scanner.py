@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+编码扫描 - 考研数学学习助手
+detect_encodings.py 与 normalize_encodings.py 共用的文件遍历和并行检测：
+os.scandir 遍历时直接跳过排除目录（不进入 .git、encoding-backup 等），
+检测函数分批在进程池中执行，结果按遍历顺序流式产出；
+检测结果按 路径+大小+mtime_ns+inode 持久化（tmp/encoding_scan_cache.json），重复扫描只检测有变化的文件
+"""
+
+import os
+import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# 每批交给子进程的文件数
+BATCH_SIZE = 32
+
+# 扫描缓存位置（相对仓库根目录）；检测逻辑变化时递增版本号使旧缓存失效
+DEFAULT_CACHE_PATH = "tmp/encoding_scan_cache.json"
+SCAN_CACHE_VERSION = 1
+
+
+class ScanCache:
+    """持久化的扫描结果：相对路径 -> 文件签名（大小, mtime_ns, inode）和检测结果"""
+
+    def __init__(self, root: Path, cache_path: str = DEFAULT_CACHE_PATH):
+        self.root = Path(root)
+        self.cache_path = self.root / cache_path
+        self.entries: Dict[str, Dict] = {}
+        self.hits = 0
+        self.misses = 0
+        # 本次查询过但未命中的文件签名，写回时使用（避免检测期间文件被修改导致签名与结果不符）
+        self._signatures: Dict[str, List[int]] = {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == SCAN_CACHE_VERSION:
+                self.entries = data['entries']
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+
+    def _key(self, path: Path) -> str:
+        return Path(path).relative_to(self.root).as_posix()
+
+    @staticmethod
+    def _signature(path: Path) -> List[int]:
+        stat = os.stat(path)
+        return [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+
+    def lookup(self, path: Path) -> Optional[Dict]:
+        """文件未变化时返回缓存的检测结果，否则返回 None"""
+        key = self._key(path)
+        try:
+            signature = self._signature(path)
+        except OSError:
+            self.misses += 1
+            return None
+
+        entry = self.entries.get(key)
+        if entry and entry['stat'] == signature:
+            self.hits += 1
+            result = dict(entry['result'])
+            if 'filepath' in result:
+                result['filepath'] = str(path)
+            return result
+
+        self.misses += 1
+        self._signatures[key] = signature
+        return None
+
+    def store(self, path: Path, result: Dict):
+        """记录检测结果；出错的结果不缓存，下次重新检测"""
+        signature = self._signatures.pop(self._key(path), None)
+        if signature is None or result.get('error'):
+            return
+        self.entries[self._key(path)] = {'stat': signature, 'result': result}
+
+    def save(self):
+        """写入缓存，删除已不存在的文件的记录"""
+        entries = {key: entry for key, entry in self.entries.items() if (self.root / key).exists()}
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': SCAN_CACHE_VERSION, 'entries': entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.cache_path)
+
+    def format_stats(self) -> str:
+        return f"扫描缓存: 命中 {self.hits}, 重新检测 {self.misses}"
+
+
+def iter_files(root: Path, exclude_dirs: Set[str],
+               accept: Optional[Callable[[Path], bool]] = None) -> Iterator[Path]:
+    """按路径名顺序遍历目录树，排除目录整棵跳过，不跟随符号链接"""
+    stack = [str(root)]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in exclude_dirs:
+                        subdirs.append(entry.path)
+                    continue
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+            path = Path(entry.path)
+            if accept is None or accept(path):
+                yield path
+
+        # 先进后出，逆序入栈保证子目录按名称顺序处理
+        stack.extend(reversed(subdirs))
+
+
+def _classify_batch(classify: Callable[[Path], Dict], paths: List[Path]) -> List[Dict]:
+    return [classify(path) for path in paths]
+
+
+def scan_files(paths: Iterable[Path], classify: Callable[[Path], Dict], workers: int = 0,
+               cache: Optional[ScanCache] = None) -> Iterator[Tuple[Path, Dict]]:
+    """对每个文件执行 classify（须为模块级函数），按输入顺序流式产出 (路径, 结果)
+
+    workers 为 0 时使用全部CPU核心；文件数不足一批时直接在当前进程执行；
+    缓存命中的文件不再检测（全部命中时不会启动子进程）
+    """
+    workers = max(1, workers or os.cpu_count() or 1)
+    paths = iter(paths)
+    # 每批为 [(路径, 缓存结果或None)]
+    batches = iter(lambda: [(path, cache.lookup(path) if cache else None)
+                            for path in islice(paths, BATCH_SIZE)], [])
+    first = next(batches, [])
+
+    if workers == 1 or len(first) < BATCH_SIZE:
+        for batch in chain([first], batches):
+            misses = [path for path, result in batch if result is None]
+            yield from _merge_batch(batch, [classify(path) for path in misses], cache)
+        return
+
+    pending = deque()  # (batch, future)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for batch in chain([first], batches):
+            misses = [path for path, result in batch if result is None]
+            future = pool.submit(_classify_batch, classify, misses) if misses else None
+            pending.append((batch, future))
+
+            # 每个进程最多预取两批，限制已检测未消费的结果数
+            if len(pending) >= workers * 2:
+                batch, future = pending.popleft()
+                yield from _merge_batch(batch, future.result() if future else [], cache)
+
+        while pending:
+            batch, future = pending.popleft()
+            yield from _merge_batch(batch, future.result() if future else [], cache)
+
+
+def _merge_batch(batch: List[Tuple[Path, Optional[Dict]]], computed: List[Dict],
+                 cache: Optional[ScanCache]) -> Iterator[Tuple[Path, Dict]]:
+    """按原顺序合并缓存结果和新检测结果，新结果写入缓存"""
+    computed = iter(computed)
+    for path, result in batch:
+        if result is None:
+            result = next(computed)
+            if cache:
+                cache.store(path, result)
+        yield path, result
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+PDF页面文本提取缓存 - 考研数学学习助手
+按 PDF内容哈希 + 页码 + 提取参数 缓存页面文本，避免重复提取和OCR
+
+缓存保存在单个SQLite文件中，超过容量上限时按最近访问时间（LRU）淘汰。
+"""
+
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Dict, Iterable
+
+DEFAULT_CACHE_PATH = "tmp/extract_cache.sqlite"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512 MB
+
+# 缓存格式版本，修改提取逻辑导致旧结果失效时递增
+CACHE_VERSION = 1
+
+
+def hash_file(filepath, chunk_size: int = 1024 * 1024) -> str:
+    """计算文件内容的SHA-256"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class PageTextCache:
+    """基于SQLite的页面文本缓存（LRU淘汰）"""
+
+    def __init__(self, cache_path: str = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_path = Path(cache_path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.cache_path))
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                key TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_access ON pages(last_access)")
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(pdf_hash: str, page_index: int, settings: Dict) -> str:
+        """生成缓存键：PDF内容哈希 + 页码 + 提取参数"""
+        settings_json = json.dumps(dict(settings, version=CACHE_VERSION), sort_keys=True)
+        raw = f"{pdf_hash}:{page_index}:{settings_json}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get_many(self, pdf_hash: str, page_indexes: Iterable[int], settings: Dict) -> Dict[int, str]:
+        """批量读取页面文本，返回 {page_index: text}，未命中的页不在结果中"""
+        keys = {self.make_key(pdf_hash, i, settings): i for i in page_indexes}
+        found = {}
+
+        key_list = list(keys)
+        # SQLite 默认最多999个绑定参数，分批查询
+        for start in range(0, len(key_list), 500):
+            batch = key_list[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            rows = self.conn.execute(
+                f"SELECT key, text FROM pages WHERE key IN ({placeholders})", batch)
+            for key, text in rows:
+                found[keys[key]] = text
+
+        if found:
+            now = time.time()
+            hit_keys = [(now, key) for key, i in keys.items() if i in found]
+            self.conn.executemany("UPDATE pages SET last_access = ? WHERE key = ?", hit_keys)
+            self.conn.commit()
+
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, pdf_hash: str, pages: Dict[int, str], settings: Dict):
+        """批量写入页面文本，写入后按容量上限淘汰"""
+        if not pages:
+            return
+
+        now = time.time()
+        rows = [(self.make_key(pdf_hash, i, settings), text, len(text.encode('utf-8')), now)
+                for i, text in pages.items()]
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO pages (key, text, size, last_access) VALUES (?, ?, ?, ?)", rows)
+        self.conn.commit()
+        self._evict()
+
+    def _evict(self):
+        """总大小超过上限时，删除最久未访问的条目"""
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        doomed = []
+        for key, size in self.conn.execute("SELECT key, size FROM pages ORDER BY last_access"):
+            doomed.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+
+        self.conn.executemany("DELETE FROM pages WHERE key = ?", doomed)
+        self.conn.commit()
+
+    def clear(self):
+        """清空缓存"""
+        self.conn.execute("DELETE FROM pages")
+        self.conn.commit()
+        self.conn.execute("VACUUM")
+
+    def stats(self) -> Dict:
+        """缓存统计信息"""
+        entries, total = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "path": str(self.cache_path),
+            "entries": entries,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def format_stats(self) -> str:
+        """格式化统计信息"""
+        s = self.stats()
+        return (f"缓存: {s['entries']} 页, {s['bytes'] / 1024 / 1024:.1f}/"
+                f"{s['max_bytes'] / 1024 / 1024:.0f} MB, "
+                f"命中 {s['hits']} / 未命中 {s['misses']} (命中率 {s['hit_rate']:.0%})")
+
+    def close(self):
+        self.conn.close()
+
+
+def main():
+    """主函数"""
+    arg_parser = argparse.ArgumentParser(description="PDF页面文本提取缓存管理")
+    arg_parser.add_argument("--path", default=DEFAULT_CACHE_PATH, help="缓存文件路径")
+    arg_parser.add_argument("--clear", action="store_true", help="清空缓存")
+    args = arg_parser.parse_args()
+
+    if not Path(args.path).exists():
+        print(f"缓存文件不存在: {args.path}")
+        sys.exit(0)
+
+    cache = PageTextCache(args.path)
+    if args.clear:
+        cache.clear()
+        print(f"已清空缓存: {args.path}")
+    print(cache.format_stats())
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+真题导入清单 - 考研数学学习助手
+记录每个源PDF的大小、修改时间、内容哈希以及生成其输出的解析器版本，
+用于增量导入：只有输入或解析器版本变化的PDF才需要重新处理；
+并保存多年份合集PDF的页码区间索引，便于单独重新导入某一年份
+"""
+
+import os
+import json
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from extraction_cache import hash_file
+
+DEFAULT_MANIFEST_PATH = "tmp/import_manifest.json"
+
+
+class ImportManifest:
+    """增量导入清单"""
+
+    def __init__(self, manifest_path: str = DEFAULT_MANIFEST_PATH):
+        self.manifest_path = Path(manifest_path)
+        self.entries: Dict[str, Dict] = {}
+        # 本次运行已计算的内容哈希 {(PDF名, 大小, 修改时间): sha256}，检测变化和记录时共用
+        self._digests: Dict[tuple, str] = {}
+
+        if self.manifest_path.exists():
+            try:
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f).get("sources", {})
+            except (OSError, ValueError) as e:
+                print(f"读取导入清单失败，将全部重新导入: {e}")
+
+    def needs_import(self, pdf_path: Path, parser_version: str) -> bool:
+        """判断PDF是否需要重新导入"""
+        entry = self.entries.get(pdf_path.name)
+        if entry is None or entry.get("parser_version") != parser_version:
+            return True
+
+        # 输出被手动删除时也需要重新导入
+        if not all(Path(output).exists() for output in entry.get("outputs", [])):
+            return True
+
+        # 大小和修改时间都未变化时直接跳过，不计算哈希
+        stat = pdf_path.stat()
+        if stat.st_size == entry["size"] and stat.st_mtime_ns == entry["mtime_ns"]:
+            return False
+
+        # 仅修改时间变化（如重新复制文件），内容未变时更新记录后跳过
+        if stat.st_size == entry["size"] and self.digest(pdf_path, stat) == entry["sha256"]:
+            entry["mtime_ns"] = stat.st_mtime_ns
+            return False
+
+        return True
+
+    def digest(self, pdf_path: Path, stat: Optional[os.stat_result] = None) -> str:
+        """内容哈希：文件大小和修改时间不变时只计算一次，导入时传给提取、页面存储和合集索引"""
+        stat = stat or pdf_path.stat()
+        key = (pdf_path.name, stat.st_size, stat.st_mtime_ns)
+        if key not in self._digests:
+            self._digests[key] = hash_file(pdf_path)
+        return self._digests[key]
+
+    def record(self, pdf_path: Path, parser_version: str, outputs: Iterable[Path], **extra):
+        """记录一次成功导入"""
+        stat = pdf_path.stat()
+        self.entries[pdf_path.name] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": self.digest(pdf_path, stat),
+            "parser_version": parser_version,
+            "outputs": sorted(str(output) for output in outputs if Path(output).exists()),
+            **extra,
+        }
+
+    def forget(self, pdf_name: str):
+        """删除一个PDF的记录但保留其输出（输出已改由其他PDF生成）"""
+        self.entries.pop(pdf_name, None)
+
+    def remove_stale(self, existing_names: Iterable[str]) -> Tuple[List[str], Set[int]]:
+        """清理已删除PDF的清单记录及其输出，返回 (被删除的输出路径, 这些PDF生成过的年份)
+
+        输出也被其他PDF的记录引用时同样删除：无法确定最后由谁写入，
+        引用它的PDF会因输出缺失在本次运行中重新导入
+        """
+        existing = set(existing_names)
+        stale = [name for name in self.entries if name not in existing]
+
+        removed = []
+        years = set()
+        for name in stale:
+            entry = self.entries.pop(name)
+            years.update(entry.get("years") or [])
+            if entry.get("year") is not None:
+                years.add(entry["year"])
+            for output in entry.get("outputs", []):
+                path = Path(output)
+                if path.is_dir():
+                    shutil.rmtree(path)
+                elif path.exists():
+                    path.unlink()
+                else:
+                    continue
+                removed.append(output)
+
+        return removed, years
+
+    def get(self, pdf_name: str) -> Optional[Dict]:
+        return self.entries.get(pdf_name)
+
+    def save(self):
+        """保存清单（先写临时文件再替换，避免中断时损坏）"""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(self.manifest_path.suffix + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"sources": self.entries}, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+
+DEFAULT_COMPILATION_INDEX_PATH = "tmp/compilation_index.json"
+
+
+class CompilationIndex:
+    """多年份合集PDF的页码区间索引：{PDF名: {sha256, years: {年份: [[起始页, 结束页], ...]}}}"""
+
+    def __init__(self, index_path: str = DEFAULT_COMPILATION_INDEX_PATH):
+        self.index_path = Path(index_path)
+        self.entries: Dict[str, Dict] = {}
+
+        if self.index_path.exists():
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"读取合集索引失败，将重新扫描: {e}")
+
+    def get_ranges(self, pdf_path: Path, year: int, pdf_hash: Optional[str] = None) -> Optional[List[List[int]]]:
+        """返回某年份的页码区间；PDF内容已变化或未建立索引时返回None
+
+        pdf_hash 为调用方已计算的内容哈希，省略时计算
+        """
+        entry = self.entries.get(pdf_path.name)
+        if entry is None or entry["sha256"] != (pdf_hash or hash_file(pdf_path)):
+            return None
+        return entry["years"].get(str(year), [])
+
+    def record(self, pdf_path: Path, year_ranges: Dict[int, List[List[int]]], pdf_hash: Optional[str] = None):
+        self.entries[pdf_path.name] = {
+            "sha256": pdf_hash or hash_file(pdf_path),
+            "years": {str(year): ranges for year, ranges in sorted(year_ranges.items())},
+        }
+
+    def save(self):
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(self.index_path.suffix + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.index_path)
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+导入过程度量 - 考研数学学习助手
+为 ExamImporter 的各阶段计时、计数，导入结束后输出汇总表并写入JSON（tmp/import_metrics/<年份>.json）；
+另提供 cProfile + tracemalloc 的整次运行剖析
+
+导入流程是逐页流式的（提取 → 页面存储 → 解析 → 标注 → 查重 → 数据库 → 导出），
+各阶段交替执行。每个流式阶段记录下游向它取数据时的累计耗时（包含上游），
+相邻两级相减即为该阶段自身的耗时
+"""
+
+import io
+import json
+import time
+import pstats
+import cProfile
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+DEFAULT_METRICS_DIR = "tmp/import_metrics"
+DEFAULT_PROFILE_DIR = "tmp/profile"
+
+
+class ImportMetrics:
+    """一次年份导入的阶段耗时和计数器"""
+
+    # 始终输出的计数器（为0时也写入），便于对比不同次导入
+    DEFAULT_COUNTERS = {
+        "cache_hit_pages": 0, "ocr_pages": 0, "ocr_seconds": 0.0, "ocr_failures": 0,
+        "parsed_blocks": 0, "rejected_blocks": 0, "truncated_blocks": 0, "export_bytes": 0,
+    }
+
+    def __init__(self, year: int, source: Optional[str] = None):
+        self.year = year
+        self.source = source
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        # 阶段名 -> {"seconds": 耗时, "items": 产出数, "chained": 是否为流式链中的一级}，按登记顺序
+        self.stages: Dict[str, Dict] = {}
+        self.counters: Counter = Counter(self.DEFAULT_COUNTERS)
+        # 流式链中最先抛出异常的阶段（异常向下游传递时不覆盖）
+        self.failed_stage: Optional[str] = None
+
+    def _stage(self, name: str, chained: bool) -> Dict:
+        return self.stages.setdefault(name, {"seconds": 0.0, "items": 0, "chained": chained})
+
+    def timed(self, name: str, iterable: Iterable) -> Iterator:
+        """流式阶段：原样产出，记录每次取下一项的耗时（包含上游阶段）"""
+        # 在建立流式链时登记（而非首次取数据时），保证阶段按上游到下游的顺序排列
+        return self._timed(name, self._stage(name, chained=True), iterable)
+
+    def _timed(self, name: str, stage: Dict, iterable: Iterable) -> Iterator:
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                stage["seconds"] += time.perf_counter() - start
+                return
+            except Exception:
+                if self.failed_stage is None:
+                    self.failed_stage = name
+                raise
+            stage["seconds"] += time.perf_counter() - start
+            stage["items"] += 1
+            yield item
+
+    @contextmanager
+    def measure(self, name: str, chained: bool = False):
+        """非流式阶段计时；chained 为 True 时表示它是消费整条流式链的最后一级"""
+        stage = self._stage(name, chained)
+        start = time.perf_counter()
+        try:
+            yield stage
+        except Exception:
+            if self.failed_stage is None:
+                self.failed_stage = name
+            raise
+        finally:
+            stage["seconds"] += time.perf_counter() - start
+
+    def count(self, name: str, value=1):
+        self.counters[name] += value
+
+    def update(self, values: Dict):
+        for name, value in values.items():
+            self.counters[name] += value
+
+    def finish(self):
+        self.finished = time.perf_counter()
+
+    def stage_seconds(self) -> Dict[str, float]:
+        """各阶段自身的耗时：流式链中的阶段减去其上游的累计耗时"""
+        result = {}
+        upstream = 0.0
+        for name, stage in self.stages.items():
+            if stage["chained"]:
+                result[name] = max(0.0, stage["seconds"] - upstream)
+                upstream = stage["seconds"]
+            else:
+                result[name] = stage["seconds"]
+        return result
+
+    def to_dict(self) -> Dict:
+        total = (self.finished or time.perf_counter()) - self.started
+        stages = []
+        for name, seconds in self.stage_seconds().items():
+            items = self.stages[name]["items"]
+            stages.append({
+                "name": name,
+                "seconds": round(seconds, 6),
+                "items": items,
+                "itemsPerSec": round(items / seconds, 2) if items and seconds else None,
+            })
+        return {
+            "year": self.year,
+            "source": self.source,
+            "timestamp": datetime.now().isoformat(timespec='seconds'),
+            "totalSeconds": round(total, 6),
+            "stages": stages,
+            "counters": {name: round(value, 6) if isinstance(value, float) else value
+                         for name, value in sorted(self.counters.items())},
+        }
+
+    def save(self, metrics_dir: str = DEFAULT_METRICS_DIR) -> Path:
+        path = Path(metrics_dir) / f"{self.year}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        return path
+
+    def format_table(self) -> str:
+        """阶段耗时和计数器汇总表"""
+        data = self.to_dict()
+        total = data["totalSeconds"] or 1
+        lines = [f"{'阶段':<12}{'耗时(ms)':>12}{'占比':>8}{'数量':>8}{'每秒':>10}"]
+        for stage in data["stages"]:
+            rate = f"{stage['itemsPerSec']:.0f}" if stage["itemsPerSec"] else "-"
+            lines.append(f"{stage['name']:<14}{stage['seconds'] * 1000:>12.1f}{stage['seconds'] / total:>8.0%}"
+                         f"{stage['items'] or '-':>8}{rate:>10}")
+        lines.append(f"{'total':<14}{data['totalSeconds'] * 1000:>12.1f}")
+        if data["counters"]:
+            lines.append("  " + ", ".join(f"{name}={value}" for name, value in data["counters"].items()))
+        return "\n".join(lines)
+
+
+@contextmanager
+def profile_run(profile_dir: str = DEFAULT_PROFILE_DIR, top: int = 15):
+    """剖析整次运行：cProfile 统计写入 .prof，tracemalloc 快照写入 .tracemalloc，并输出前几项"""
+    path = Path(profile_dir)
+    path.mkdir(parents=True, exist_ok=True)
+    stem = path / f"import-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+
+    tracemalloc.start()
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        profiler.dump_stats(f"{stem}.prof")
+        snapshot.dump(f"{stem}.tracemalloc")
+
+        output = io.StringIO()
+        pstats.Stats(profiler, stream=output).sort_stats("cumulative").print_stats(top)
+        print(f"\n🔬 CPU剖析（按累计耗时前 {top} 项），完整结果: {stem}.prof")
+        print(output.getvalue().strip())
+
+        print(f"\n🔬 内存: 当前 {current / 1024 / 1024:.1f} MB, 峰值 {peak / 1024 / 1024:.1f} MB，"
+              f"快照: {stem}.tracemalloc")
+        for stat in snapshot.statistics("lineno")[:top]:
+            print(f"  {stat}")
+
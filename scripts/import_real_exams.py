@@ -10,13 +10,51 @@ import os
 import re
 import json
 import csv
+import shutil
+import time
+import struct
+import hashlib
+import argparse
+import traceback
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from itertools import groupby
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Optional
 from dataclasses import dataclass
 import fitz  # PyMuPDF for PDF text extraction
 import pytesseract
 from PIL import Image
-import io
+
+try:
+    import orjson  # 可选：安装后用于加速候选数据的JSON序列化
+except ImportError:
+    orjson = None
+
+from extraction_cache import PageTextCache, hash_file
+from import_manifest import CompilationIndex, ImportManifest
+from import_metrics import ImportMetrics, profile_run
+from knowledge_tagger import KnowledgeTagger
+from page_store import PageStore, PageStoreWriter, index_path
+from question_dedup import DuplicateIndex
+from question_store import QuestionStore
+from validate_real_exam import RealExamValidator, review_report_path, write_review_report
+
+# 解析器版本：修改解析或导出逻辑导致输出变化时递增，触发增量导入重新处理所有PDF
+PARSER_VERSION = "7"
+
+# 多年份合集PDF：questions 按年份拆分导出候选题目，answers 只建立页码区间索引
+COMPILATION_PDFS = {
+    "1987-2022数一真题合集.pdf": "questions",
+    "1987-2022数一答案.pdf": "answers",
+}
+
+# 年份分界标题，如 "2015年全国硕士研究生入学统一考试"、"2022年全国硕士研究生招生考试"
+YEAR_HEADING_PATTERN = re.compile(r'((?:19|20)\d{2})\s*年\s*全国\s*硕\s*士\s*研\s*究\s*生\s*(?:入\s*学\s*统\s*一|招\s*生)\s*考\s*试')
+
+# 只在页首一段文字中查找年份标题，避免正文或解析中的引用被误判为分界
+YEAR_HEADING_SEARCH_CHARS = 200
 
 
 @dataclass
@@ -32,7 +70,10 @@ class QuestionCandidate:
     solution: Optional[str] = None
     explanation: str = ""
     knowledge_points: List[str] = None
+    knowledge_scores: Optional[Dict[str, float]] = None  # 自动标注的知识点相关度
+    duplicates: Optional[List[Dict]] = None  # 近似重复的已有题目 [{id, source, similarity}]
     page_num: int = 0
+    page_end: int = 0  # 题目跨页时的结束页
     confidence: float = 0.0
     parsing_notes: str = ""
 
@@ -40,258 +81,618 @@ class QuestionCandidate:
 class PDFTextExtractor:
     """PDF文本提取器"""
 
-    def __init__(self):
-        self.ocr_fallback = True
+    # 页数少于该值时不启用进程池（进程启动开销大于收益）
+    PARALLEL_MIN_PAGES = 16
+
+    # 流式提取时每批处理的页数（缓存查询、进程池任务均以批为单位）
+    STREAM_CHUNK_PAGES = 8
+
+    # tesseract探测结果，None表示尚未探测
+    _tesseract_available: Optional[bool] = None
+
+    def __init__(self, workers: int = 1, ocr_fallback: bool = True,
+                 ocr_zoom: float = 2, ocr_lang: str = 'chi_sim+eng',
+                 ocr_threads: int = 0, cache: Optional[PageTextCache] = None):
+        self.ocr_fallback = ocr_fallback
+        self.ocr_zoom = ocr_zoom  # 渲染缩放倍数，2x提高OCR质量
+        self.ocr_lang = ocr_lang
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        # tesseract是独立子进程，线程池即可并行；多进程提取时按进程数均分
+        self.ocr_threads = max(1, ocr_threads or (os.cpu_count() or 1) // self.workers)
+        self.cache = cache
+        # 累计计数：缓存命中页数、OCR页数、OCR耗时（秒，各页之和）、OCR失败页数
+        self.stats = Counter()
 
     def extract_text(self, pdf_path: str) -> List[Tuple[int, str]]:
         """从PDF提取文本，按页返回"""
-        pages_text = []
-
         try:
-            doc = fitz.open(pdf_path)
+            return list(self.iter_pages(pdf_path))
+        except Exception as e:
+            print(f"Error extracting text from {pdf_path}: {e}")
+            return []
+
+    def iter_pages(self, pdf_path: str, page_numbers: Optional[Iterable[int]] = None,
+                   pdf_hash: Optional[str] = None) -> Iterator[Tuple[int, str]]:
+        """逐页产出 (page_num, text)，按页序流式返回，内存占用与总页数无关
 
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
+        page_numbers 指定只提取部分页（1起始），省略时提取全部页；
+        pdf_hash 为调用方已计算的PDF内容哈希，省略时按需计算
+        """
+        if self.cache and pdf_hash is None:
+            pdf_hash = hash_file(pdf_path)
+
+        with fitz.open(pdf_path) as doc:
+            if page_numbers is None:
+                page_indexes = list(range(len(doc)))
+            else:
+                page_indexes = sorted(num - 1 for num in page_numbers if 0 < num <= len(doc))
+            chunks = [page_indexes[start:start + self.STREAM_CHUNK_PAGES]
+                      for start in range(0, len(page_indexes), self.STREAM_CHUNK_PAGES)]
+
+            if self.workers == 1 or len(page_indexes) < self.PARALLEL_MIN_PAGES:
+                for chunk in chunks:
+                    texts, missing = self._lookup_cache(pdf_hash, chunk)
+                    extracted, failed = self._extract_pages(doc, missing) if missing else ([], [])
+                    yield from self._finish_chunk(pdf_hash, chunk, texts, extracted, failed)
+                return
+
+        yield from self._iter_parallel(pdf_path, pdf_hash, chunks)
+
+    def cache_settings(self) -> Dict:
+        """影响提取结果的参数，作为缓存键的一部分"""
+        # tesseract不可用时的结果不能冒充OCR结果
+        ocr_enabled = self.ocr_fallback and self.tesseract_available()
+        return {"ocr": ocr_enabled, "matrix": self.ocr_zoom, "lang": self.ocr_lang}
+
+    def _lookup_cache(self, pdf_hash: Optional[str], chunk: List[int]) -> Tuple[Dict[int, str], List[int]]:
+        """查询缓存，返回已命中的文本和需要提取的页"""
+        texts = {}
+        if self.cache:
+            texts = self.cache.get_many(pdf_hash, chunk, self.cache_settings())
+        return texts, [i for i in chunk if i not in texts]
+
+    def _finish_chunk(self, pdf_hash: Optional[str], chunk: List[int], texts: Dict[int, str],
+                      extracted: List[Tuple[int, str]], failed: List[int]) -> Iterator[Tuple[int, str]]:
+        """写回缓存并按页序产出一组页；OCR失败的页不写入缓存，下次重新识别"""
+        new_texts = {page_num - 1: text for page_num, text in extracted}
+        self.stats["cache_hit_pages"] += len(texts)
+        if self.cache:
+            self.cache.put_many(pdf_hash, {i: text for i, text in new_texts.items() if i not in failed},
+                                self.cache_settings())
+        texts.update(new_texts)
+
+        for page_index in chunk:
+            yield (page_index + 1, texts[page_index])
+
+    def _iter_parallel(self, pdf_path: str, pdf_hash: Optional[str],
+                       chunks: List[List[int]]) -> Iterator[Tuple[int, str]]:
+        """按页码区间分发到进程池，每个进程独立打开PDF，结果按页序产出"""
+        pending = deque()  # (chunk, 缓存命中文本, future)
+
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(chunks))) as pool:
+            for chunk in chunks:
+                texts, missing = self._lookup_cache(pdf_hash, chunk)
+                future = None
+                if missing:
+                    future = pool.submit(_extract_page_chunk, pdf_path, missing, self._worker_settings())
+                pending.append((chunk, texts, future))
+
+                # 每个进程最多预取两个区间，限制已提取未消费的页数
+                if len(pending) >= self.workers * 2:
+                    yield from self._finish_pending(pdf_hash, pending.popleft())
+
+            while pending:
+                yield from self._finish_pending(pdf_hash, pending.popleft())
+
+    def _finish_pending(self, pdf_hash: Optional[str], pending: Tuple) -> Iterator[Tuple[int, str]]:
+        chunk, texts, future = pending
+        extracted, failed, stats = future.result() if future else ([], [], {})
+        self.stats.update(stats)
+        yield from self._finish_chunk(pdf_hash, chunk, texts, extracted, failed)
+
+    def _worker_settings(self) -> Dict:
+        """子进程重建提取器所需的参数"""
+        return {"workers": 1, "ocr_fallback": self.ocr_fallback,
+                "ocr_zoom": self.ocr_zoom, "ocr_lang": self.ocr_lang,
+                "ocr_threads": self.ocr_threads}
+
+    def _extract_pages(self, doc, page_indexes: List[int]) -> Tuple[List[Tuple[int, str]], List[int]]:
+        """提取指定页（0起始页码）的文本，文本过少的页交给OCR线程池
+
+        返回 (按页序的 (page_num, text), OCR失败的页码列表（0起始）)
+        """
+        texts = {}
+        failed = []
+        ocr_pending = deque()  # (page_index, 原始文本, future)
+
+        use_ocr = self.ocr_fallback and self.tesseract_available()
+        with ThreadPoolExecutor(max_workers=self.ocr_threads) if use_ocr else nullcontext() as ocr_pool:
+            for page_index in page_indexes:
+                page = doc.load_page(page_index)
 
                 # 直接提取文本
                 text = page.get_text()
 
-                # 如果文本太少，尝试OCR（如果可用）
-                if len(text.strip()) < 100 and self.ocr_fallback:
-                    try:
-                        ocr_text = self._extract_with_ocr(page)
-                        if ocr_text:
-                            text = ocr_text
-                    except Exception as ocr_error:
-                        print(f"OCR failed for page {page_num + 1}, using original text: {ocr_error}")
-
-                pages_text.append((page_num + 1, text.strip()))
+                # 如果文本太少，尝试OCR（渲染在当前线程，识别在线程池）
+                if use_ocr and len(text.strip()) < 100:
+                    # 限制排队页数，避免渲染好的图像堆积占用内存
+                    if len(ocr_pending) >= self.ocr_threads * 2:
+                        self._collect_ocr(ocr_pending.popleft(), texts, failed)
+                    img = self._render_page_image(page)
+                    future = ocr_pool.submit(_ocr_image, img, self.ocr_lang)
+                    ocr_pending.append((page_index, text, future))
+                else:
+                    texts[page_index] = text
+
+            while ocr_pending:
+                self._collect_ocr(ocr_pending.popleft(), texts, failed)
+
+        return [(page_index + 1, texts[page_index].strip()) for page_index in page_indexes], failed
+
+    def _collect_ocr(self, pending: Tuple, texts: Dict[int, str], failed: List[int]):
+        """等待OCR结果，失败或为空时保留原始文本；失败的页记入 failed"""
+        page_index, text, future = pending
+        self.stats["ocr_pages"] += 1
+        try:
+            ocr_text, seconds = future.result()
+            self.stats["ocr_seconds"] += seconds
+            texts[page_index] = ocr_text if ocr_text else text
+        except Exception as ocr_error:
+            print(f"OCR failed for page {page_index + 1}, using original text: {ocr_error}")
+            self.stats["ocr_failures"] += 1
+            failed.append(page_index)
+            texts[page_index] = text
+
+    def _render_page_image(self, page) -> Image.Image:
+        """将页面渲染为PIL图像，直接使用像素缓冲区，不经过PNG编解码"""
+        pix = page.get_pixmap(matrix=fitz.Matrix(self.ocr_zoom, self.ocr_zoom), alpha=False)
+        return Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+
+    @classmethod
+    def tesseract_available(cls) -> bool:
+        """检查tesseract是否可用（每个进程只探测一次）"""
+        if cls._tesseract_available is None:
+            try:
+                pytesseract.get_tesseract_version()
+                cls._tesseract_available = True
+            except Exception as e:
+                print(f"tesseract not available, OCR disabled: {e}")
+                cls._tesseract_available = False
+        return cls._tesseract_available
+
+
+def _extract_page_chunk(pdf_path: str, page_indexes: List[int],
+                        settings: Dict) -> Tuple[List[Tuple[int, str]], List[int], Dict]:
+    """进程池任务：在子进程中打开PDF并提取一组页，同时返回OCR失败的页和该组的计数"""
+    extractor = PDFTextExtractor(**settings)
+    with fitz.open(pdf_path) as doc:
+        pages, failed = extractor._extract_pages(doc, page_indexes)
+        return pages, failed, dict(extractor.stats)
+
+
+def _ocr_image(img: Image.Image, lang: str) -> Tuple[str, float]:
+    """OCR线程池任务：返回识别文本和tesseract耗时"""
+    start = time.perf_counter()
+    text = pytesseract.image_to_string(img, lang=lang)
+    return text, time.perf_counter() - start
+
+
+class QuestionLexer:
+    """题目词法分析器：一次线性扫描产出题号、选项、分数、答案、解析、题型标题和正文单元
+
+    每个词法单元是 (kind, value, text) 三元组：kind 为下列类型常量，
+    value 为解析出的值（题号、选项字母、分数、答案、题型名），text 为原文
+    """
+
+    QNUM = 'qnum'
+    OPTION = 'option'  # 行首的选项
+    INLINE_OPTION = 'inline_option'  # 行内空格之后的选项，如 "(A) 1 (B) 2" 中的 (B)
+    SCORE = 'score'
+    ANSWER = 'answer'
+    ANALYSIS = 'analysis'
+    SECTION = 'section'
+    BODY = 'body'
+
+    # 所有模式合并为一个编译好的正则，finditer 单次扫描完成切分；
+    # 开头的先行断言按首字符快速排除不可能匹配的位置。
+    # 输入须先经 clean() 处理：行首无空白，行内空白已合并为单个空格
+    PATTERN = re.compile(r"""
+        (?=^|[(（【答解A-D])
+        (?:
+        (?P<section>^[一二三四五六七八九十]+[ ]*[、.．][^\n]*?(?P<section_value>选择题|填空题|解答题)[^\n]*)
+      | (?P<qnum>^[(（]?[ ]*(?P<qnum_value>\d{1,2})[ ]*(?:[)）]|[.．、](?!\d)))
+      | (?P<option>^[(（]?[ ]*(?P<option_value>[A-D])[ ]*(?:[)）]|[.．、]))
+      | (?P<inline_option>(?<=[ ])[(（]?[ ]*(?P<inline_option_value>[A-D])[ ]*(?:[)）]|[.．、]))
+      | (?P<score>[(（][ ]*(?:本题满分)?[ ]*(?P<score_value>\d{1,2})[ ]*分[ ]*[)）])
+      | (?P<answer>(?:【答案】|答案[ ]*[：:])[ ]*(?P<answer_value>[^\n。]*))
+      | (?P<analysis>【解析】|解析[ ]*[：:])
+        )
+    """, re.MULTILINE | re.VERBOSE)
+
+    # 清理文本：合并行内空白、去掉空行，但保留换行（换行是题号和选项的定位依据）；
+    # 只替换确实需要改写的空白（单个半角空格保持不变）
+    INLINE_SPACE_PATTERN = re.compile(r'[\t\r\f\v\u3000][ \t\r\f\v\u3000]*| [ \t\r\f\v\u3000]+')
 
-            doc.close()
+    def __init__(self):
+        # 外层分组序号 -> (类型, 值分组序号)，用 match.lastindex 直接查表
+        groups = self.PATTERN.groupindex
+        self._group_kinds = {
+            groups[kind]: (kind, groups.get(kind + '_value'))
+            for kind in (self.SECTION, self.QNUM, self.OPTION, self.INLINE_OPTION,
+                         self.SCORE, self.ANSWER, self.ANALYSIS)
+        }
 
-        except Exception as e:
-            print(f"Error extracting text from {pdf_path}: {e}")
-            return []
+    def clean(self, text: str) -> str:
+        """清理文本：每行去掉首尾空格，删除空行"""
+        text = self.INLINE_SPACE_PATTERN.sub(' ', text)
+        return '\n'.join([line for line in (line.strip(' ') for line in text.split('\n')) if line]).strip()
 
-        return pages_text
+    def tokenize(self, text: str) -> Iterator[Tuple[str, Optional[str], str]]:
+        """将已清理的文本切分为词法单元"""
+        body = self.BODY
+        group_kinds = self._group_kinds
+        position = 0
 
-    def _extract_with_ocr(self, page) -> str:
-        """使用OCR提取文本"""
-        try:
-            # 检查tesseract是否可用
-            import pytesseract
-            pytesseract.get_tesseract_version()  # 这会抛出异常如果不可用
-
-            # 将页面转换为图像
-            pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))  # 2x缩放提高质量
-            img_data = pix.tobytes("png")
-            img = Image.open(io.BytesIO(img_data))
-
-            # OCR识别
-            text = pytesseract.image_to_string(img, lang='chi_sim+eng')
-            return text
-        except ImportError:
-            print("pytesseract not available, OCR disabled")
-            return ""
-        except Exception as e:
-            print(f"OCR failed: {e}")
-            return ""
+        for match in self.PATTERN.finditer(text):
+            start, end = match.span()
+            if start > position:
+                yield body, None, text[position:start]
+            position = end
 
+            kind, value_group = group_kinds[match.lastindex]
+            yield kind, match.group(value_group) if value_group else None, match.group()
 
-class QuestionParser:
-    """题目解析器"""
+        if position < len(text):
+            yield body, None, text[position:]
 
-    def __init__(self):
-        # 题目类型识别模式
-        self.choice_pattern = re.compile(r'^(\d+)\.?\s*\(?([A-D])\)?', re.MULTILINE)
-        self.blank_pattern = re.compile(r'(\d+)\.\s*\([^)]*____[^)]*\)', re.MULTILINE)
-        self.solve_pattern = re.compile(r'(\d+)\.\s*\([^)]*分[^)]*\)', re.MULTILINE)
 
-        # 选项识别模式
-        self.option_pattern = re.compile(r'^([A-D])\.?\s*(.+)$', re.MULTILINE)
+class QuestionParser:
+    """题目解析器：基于 QuestionLexer 的词法单元流直接构建题目候选"""
 
-        # 答案识别模式
-        self.answer_pattern = re.compile(r'答案[：:]\s*([A-D]|\d+|[^。\n]+)', re.MULTILINE)
+    SECTION_TYPES = {'选择题': 'choice', '填空题': 'blank', '解答题': 'solve'}
+    TYPE_PREFIXES = {'choice': 'c', 'blank': 'b', 'solve': 's'}
+    BLANK_MARKERS = ('____', '（　　）')
 
-        # 分数识别模式
-        self.score_pattern = re.compile(r'\((\d+)分\)', re.MULTILINE)
+    def __init__(self):
+        self.lexer = QuestionLexer()
 
     def parse_questions(self, pages_text: List[Tuple[int, str]], year: int) -> List[QuestionCandidate]:
         """解析题目"""
-        questions = []
+        return list(self.iter_questions(pages_text, year))
 
+    def iter_questions(self, pages_text: Iterable[Tuple[int, str]], year: int,
+                       stats: Optional[Counter] = None) -> Iterator[QuestionCandidate]:
+        """流式解析题目：跨页的题目会被拼接完整，题目结束后立即产出；stats 用于累计解析计数"""
+        stream = QuestionStream(self, year, stats)
         for page_num, text in pages_text:
-            page_questions = self._parse_page_questions(text, year, page_num)
-            questions.extend(page_questions)
-
-        return questions
-
-    def _parse_page_questions(self, text: str, year: int, page_num: int) -> List[QuestionCandidate]:
-        """解析单页题目"""
-        questions = []
-
-        # 清理文本
-        text = self._clean_text(text)
-
-        # 分割题目（通常以数字开头）
-        question_blocks = self._split_questions(text)
-
-        for i, block in enumerate(question_blocks):
-            question = self._parse_single_question(block, year, i + 1, page_num)
-            if question:
-                questions.append(question)
-
-        return questions
-
-    def _clean_text(self, text: str) -> str:
-        """清理文本"""
-        # 移除多余空白
-        text = re.sub(r'\n+', '\n', text)
-        text = re.sub(r'\s+', ' ', text)
-        return text.strip()
-
-    def _split_questions(self, text: str) -> List[str]:
-        """分割题目块"""
-        # 按题号分割
-        questions = []
-        lines = text.split('\n')
-
-        current_question = []
-        for line in lines:
-            # 检查是否是新题目的开始
-            if re.match(r'^\d+\.', line.strip()):
-                if current_question:
-                    questions.append('\n'.join(current_question))
-                current_question = [line]
-            else:
-                if current_question:
-                    current_question.append(line)
-
-        if current_question:
-            questions.append('\n'.join(current_question))
+            yield from stream.feed(page_num, text)
+        yield from stream.close()
+
+    def _build_question(self, state: Dict, question_id: str, question_type: str) -> QuestionCandidate:
+        """由词法单元累积的状态构建题目候选"""
+        body = state["body"]
+        if question_type != 'choice' and state["options"]:
+            # 非选择题不应有选项：识别出的"选项"其实是题干中的文字，原样并回题干
+            body = body + self._option_parts(state["options"])
+
+        question = QuestionCandidate(
+            id=question_id,
+            type=question_type,
+            content=self._join_lines(body),
+            page_num=state["page_start"],
+            page_end=state["page_end"],
+            confidence=0.5,  # 基础置信度
+            parsing_notes=state.get("notes") or "自动解析，需要人工审核"
+        )
+        if state["explanation"]:
+            question.explanation = self._join_lines(state["explanation"])
+
+        answer = state["answer"] or None
+        if question_type == 'choice':
+            options = [f"{letter}. {' '.join(''.join(parts).split())}" for letter, _, parts in state["options"]]
+            question.options = options[:4]  # 最多4个选项
+            question.answer = answer
+        elif question_type == 'blank':
+            question.answer = answer
+            question.accepted_answers = [answer] if answer else None
+        else:
+            question.score = state["score"]
+            question.answer = answer
 
-        return questions
+        return question
 
-    def _parse_single_question(self, block: str, year: int, question_num: int, page_num: int) -> Optional[QuestionCandidate]:
-        """解析单个题目"""
-        try:
-            # 确定题目类型
-            question_type = self._determine_question_type(block)
-
-            if not question_type:
-                return None
-
-            # 生成题目ID
-            type_prefix = {'choice': 'c', 'blank': 'b', 'solve': 's'}[question_type]
-            question_id = f"{year}-{type_prefix}-{question_num}"
-
-            question = QuestionCandidate(
-                id=question_id,
-                type=question_type,
-                content=block,
-                page_num=page_num,
-                confidence=0.5,  # 基础置信度
-                parsing_notes="自动解析，需要人工审核"
-            )
-
-            # 根据类型解析具体内容
-            if question_type == 'choice':
-                self._parse_choice_question(question, block)
-            elif question_type == 'blank':
-                self._parse_blank_question(question, block)
-            elif question_type == 'solve':
-                self._parse_solve_question(question, block)
-
-            return question
+    @staticmethod
+    def _option_parts(options: List) -> List[str]:
+        """选项的原文片段（选项标记 + 选项正文），按出现顺序"""
+        return [part for _, token_text, parts in options for part in (token_text, *parts)]
 
-        except Exception as e:
-            print(f"Error parsing question {question_num}: {e}")
-            return None
+    @staticmethod
+    def _join_lines(parts: List[str]) -> str:
+        """拼接正文片段，去掉每行首尾空白和空行"""
+        return '\n'.join(line.strip() for line in ''.join(parts).split('\n') if line.strip())
 
-    def _determine_question_type(self, block: str) -> Optional[str]:
-        """确定题目类型"""
-        # 检查是否有选项（选择题特征）
-        if self.option_pattern.search(block):
+    def _determine_question_type(self, state: Dict) -> str:
+        """确定题目类型：优先依据题型标题，其次依据选项和填空符号"""
+        if state["section_type"]:
+            return state["section_type"]
+        # 单个"选项"多半是题干行首的 A、B 等字母，不足以判定为选择题
+        if len(state["options"]) >= 2:
             return 'choice'
-
-        # 检查是否有填空符号
-        if '____' in block or '（　　）' in block:
+        parts = state["body"] + self._option_parts(state["options"])
+        if any(marker in part for part in parts for marker in self.BLANK_MARKERS):
             return 'blank'
-
-        # 检查是否有分数（解答题特征）
-        if self.score_pattern.search(block):
-            return 'solve'
-
         # 默认当作解答题
         return 'solve'
 
-    def _parse_choice_question(self, question: QuestionCandidate, block: str):
-        """解析选择题"""
-        lines = block.split('\n')
-        content_lines = []
-        options = []
 
-        for line in lines:
-            line = line.strip()
-            if not line:
+class QuestionStream:
+    """跨页题目流：在页与页之间保留未结束的题目，按题型统一编号
+
+    只缓存当前未结束的一道题，内存占用与文档总页数无关
+    """
+
+    # 未结束题目的最大字符数，超过时强制结束（通常是漏识别了后续题号）
+    MAX_OPEN_CHARS = 20000
+
+    # 新题号与上一题号的最大跨度，超出或不递增的题号视为正文（如小问编号、解题步骤）
+    MAX_NUMBER_GAP = 3
+
+    def __init__(self, parser: QuestionParser, year: int, stats: Optional[Counter] = None):
+        self.parser = parser
+        self.year = year
+        # parsed_blocks 产出的题目数，rejected_blocks 不连续而被当作正文的题号数，truncated_blocks 过长被强制结束的题目数
+        self.stats = stats if stats is not None else Counter()
+        self.section_type = None
+        self.last_number = 0
+        self.current = None
+        self.type_counts = {question_type: 0 for question_type in QuestionParser.TYPE_PREFIXES}
+
+    def feed(self, page_num: int, text: str) -> Iterator[QuestionCandidate]:
+        """输入一页文本，产出在该页中结束的题目"""
+        current = self.current
+        if current is not None:
+            # 跨页续接：在上一页末尾补换行，避免两页文字粘连
+            self._append(current, '\n')
+
+        for kind, value, token_text in self.parser.lexer.tokenize(self.parser.lexer.clean(text)):
+            if kind == QuestionLexer.QNUM and not self._is_next_number(int(value)):
+                kind = QuestionLexer.BODY
+                self.stats["rejected_blocks"] += 1
+            elif ((kind == QuestionLexer.OPTION or kind == QuestionLexer.INLINE_OPTION)
+                  and not self._accepts_option(current, kind, value)):
+                # 题干中的 "A、B 为两个随机事件"、"矩阵 A. 求" 等不是选项
+                kind = QuestionLexer.BODY
+
+            if kind == QuestionLexer.BODY:
+                if current is None:
+                    # 第一个题号之前的文字（页眉、说明等）不属于任何题目
+                    continue
+                self._append(current, token_text)
+                if current["size"] > self.MAX_OPEN_CHARS:
+                    current["notes"] = "题目文本过长，可能漏识别了后续题号，需要人工审核"
+                    self.stats["truncated_blocks"] += 1
+                    yield self._finish()
+                    current = None
+            elif kind == QuestionLexer.QNUM or kind == QuestionLexer.SECTION:
+                if current is not None:
+                    yield self._finish()
+                    current = None
+                if kind == QuestionLexer.SECTION:
+                    self.section_type = QuestionParser.SECTION_TYPES[value]
+                    # 新的题型部分允许题号重新开始
+                    self.last_number = 0
+                else:
+                    self.last_number = int(value)
+                    current = self.current = {
+                        "section_type": self.section_type, "body": [], "options": [],
+                        "explanation": None, "score": None, "answer": None,
+                        "page_start": page_num, "page_end": page_num, "size": 0,
+                    }
+            elif current is None:
                 continue
-
-            # 检查是否是选项
-            option_match = self.option_pattern.match(line)
-            if option_match:
-                options.append(f"{option_match.group(1)}. {option_match.group(2)}")
+            elif kind == QuestionLexer.OPTION or kind == QuestionLexer.INLINE_OPTION:
+                options = current["options"]
+                if value == 'A' and options:
+                    # 行首的 A 重新开始一组选项：之前的"选项"其实是题干中的文字，并回题干
+                    current["body"].extend(QuestionParser._option_parts(options))
+                    options.clear()
+                options.append([value, token_text, []])
+            elif kind == QuestionLexer.SCORE:
+                current["score"] = int(value)
+            elif kind == QuestionLexer.ANSWER:
+                current["answer"] = value.strip()
             else:
-                content_lines.append(line)
-
-        question.content = '\n'.join(content_lines)
-        question.options = options[:4]  # 最多4个选项
-
-        # 尝试提取答案
-        answer_match = self.answer_pattern.search(block)
-        if answer_match:
-            question.answer = answer_match.group(1).strip()
-
-    def _parse_blank_question(self, question: QuestionCandidate, block: str):
-        """解析填空题"""
-        # 填空题内容就是整个block
-        question.content = block
-
-        # 尝试提取答案
-        answer_match = self.answer_pattern.search(block)
-        if answer_match:
-            answer = answer_match.group(1).strip()
-            question.answer = answer
-            question.accepted_answers = [answer]
-
-    def _parse_solve_question(self, question: QuestionCandidate, block: str):
-        """解析解答题"""
-        lines = block.split('\n')
-        content_lines = []
+                # 解析之后的正文都归入解析
+                current["explanation"] = []
 
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-
-            # 提取分数
-            score_match = self.score_pattern.search(line)
-            if score_match:
-                question.score = int(score_match.group(1))
-                # 移除分数信息
-                line = self.score_pattern.sub('', line).strip()
+            if current is not None:
+                current["page_end"] = page_num
 
-            content_lines.append(line)
+    def close(self) -> Iterator[QuestionCandidate]:
+        """文档结束，产出最后一道未结束的题目"""
+        if self.current is not None:
+            yield self._finish()
 
-        question.content = '\n'.join(content_lines)
-
-        # 解答题通常需要完整的答案和解题步骤
-        # 这里暂时只设置基本结构
+    @staticmethod
+    def _accepts_option(state: Optional[Dict], kind: str, letter: str) -> bool:
+        """选项只属于选择题、且在题干之后：行首的 A 开始一组选项，后续字母须依次递增（行首或同一行内均可）"""
+        if state is None or state["explanation"] is not None or state["section_type"] not in (None, 'choice'):
+            return False
+        options = state["options"]
+        if options and ord(letter) == ord(options[-1][0]) + 1:
+            return True
+        return kind == QuestionLexer.OPTION and letter == 'A'
+
+    def _is_next_number(self, number: int) -> bool:
+        """题号是否可以作为下一题：必须递增且跨度不大"""
+        if self.last_number == 0:
+            return True
+        return self.last_number < number <= self.last_number + self.MAX_NUMBER_GAP
+
+    @staticmethod
+    def _append(state: Dict, text: str):
+        """将正文追加到解析、最后一个选项或题干"""
+        if state["explanation"] is not None:
+            state["explanation"].append(text)
+        elif state["options"]:
+            state["options"][-1][2].append(text)
+        else:
+            state["body"].append(text)
+        state["size"] += len(text)
+
+    def _finish(self) -> QuestionCandidate:
+        """结束当前题目，按题型分配全局题目ID"""
+        state = self.current
+        self.current = None
+
+        question_type = self.parser._determine_question_type(state)
+        self.type_counts[question_type] += 1
+        self.stats["parsed_blocks"] += 1
+        question_id = f"{self.year}-{QuestionParser.TYPE_PREFIXES[question_type]}-{self.type_counts[question_type]}"
+        return self.parser._build_question(state, question_id, question_type)
+
+
+def dumps_json(obj, indent: bool = True) -> str:
+    """序列化为JSON文本；安装了 orjson 时使用 orjson
+
+    对候选数据（字符串、整数、保留三位小数的得分）两者输出逐字节相同；一般情况下并不完全一致：
+    orjson 的浮点数不用指数的 "+" 和补零（1e16、0.00001 对应 json.dumps 的 1e+16、1e-05），
+    NaN 输出为 null，超出64位的整数和非字符串键会报错
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode('utf-8')
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+
+class CandidateStreamWriter:
+    """候选题目流式写入器：逐题追加写入候选JSON（或NDJSON）和审核CSV
+
+    先写入同目录下的 .tmp 临时文件，全部写完后原子替换正式文件，
+    读取方只会看到旧文件或完整的新文件；中途出错时保留旧文件
+    """
+
+    CSV_HEADER = ['id', 'type', 'page_num', 'page_end', 'confidence', 'parsing_notes', 'duplicates', 'content_preview']
+
+    FORMATS = ('json', 'ndjson')
+
+    def __init__(self, json_path: Path, csv_path: Path, export_format: str = 'json'):
+        if export_format not in self.FORMATS:
+            raise ValueError(f"不支持的导出格式: {export_format}")
+        self.json_path = json_path
+        self.csv_path = csv_path
+        self.export_format = export_format
+        self.count = 0
+        self._json_file = None
+        self._csv_file = None
+        self._csv_writer = None
+
+    @staticmethod
+    def _tmp_path(path: Path) -> Path:
+        return path.with_name(path.name + ".tmp")
+
+    def write(self, question: QuestionCandidate):
+        """写入一道题目，首次写入时才创建文件"""
+        if self._json_file is None:
+            self._open()
+
+        if self.export_format == 'ndjson':
+            self._json_file.write(dumps_json(question_to_dict(question), indent=False) + "\n")
+        else:
+            # 与 json.dump(..., indent=2) 的整体输出格式保持一致
+            item = dumps_json(question_to_dict(question))
+            separator = "\n  " if self.count == 0 else ",\n  "
+            self._json_file.write(separator + item.replace("\n", "\n  "))
+        self._csv_writer.writerow(review_row(question))
+        self.count += 1
+
+        # 及时落盘，让审核工具在后续页面仍在处理时就能从临时文件看到进度
+        self._json_file.flush()
+        self._csv_file.flush()
+
+    def _open(self):
+        self._json_file = open(self._tmp_path(self.json_path), 'w', encoding='utf-8')
+        if self.export_format == 'json':
+            self._json_file.write("[")
+        self._csv_file = open(self._tmp_path(self.csv_path), 'w', newline='', encoding='utf-8')
+        self._csv_writer = csv.writer(self._csv_file)
+        self._csv_writer.writerow(self.CSV_HEADER)
+
+    def close(self, commit: bool = True):
+        """关闭文件；commit 为 True 时用临时文件替换正式文件，否则丢弃临时文件"""
+        if self._json_file is None:
+            return
+        if self.export_format == 'json':
+            self._json_file.write("\n]")
+        self._json_file.close()
+        self._csv_file.close()
+        self._json_file = None
+        self._csv_file = None
+
+        for path in (self.json_path, self.csv_path):
+            if commit:
+                os.replace(self._tmp_path(path), path)
+            else:
+                self._tmp_path(path).unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(commit=exc_type is None)
+
+
+def question_to_dict(q: QuestionCandidate) -> Dict:
+    """将题目候选转换为候选JSON中的字典格式"""
+    q_dict = {
+        "id": q.id,
+        "type": q.type,
+        "content": q.content,
+        "explanation": q.explanation,
+        "knowledgePoints": q.knowledge_points or [],
+        "knowledgePointScores": q.knowledge_scores or {},
+        "page_num": q.page_num,
+        "page_end": q.page_end or q.page_num,
+        "confidence": q.confidence,
+        "parsing_notes": q.parsing_notes,
+        "duplicates": q.duplicates or []
+    }
+
+    if q.type == 'choice':
+        q_dict.update({
+            "options": q.options or [],
+            "answer": q.answer or ""
+        })
+    elif q.type == 'blank':
+        q_dict.update({
+            "answer": q.answer or "",
+            "acceptedAnswers": q.accepted_answers or []
+        })
+    elif q.type == 'solve':
+        q_dict.update({
+            "score": q.score or 10,
+            "answer": q.answer or "",
+            "solution": q.solution or ""
+        })
+
+    return q_dict
+
+
+def review_row(q: QuestionCandidate) -> List:
+    """审核CSV中的一行"""
+    content_preview = q.content[:100].replace('\n', ' ') + '...'
+    duplicates = "; ".join(f"{d.get('source', 'final')}:{d['id']}({d['similarity']:.2f})" for d in q.duplicates or [])
+    return [q.id, q.type, q.page_num, q.page_end or q.page_num, q.confidence, q.parsing_notes,
+            duplicates, content_preview]
 
 
 class DataExporter:
     """数据导出器"""
 
-    def __init__(self, output_dir: str = "data", review_dir: str = "review", temp_dir: str = "tmp/exam_pages"):
+    def __init__(self, output_dir: str = "data", review_dir: str = "review", temp_dir: str = "tmp/exam_pages",
+                 export_format: str = "json"):
+        self.export_format = export_format
         self.output_dir = Path(output_dir)
         self.review_dir = Path(review_dir)
         self.temp_dir = Path(temp_dir)
@@ -301,170 +702,394 @@ class DataExporter:
         self.review_dir.mkdir(exist_ok=True)
         self.temp_dir.mkdir(parents=True, exist_ok=True)
 
+    def candidate_json_path(self, year: int) -> Path:
+        return self.output_dir / f"real-exam-{year}.candidate.{self.export_format}"
+
+    def review_csv_path(self, year: int) -> Path:
+        return self.review_dir / f"{year}_mappings.csv"
+
+    def page_store_path(self, key: str) -> Path:
+        """源PDF的页面文本存储，key 由PDF内容哈希和提取参数生成（见 ExamImporter.page_store_key）"""
+        return self.temp_dir / f"{key}.pages"
+
+    def page_store_paths(self, key: str) -> List[Path]:
+        """页面文本存储的数据文件和索引"""
+        store_path = self.page_store_path(key)
+        return [store_path, index_path(store_path)]
+
+    def candidate_json_paths(self, year: int) -> List[Path]:
+        """某年份各种导出格式的候选数据路径"""
+        return [self.output_dir / f"real-exam-{year}.candidate.{export_format}"
+                for export_format in CandidateStreamWriter.FORMATS]
+
+    def output_paths(self, year: int) -> List[Path]:
+        """某年份导入产生的所有输出（页面文本存储按源PDF保存，不在此列）"""
+        return [self.candidate_json_path(year), self.review_csv_path(year), review_report_path(year, self.review_dir)]
+
+    def export_candidates(self, questions: Iterable[QuestionCandidate], year: int) -> int:
+        """流式导出候选JSON（或NDJSON）和审核CSV（单次遍历），返回导出的题目数"""
+        with CandidateStreamWriter(self.candidate_json_path(year), self.review_csv_path(year),
+                                   self.export_format) as writer:
+            for q in questions:
+                writer.write(q)
+
+        if writer.count:
+            print(f"Exported {writer.count} candidate questions to {writer.json_path}")
+            print(f"Exported review CSV to {writer.csv_path}")
+            # 删除另一种格式的旧候选文件，校验和载入数据库时不会读到过期数据
+            for path in self.candidate_json_paths(year):
+                if path != writer.json_path and path.exists():
+                    path.unlink()
+                    print(f"Removed stale candidate file {path}")
+        return writer.count
+
     def export_candidate_json(self, questions: List[QuestionCandidate], year: int):
-        """导出候选JSON文件"""
-        # 转换为字典格式
-        question_dicts = []
-        for q in questions:
-            q_dict = {
-                "id": q.id,
-                "type": q.type,
-                "content": q.content,
-                "explanation": q.explanation,
-                "knowledgePoints": q.knowledge_points or [],
-                "page_num": q.page_num,
-                "confidence": q.confidence,
-                "parsing_notes": q.parsing_notes
-            }
-
-            if q.type == 'choice':
-                q_dict.update({
-                    "options": q.options or [],
-                    "answer": q.answer or ""
-                })
-            elif q.type == 'blank':
-                q_dict.update({
-                    "answer": q.answer or "",
-                    "acceptedAnswers": q.accepted_answers or []
-                })
-            elif q.type == 'solve':
-                q_dict.update({
-                    "score": q.score or 10,
-                    "answer": q.answer or "",
-                    "solution": q.solution or ""
-                })
-
-            question_dicts.append(q_dict)
-
-        # 写入文件
-        output_file = self.output_dir / f"real-exam-{year}.candidate.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(question_dicts, f, ensure_ascii=False, indent=2)
-
-        print(f"Exported {len(question_dicts)} candidate questions to {output_file}")
+        """导出候选数据文件（按 export_format 为JSON或NDJSON，同时导出审核CSV），与 export_candidates 相同"""
+        self.export_candidates(questions, year)
 
     def export_review_csv(self, questions: List[QuestionCandidate], year: int):
         """导出审核CSV文件"""
-        csv_file = self.review_dir / f"{year}_mappings.csv"
+        csv_file = self.review_csv_path(year)
 
         with open(csv_file, 'w', newline='', encoding='utf-8') as f:
             writer = csv.writer(f)
-            writer.writerow(['id', 'type', 'page_num', 'confidence', 'parsing_notes', 'content_preview'])
+            writer.writerow(CandidateStreamWriter.CSV_HEADER)
 
             for q in questions:
-                content_preview = q.content[:100].replace('\n', ' ') + '...'
-                writer.writerow([
-                    q.id,
-                    q.type,
-                    q.page_num,
-                    q.confidence,
-                    q.parsing_notes,
-                    content_preview
-                ])
+                writer.writerow(review_row(q))
 
         print(f"Exported review CSV to {csv_file}")
 
-    def export_page_texts(self, pages_text: List[Tuple[int, str]], year: int):
+    def export_page_texts(self, pages_text: List[Tuple[int, str]], key: str):
         """导出页面文本文件"""
-        year_dir = self.temp_dir / str(year)
-        year_dir.mkdir(exist_ok=True)
-
-        for page_num, text in pages_text:
-            page_file = year_dir / f"{page_num:03d}.txt"
-            with open(page_file, 'w', encoding='utf-8') as f:
-                f.write(text)
-
-        print(f"Exported {len(pages_text)} page text files to {year_dir}")
+        for _ in self.stream_page_texts(pages_text, key):
+            pass
+
+    def stream_page_texts(self, pages_text: Iterable[Tuple[int, str]], key: str,
+                          complete: Callable[[], bool] = lambda: True) -> Iterator[Tuple[int, str]]:
+        """边将页面文本写入打包存储边原样产出，供下游继续解析；结束时 complete() 为假则保留旧存储"""
+        store_path = self.page_store_path(key)
+        with PageStoreWriter(store_path) as writer:
+            for page_num, text in pages_text:
+                writer.add(page_num, text)
+                yield page_num, text
+            if not complete():
+                writer.close(commit=False)
+                return
+
+        print(f"Exported {writer.count} pages to {store_path}")
+
+    def remove_legacy_page_texts(self, year: int):
+        """清理旧版本按年份导出的页面文本：<年份>/NNN.txt 目录和 <年份>.pages 存储"""
+        legacy_dir = self.temp_dir / str(year)
+        if legacy_dir.is_dir():
+            shutil.rmtree(legacy_dir)
+        legacy_store = self.temp_dir / f"{year}.pages"
+        for path in (legacy_store, index_path(legacy_store)):
+            if path.exists():
+                path.unlink()
 
 
 class ExamImporter:
     """历年真题导入器"""
 
-    def __init__(self):
-        self.extractor = PDFTextExtractor()
+    def __init__(self, workers: int = 1, use_cache: bool = True, export_format: str = "json"):
+        self.cache = PageTextCache() if use_cache else None
+        self.extractor = PDFTextExtractor(workers=workers, cache=self.cache)
         self.parser = QuestionParser()
-        self.exporter = DataExporter()
-
-    def import_year(self, pdf_path: str, year: int):
-        """导入一年份的真题"""
+        self.exporter = DataExporter(export_format=export_format)
+        self.tagger = KnowledgeTagger()
+        self.dedup = DuplicateIndex.load()
+        self.store = QuestionStore()
+        self.validator = RealExamValidator(workers=1)
+
+    def import_year(self, pdf_path: str, year: int, pdf_hash: Optional[str] = None):
+        """导入一年份的真题；pdf_hash 为已计算的PDF内容哈希，省略时计算"""
         print(f"🔄 开始导入 {year} 年真题: {pdf_path}")
+        pdf_hash = pdf_hash or hash_file(pdf_path)
+        return self._import_pages(self.source_pages(pdf_path, pdf_hash), year, source=pdf_path)
+
+    def page_store_key(self, pdf_hash: str) -> str:
+        """源PDF页面文本存储的键：PDF内容哈希 + 提取参数（与提取缓存的键相同的依据）"""
+        settings = json.dumps(self.extractor.cache_settings(), sort_keys=True)
+        return hashlib.sha256(f"{pdf_hash}:{settings}".encode('utf-8')).hexdigest()[:16]
+
+    def source_pages(self, pdf_path: str, pdf_hash: str,
+                     page_numbers: Optional[Iterable[int]] = None) -> Iterator[Tuple[int, str]]:
+        """源PDF的页面流：已有该PDF的页面文本存储时通过 mmap 按页读取，不再打开PDF；
+        否则提取，提取全部页时同时写入存储（有OCR失败页时不保存，下次重新识别）
+
+        page_numbers 指定只读取部分页（1起始），省略时为全部页
+        """
+        key = self.page_store_key(pdf_hash)
+        store_path = self.exporter.page_store_path(key)
+        store = self._open_page_store(store_path)
+        if store is not None:
+            with store:
+                wanted = store.page_numbers() if page_numbers is None else sorted(page_numbers)
+                if all(page_num in store for page_num in wanted):
+                    print(f"📦 从页面文本存储读取 {len(wanted)} 页: {store_path}")
+                    for page_num in wanted:
+                        yield page_num, store[page_num]
+                    return
+
+        pages = self.extractor.iter_pages(pdf_path, page_numbers, pdf_hash=pdf_hash)
+        if page_numbers is not None:
+            yield from pages
+            return
 
-        # 1. 提取文本
-        print("📄 提取PDF文本...")
-        pages_text = self.extractor.extract_text(pdf_path)
-        if not pages_text:
-            print(f"❌ 无法提取 {year} 年PDF文本")
-            return False
+        ocr_failures = self.extractor.stats["ocr_failures"]
+        yield from self.exporter.stream_page_texts(
+            pages, key, complete=lambda: self.extractor.stats["ocr_failures"] == ocr_failures)
 
-        # 2. 导出页面文本
-        self.exporter.export_page_texts(pages_text, year)
+    @staticmethod
+    def _open_page_store(store_path: Path) -> Optional[PageStore]:
+        """打开页面文本存储；不存在或已损坏时返回None"""
+        if not index_path(store_path).exists():
+            return None
+        try:
+            return PageStore(store_path)
+        except (OSError, ValueError, struct.error) as e:
+            print(f"⚠️ 页面文本存储无法读取，重新提取: {e}")
+            return None
 
-        # 3. 解析题目
-        print("🔍 解析题目...")
-        questions = self.parser.parse_questions(pages_text, year)
-        if not questions:
-            print(f"⚠️ 未找到 {year} 年的题目")
+    def _import_pages(self, pages: Iterable[Tuple[int, str]], year: int, source: Optional[str] = None) -> bool:
+        """将一年份的页面流依次导出页面文本、解析并导出候选数据，结束后输出各阶段度量"""
+        # 提取（或读取页面文本存储） → 解析 → 标注知识点 → 查重 → 写入题目数据库 → 导出候选数据，逐页流式处理
+        print("📄 提取PDF文本并解析题目...")
+        metrics = ImportMetrics(year, source)
+        extractor_stats = Counter(self.extractor.stats)
+        parse_stats = Counter()
+        # 查重阶段会先删除该年份的旧候选再逐题加入；导入中途失败时恢复，避免把不完整的索引保存下来
+        dedup_entries = self.dedup.year_entries(year, 'candidate')
+        try:
+            self.exporter.remove_legacy_page_texts(year)
+            pages = metrics.timed("extract", pages)
+            questions = metrics.timed("parse", self.parser.iter_questions(pages, year, parse_stats))
+            questions = metrics.timed("tag", self.tagger.tag_stream(questions))
+            questions = metrics.timed("dedup", self.dedup.annotate_stream(questions, year))
+            questions = metrics.timed("store", self.store.stream_year(questions, year, question_to_dict))
+            with metrics.measure("export", chained=True) as stage:
+                question_count = stage["items"] = self.exporter.export_candidates(questions, year)
+        except Exception as e:
+            self.dedup.restore_year(year, 'candidate', dedup_entries)
+            if metrics.failed_stage == "extract":
+                print(f"❌ 无法提取 {year} 年PDF文本: {e}")
+            else:
+                # 解析、标注、查重、数据库、导出阶段的错误通常是程序问题，输出完整的调用栈
+                print(f"❌ {year} 年导入失败（{metrics.failed_stage or '未知'} 阶段）: {e}")
+                traceback.print_exc()
             return False
 
-        print(f"📝 发现 {len(questions)} 个题目候选")
+        with metrics.measure("dedup_save"):
+            self.dedup.save()
+
+        if self.cache:
+            print(f"💾 {self.cache.format_stats()}")
 
-        # 4. 导出候选数据
-        self.exporter.export_candidate_json(questions, year)
+        metrics.update(self.extractor.stats - extractor_stats)
+        metrics.update(parse_stats)
+        if question_count:
+            print(f"📝 发现 {question_count} 个题目候选")
+            metrics.count("export_bytes", sum(path.stat().st_size for path in (
+                self.exporter.candidate_json_path(year), self.exporter.review_csv_path(year))))
+            with metrics.measure("validate"):
+                self._validate_candidates(year)
+        self._report_metrics(metrics)
 
-        # 5. 导出审核文件
-        self.exporter.export_review_csv(questions, year)
+        if not question_count:
+            print(f"⚠️ 未找到 {year} 年的题目")
+            return False
 
         print(f"✅ {year} 年真题导入完成")
         return True
 
-    def import_all_years(self, pdf_dir: str = "考研真题"):
-        """导入所有年份的真题"""
+    @staticmethod
+    def _report_metrics(metrics: ImportMetrics):
+        """输出阶段耗时汇总表并写入度量JSON"""
+        metrics.finish()
+        path = metrics.save()
+        print(f"⏱️ {metrics.year} 年导入度量（{path}）:")
+        print(metrics.format_table())
+
+    def _validate_candidates(self, year: int):
+        """校验刚导出的候选数据并生成审核报告（规则同 validate_real_exam.js）"""
+        result = self.validator.validate_file(self.exporter.candidate_json_path(year), year)
+        self.validator.save()
+        report_path = write_review_report(result, self.exporter.review_dir)
+        status = "✅ 通过" if result['valid'] else "❌ 失败"
+        print(f"🔍 候选数据校验{status}: {len(result['errors'])} 个错误, {len(result['warnings'])} 个警告，"
+              f"审核报告 {report_path}")
+
+    def import_compilation(self, pdf_path: str, kind: str = "questions", pdf_hash: Optional[str] = None) -> List[int]:
+        """单次扫描多年份合集PDF，按年份分界将页面分流到各年份的候选输出，返回导入的年份
+
+        整个合集只写一个页面文本存储，之后单独重新导入某一年份时从中按页读取
+        """
+        print(f"🔄 开始拆分合集: {pdf_path}")
+        pdf_hash = pdf_hash or hash_file(pdf_path)
+
+        year_ranges: Dict[int, List[List[int]]] = {}
+        pages = self._split_years(self.source_pages(pdf_path, pdf_hash), year_ranges)
+
+        imported_years = []
+        for year, group in groupby(pages, key=lambda item: item[0]):
+            year_pages = ((page_num, text) for _, page_num, text in group)
+
+            # 首个年份标题之前的封面、目录页，以及答案合集只需要建立索引
+            if year is None or kind != "questions":
+                for _ in year_pages:
+                    pass
+                continue
+
+            if year in imported_years:
+                print(f"⚠️ {year} 年的页面不连续，后续页面请使用索引单独重新导入该年份")
+                for _ in year_pages:
+                    pass
+                continue
+
+            if self._import_pages(year_pages, year, source=pdf_path):
+                imported_years.append(year)
+
+        index = CompilationIndex()
+        index.record(Path(pdf_path), year_ranges, pdf_hash)
+        index.save()
+
+        print(f"📑 合集索引: 识别出 {len(year_ranges)} 个年份，{len(imported_years)} 个年份导出候选题目")
+        return imported_years
+
+    def import_compilation_year(self, pdf_path: str, year: int, pdf_hash: Optional[str] = None) -> bool:
+        """利用页码区间索引，只提取合集中某一年份的页面重新导入"""
+        # 内容哈希只计算一次，检查索引、读取页面存储、重新扫描时共用
+        pdf_hash = pdf_hash or hash_file(pdf_path)
+        index = CompilationIndex()
+        ranges = index.get_ranges(Path(pdf_path), year, pdf_hash)
+        if ranges is None:
+            print("📑 合集索引不存在或PDF已变化，重新扫描整个合集...")
+            return year in self.import_compilation(pdf_path, pdf_hash=pdf_hash)
+        if not ranges:
+            print(f"❌ 合集中没有 {year} 年的页面")
+            return False
+
+        page_numbers = [num for start, end in ranges for num in range(start, end + 1)]
+        print(f"🔄 从合集导入 {year} 年真题: 第 {ranges[0][0]}-{ranges[-1][1]} 页")
+        pages = self.source_pages(pdf_path, pdf_hash, page_numbers)
+        return self._import_pages(pages, year, source=pdf_path)
+
+    def _split_years(self, pages: Iterable[Tuple[int, str]],
+                     year_ranges: Dict[int, List[List[int]]]) -> Iterator[Tuple[Optional[int], int, str]]:
+        """为每页标注所属年份，同时记录各年份的页码区间"""
+        current_year = None
+        for page_num, text in pages:
+            match = YEAR_HEADING_PATTERN.search(text[:YEAR_HEADING_SEARCH_CHARS])
+            if match and int(match.group(1)) != current_year:
+                current_year = int(match.group(1))
+                year_ranges.setdefault(current_year, []).append([page_num, page_num])
+            elif current_year is not None:
+                year_ranges[current_year][-1][1] = page_num
+
+            yield current_year, page_num, text
+
+    def _remove_years(self, years: Iterable[int]):
+        """从重复检测索引和题目数据库中删除年份的候选题目；仍有源PDF的年份会在随后重新导入"""
+        for year in sorted(years):
+            print(f"🗑️ 删除 {year} 年的索引和数据库记录")
+            self.dedup.remove_year(year, 'candidate')
+            self.store.delete_year(year, 'candidate')
+        self.dedup.save()
+
+    def import_all_years(self, pdf_dir: str = "考研真题", force: bool = False):
+        """导入所有年份的真题（增量：只处理输入或解析器版本有变化的PDF）"""
         pdf_dir = Path(pdf_dir)
         if not pdf_dir.exists():
             print(f"❌ PDF目录不存在: {pdf_dir}")
             return
 
-        # PDF文件名到年份的映射
+        # PDF文件名到年份的映射；同一年份有多个PDF时，由排在前面的PDF生成该年份的输出
         year_mapping = {
             "2026年考研数学一真题及参考答案.pdf": 2026,
             "2025考研数学（一）真题试卷及解析详细版.pdf": 2025,
             "2024年考研数学一真题及答案.pdf": 2024,
             "2023年考研数学一试题.pdf": 2023,
-            "2023年考研数学一参考答案及解析.pdf": 2023,  # 答案文件
-            "1987-2022数一真题合集.pdf": None,  # 需要特殊处理
-            "1987-2022数一答案.pdf": None,  # 需要特殊处理
+            "2023年考研数学一参考答案及解析.pdf": 2023,  # 答案文件，仅在试题文件不存在时使用
         }
 
+        manifest = ImportManifest()
+        pdf_files = sorted(pdf_dir.glob("*.pdf"))
+
+        # 每个年份只由一个PDF生成输出，与处理顺序和哪个PDF发生变化无关，增量导入与全量导入结果一致
+        existing_names = {pdf_file.name for pdf_file in pdf_files}
+        year_owners: Dict[int, str] = {}
+        for name, year in year_mapping.items():
+            if name in existing_names:
+                year_owners.setdefault(year, name)
+
+        # 清理已删除PDF的输出，以及这些年份在重复检测索引和题目数据库中的题目
+        stale_outputs, stale_years = manifest.remove_stale(existing_names)
+        for output in stale_outputs:
+            print(f"🗑️ 删除过期输出: {output}")
+        if stale_years:
+            self._remove_years(stale_years)
+
         success_count = 0
-        for pdf_file in pdf_dir.glob("*.pdf"):
+        unchanged_count = 0
+        for pdf_file in pdf_files:
+            if pdf_file.name in COMPILATION_PDFS:
+                if not force and not manifest.needs_import(pdf_file, PARSER_VERSION):
+                    unchanged_count += 1
+                    continue
+                try:
+                    pdf_hash = manifest.digest(pdf_file)
+                    years = self.import_compilation(str(pdf_file), COMPILATION_PDFS[pdf_file.name], pdf_hash)
+                    success_count += len(years)
+                    outputs = [path for year in years for path in self.exporter.output_paths(year)]
+                    outputs += self.exporter.page_store_paths(self.page_store_key(pdf_hash))
+                    manifest.record(pdf_file, PARSER_VERSION, outputs, years=years)
+                except Exception as e:
+                    print(f"❌ 拆分合集失败 {pdf_file.name}: {e}")
+                continue
+
             year = year_mapping.get(pdf_file.name)
             if year is None:
                 print(f"⚠️ 跳过未知PDF文件: {pdf_file.name}")
                 continue
 
+            if year_owners[year] != pdf_file.name:
+                print(f"⚠️ 跳过 {pdf_file.name}: {year} 年由 {year_owners[year]} 导入")
+                manifest.forget(pdf_file.name)
+                continue
+
+            if not force and not manifest.needs_import(pdf_file, PARSER_VERSION):
+                unchanged_count += 1
+                continue
+
             try:
-                if self.import_year(str(pdf_file), year):
+                pdf_hash = manifest.digest(pdf_file)
+                if self.import_year(str(pdf_file), year, pdf_hash):
                     success_count += 1
+                    outputs = self.exporter.output_paths(year) + self.exporter.page_store_paths(
+                        self.page_store_key(pdf_hash))
+                    manifest.record(pdf_file, PARSER_VERSION, outputs, year=year)
             except Exception as e:
                 print(f"❌ 导入 {year} 年失败: {e}")
 
-        print(f"\n📊 导入完成: {success_count} 个年份成功导入")
-
-
-def main():
-    """主函数"""
-    print("🚀 考研数学历年真题导入工具")
-    print("=" * 50)
+        manifest.save()
+        print(f"\n📊 导入完成: {success_count} 个年份成功导入, {unchanged_count} 个PDF未变化已跳过")
 
-    importer = ExamImporter()
 
-    # 检查命令行参数
-    import sys
-    if len(sys.argv) > 1:
+def run_import(importer: ExamImporter, args):
+    """按命令行参数执行导入"""
+    if args.pdf_path and Path(args.pdf_path).name in COMPILATION_PDFS:
+        # 多年份合集：指定年份时按索引只导入该年份，否则整体拆分
+        if args.year:
+            importer.import_compilation_year(args.pdf_path, args.year)
+        else:
+            importer.import_compilation(args.pdf_path, COMPILATION_PDFS[Path(args.pdf_path).name])
+    elif args.pdf_path:
         # 导入指定年份
-        pdf_path = sys.argv[1]
-        if len(sys.argv) > 2:
-            year = int(sys.argv[2])
+        pdf_path = args.pdf_path
+        if args.year:
+            year = args.year
         else:
             # 从文件名推断年份
             year_match = re.search(r'(\d{4})', pdf_path)
@@ -473,7 +1098,31 @@ def main():
         importer.import_year(pdf_path, year)
     else:
         # 导入所有年份
-        importer.import_all_years()
+        importer.import_all_years(force=args.force)
+
+
+def main():
+    """主函数"""
+    arg_parser = argparse.ArgumentParser(description="考研数学历年真题导入工具")
+    arg_parser.add_argument("pdf_path", nargs="?", help="单个PDF路径，省略时导入 考研真题/ 下的所有年份")
+    arg_parser.add_argument("year", nargs="?", type=int, help="年份，省略时从文件名推断")
+    arg_parser.add_argument("-j", "--workers", type=int, default=1,
+                            help="PDF提取进程数（0表示使用全部CPU核心，默认1）")
+    arg_parser.add_argument("--no-cache", action="store_true", help="不使用页面文本缓存，强制重新提取")
+    arg_parser.add_argument("--force", action="store_true", help="忽略导入清单，重新导入所有PDF")
+    arg_parser.add_argument("--format", choices=CandidateStreamWriter.FORMATS, default="json",
+                            help="候选数据格式：json 为缩进的JSON数组，ndjson 为每行一题（默认json）")
+    arg_parser.add_argument("--profile", action="store_true",
+                            help="剖析本次运行：cProfile 和 tracemalloc 快照写入 tmp/profile/（-j 大于1时不含子进程）")
+    args = arg_parser.parse_args()
+
+    print("🚀 考研数学历年真题导入工具")
+    print("=" * 50)
+
+    importer = ExamImporter(workers=args.workers, use_cache=not args.no_cache, export_format=args.format)
+
+    with profile_run() if args.profile else nullcontext():
+        run_import(importer, args)
 
 
 if __name__ == "__main__":
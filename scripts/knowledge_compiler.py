@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+知识点数据编译 - 考研数学学习助手
+将 js/knowledge-data.js 拆分为：
+- js/knowledge-outline.js：与原文件相同的函数，但知识点树只含 学科 → 章节 → 知识点 的大纲（无 content）
+- data/knowledge/<章节ID>.<内容哈希>.json：各章节知识点的 content，页面打开知识点时按章节加载
+
+编辑者仍然只修改 js/knowledge-data.js，修改后重新运行本脚本；
+大纲和分片可以逐字节还原出原文件，生成时会先校验这一点
+
+用法:
+  python scripts/knowledge_compiler.py            # 生成大纲和分片
+  python scripts/knowledge_compiler.py --check    # 检查大纲和分片是否与 knowledge-data.js 一致
+  python scripts/knowledge_compiler.py --restore  # 由大纲和分片还原 knowledge-data.js
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+from knowledge_data import (KNOWLEDGE_DATA_PATH, JSLiteralParser, find_tree_literal,
+                            format_js_literal)
+
+ROOT_DIR = Path(__file__).parent.parent
+OUTLINE_PATH = ROOT_DIR / "js" / "knowledge-outline.js"
+SHARD_DIR = "data/knowledge"
+
+GENERATED_HEADER = "// 由 scripts/knowledge_compiler.py 根据 js/knowledge-data.js 生成，请勿直接编辑\n"
+SHARDS_MARKER = "\n// ========== 章节内容分片（生成） ==========\n"
+SHARDS_VARIABLE = "const KNOWLEDGE_CHAPTER_SHARDS = "
+
+
+def parse_source(source: str) -> Tuple[str, Dict, Dict, str]:
+    """拆分源文件，返回 (知识点树之前的文本, 知识点树, 注释和空行, 知识点树之后的文本)"""
+    start = find_tree_literal(source)
+    parser = JSLiteralParser(source)
+    tree, end = parser.parse(start)
+    return source[:start], tree, parser.trivia, source[end:]
+
+
+def compile_knowledge(source: str) -> Tuple[str, Dict[str, str]]:
+    """编译知识点数据，返回 (大纲JS文本, {分片路径: 分片JSON文本})"""
+    prefix, tree, trivia, suffix = parse_source(source)
+
+    shards = {}
+    shard_urls = {}
+    for subject in tree.values():
+        for chapter in subject['chapters']:
+            contents = {unit['id']: unit.pop('content') for unit in chapter['units']}
+            text = json.dumps(contents, ensure_ascii=False, separators=(',', ':'))
+            digest = hashlib.sha256(text.encode('utf-8')).hexdigest()[:8]
+            url = f"{SHARD_DIR}/{chapter['id']}.{digest}.json"
+            shards[url] = text
+            shard_urls[chapter['id']] = url
+
+    outline = (GENERATED_HEADER + prefix + format_js_literal(tree, 1, trivia) + suffix
+               + SHARDS_MARKER + SHARDS_VARIABLE + format_js_literal(shard_urls) + ";\n")
+    return outline, shards
+
+
+def restore_source(outline: str, load_shard: Callable[[str], str]) -> str:
+    """由大纲和分片还原 knowledge-data.js 的文本"""
+    if not outline.startswith(GENERATED_HEADER) or SHARDS_MARKER not in outline:
+        raise ValueError("不是由 knowledge_compiler.py 生成的大纲文件")
+
+    body, shard_block = outline[len(GENERATED_HEADER):].split(SHARDS_MARKER, 1)
+    shard_urls, _ = JSLiteralParser(shard_block).parse(len(SHARDS_VARIABLE))
+    prefix, tree, trivia, suffix = parse_source(body)
+
+    for subject in tree.values():
+        for chapter in subject['chapters']:
+            contents = json.loads(load_shard(shard_urls[chapter['id']]))
+            for i, unit in enumerate(chapter['units']):
+                # content 位于 difficulty 之后
+                items = list(unit.items())
+                position = list(unit).index('difficulty') + 1
+                items.insert(position, ('content', contents[unit['id']]))
+                chapter['units'][i] = dict(items)
+
+    return prefix + format_js_literal(tree, 1, trivia) + suffix
+
+
+def read_shard(url: str) -> str:
+    return (ROOT_DIR / url).read_text(encoding='utf-8')
+
+
+def write_atomic(path: Path, text: str):
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def build(source_path: Path = KNOWLEDGE_DATA_PATH, outline_path: Path = OUTLINE_PATH) -> Tuple[str, Dict[str, str]]:
+    """生成大纲和分片，写入前校验可还原出原文件；删除不再使用的旧分片"""
+    source = source_path.read_text(encoding='utf-8')
+    outline, shards = compile_knowledge(source)
+    if restore_source(outline, shards.__getitem__) != source:
+        raise ValueError(f"{source_path} 的格式无法由大纲和分片逐字节还原，请检查是否有行内注释等非常规写法")
+
+    shard_dir = ROOT_DIR / SHARD_DIR
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    for url, text in shards.items():
+        path = ROOT_DIR / url
+        # 文件名包含内容哈希，已存在即内容相同
+        if not path.exists():
+            write_atomic(path, text)
+    for path in shard_dir.glob("*.json"):
+        if f"{SHARD_DIR}/{path.name}" not in shards:
+            path.unlink()
+
+    write_atomic(outline_path, outline)
+    return outline, shards
+
+
+def main():
+    """主函数"""
+    arg_parser = argparse.ArgumentParser(description="知识点数据编译：生成大纲和按章节的内容分片")
+    arg_parser.add_argument("--check", action="store_true", help="只检查大纲和分片是否为最新")
+    arg_parser.add_argument("--restore", action="store_true", help="由大纲和分片还原 knowledge-data.js")
+    arg_parser.add_argument("--output", default=str(KNOWLEDGE_DATA_PATH), help="--restore 的输出路径")
+    args = arg_parser.parse_args()
+
+    if args.restore:
+        source = restore_source(OUTLINE_PATH.read_text(encoding='utf-8'), read_shard)
+        write_atomic(Path(args.output), source)
+        print(f"✅ 已还原 {args.output} ({len(source.encode('utf-8')) / 1024:.1f} KB)")
+        return
+
+    if args.check:
+        source = KNOWLEDGE_DATA_PATH.read_text(encoding='utf-8')
+        outline, shards = compile_knowledge(source)
+        current = OUTLINE_PATH.read_text(encoding='utf-8') if OUTLINE_PATH.exists() else ""
+        missing = [url for url in shards if not (ROOT_DIR / url).exists()]
+        if outline != current or missing:
+            print("❌ 大纲或分片不是最新，请运行 python scripts/knowledge_compiler.py")
+            sys.exit(1)
+        print("✅ 大纲和分片与 knowledge-data.js 一致")
+        return
+
+    outline, shards = build()
+    source_size = KNOWLEDGE_DATA_PATH.stat().st_size
+    outline_size = len(outline.encode('utf-8'))
+    shard_sizes = sorted(len(text.encode('utf-8')) for text in shards.values())
+    print(f"✅ 已生成 {OUTLINE_PATH.relative_to(ROOT_DIR)} 和 {len(shards)} 个章节分片")
+    print(f"  原文件 {source_size / 1024:.1f} KB → 大纲 {outline_size / 1024:.1f} KB "
+          f"(首次加载减少 {1 - outline_size / source_size:.0%})")
+    print(f"  分片 {sum(shard_sizes) / 1024:.1f} KB，单章最大 {shard_sizes[-1] / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+知识点数据读取工具 - 考研数学学习助手
+解析 js/knowledge-data.js 中 getDefaultKnowledgeTree() 返回的对象字面量，
+得到 学科 -> 章节 -> 知识点 的Python数据结构
+"""
+
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+KNOWLEDGE_DATA_PATH = Path(__file__).parent.parent / "js" / "knowledge-data.js"
+
+TREE_FUNCTION = "function getDefaultKnowledgeTree()"
+
+IDENTIFIER_PATTERN = re.compile(r'^[A-Za-z_$][\w$]*$')
+
+JS_ESCAPES = {
+    'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0',
+}
+
+
+class JSLiteralError(ValueError):
+    """对象字面量解析错误"""
+
+    def __init__(self, message: str, source: str, position: int):
+        line = source.count('\n', 0, position) + 1
+        super().__init__(f"{message} (第 {line} 行)")
+        self.position = position
+
+
+class JSLiteralParser:
+    """JavaScript 对象字面量解析器
+
+    支持对象、数组、单/双引号字符串、模板字符串（不含 ${} 插值）、数字、
+    true/false/null、标识符键以及注释，足以覆盖 knowledge-data.js 的数据写法
+
+    解析时记录带 id 的对象之前的注释和空行（trivia: {id: [行, ...]}），
+    供 format_js_literal 还原源文件格式
+    """
+
+    TOKEN_PATTERN = re.compile(r"""
+        (?P<space>\s+|//[^\n]*|/\*.*?\*/)
+      | (?P<punct>[{}\[\]:,])
+      | (?P<string>'(?:[^'\\\n]|\\.)*'|"(?:[^"\\\n]|\\.)*")
+      | (?P<template>`(?:[^`\\]|\\.)*`)
+      | (?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+      | (?P<word>[A-Za-z_$][\w$]*)
+    """, re.VERBOSE | re.DOTALL)
+
+    ESCAPE_PATTERN = re.compile(r"\\(u\{[0-9a-fA-F]+\}|u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|\n|.)", re.DOTALL)
+
+    def __init__(self, source: str):
+        self.source = source
+        self.position = 0
+        self.gap = ""
+        self.trivia: Dict[str, List[str]] = {}
+
+    def parse(self, start: int = 0) -> Tuple[Any, int]:
+        """从 start 开始解析一个值，返回 (值, 结束位置)"""
+        self.position = start
+        value = self._parse_value(self._next())
+        return value, self.position
+
+    def _next(self) -> Tuple[str, str, int]:
+        """读取下一个非空白词法单元，返回 (类型, 原文, 起始位置)；跳过的空白和注释保存在 gap"""
+        gap_start = self.position
+        while True:
+            if self.position >= len(self.source):
+                raise JSLiteralError("意外的文件结尾", self.source, self.position)
+            match = self.TOKEN_PATTERN.match(self.source, self.position)
+            if not match:
+                raise JSLiteralError(f"无法识别的字符 {self.source[self.position]!r}", self.source, self.position)
+            self.position = match.end()
+            if match.lastgroup != 'space':
+                self.gap = self.source[gap_start:match.start()]
+                return match.lastgroup, match.group(), match.start()
+
+    def _parse_value(self, token: Tuple[str, str, int]) -> Any:
+        kind, text, start = token
+        if kind == 'punct' and text == '{':
+            return self._parse_object()
+        if kind == 'punct' and text == '[':
+            return self._parse_array()
+        if kind == 'string':
+            return self._unescape(text[1:-1])
+        if kind == 'template':
+            if '${' in text:
+                raise JSLiteralError("不支持带插值的模板字符串", self.source, start)
+            return self._unescape(text[1:-1])
+        if kind == 'number':
+            return float(text) if any(c in text for c in '.eE') else int(text)
+        if kind == 'word' and text in ('true', 'false', 'null'):
+            return {'true': True, 'false': False, 'null': None}[text]
+        raise JSLiteralError(f"意外的 {text!r}", self.source, start)
+
+    def _parse_object(self) -> Dict[str, Any]:
+        result = {}
+        while True:
+            kind, text, start = self._next()
+            if kind == 'punct' and text == '}':
+                return result
+            if kind == 'string':
+                key = self._unescape(text[1:-1])
+            elif kind in ('word', 'number'):
+                key = text
+            else:
+                raise JSLiteralError(f"无效的对象键 {text!r}", self.source, start)
+            gap = self.gap
+
+            kind, text, start = self._next()
+            if text != ':':
+                raise JSLiteralError("对象键后缺少冒号", self.source, start)
+            result[key] = self._parse_value(self._next())
+            self._record_trivia(gap, result[key])
+
+            kind, text, start = self._next()
+            if text == '}':
+                return result
+            if text != ',':
+                raise JSLiteralError("对象成员之间缺少逗号", self.source, start)
+
+    def _parse_array(self) -> list:
+        result = []
+        while True:
+            token = self._next()
+            if token[1] == ']':
+                return result
+            gap = self.gap
+            result.append(self._parse_value(token))
+            self._record_trivia(gap, result[-1])
+
+            kind, text, start = self._next()
+            if text == ']':
+                return result
+            if text != ',':
+                raise JSLiteralError("数组元素之间缺少逗号", self.source, start)
+
+    def _record_trivia(self, gap: str, value: Any):
+        """记录带 id 的对象前独占整行的注释和空行"""
+        if isinstance(value, dict) and 'id' in value:
+            lines = gap.split('\n')[1:-1]
+            if lines:
+                self.trivia[value['id']] = lines
+
+    def _unescape(self, body: str) -> str:
+        if '\\' not in body:
+            return body
+        return self.ESCAPE_PATTERN.sub(self._replace_escape, body)
+
+    @staticmethod
+    def _replace_escape(match) -> str:
+        escape = match.group(1)
+        if escape.startswith('u{'):
+            return chr(int(escape[2:-1], 16))
+        if escape[0] in 'ux' and len(escape) > 1:
+            return chr(int(escape[1:], 16))
+        if escape == '\n':
+            return ''  # 行尾续行
+        return JS_ESCAPES.get(escape, escape)
+
+
+def format_js_string(value: str) -> str:
+    """按 knowledge-data.js 的写法输出字符串：多行用模板字符串，其余用单引号"""
+    escaped = value.replace('\\', '\\\\')
+    if '\n' in value:
+        return '`' + escaped.replace('`', '\\`').replace('${', '\\${') + '`'
+    return "'" + escaped.replace("'", "\\'") + "'"
+
+
+def format_js_key(key: str) -> str:
+    """对象键：合法标识符直接输出，否则加引号"""
+    return key if IDENTIFIER_PATTERN.match(key) else format_js_string(key)
+
+
+def format_js_literal(value: Any, level: int = 0, trivia: Dict[str, List[str]] = None, indent: str = "    ") -> str:
+    """按 knowledge-data.js 的代码风格输出对象字面量（4空格缩进、标识符键、无尾逗号）
+
+    trivia 为 JSLiteralParser 记录的注释和空行，输出在对应对象之前
+    """
+    trivia = trivia or {}
+
+    def leading(item: Any) -> str:
+        if isinstance(item, dict) and item.get('id') in trivia:
+            return "".join(line + "\n" for line in trivia[item['id']])
+        return ""
+
+    inner = indent * (level + 1)
+    if isinstance(value, dict):
+        if not value:
+            return "{}"
+        items = [leading(item) + f"{inner}{format_js_key(key)}: {format_js_literal(item, level + 1, trivia, indent)}"
+                 for key, item in value.items()]
+        return "{\n" + ",\n".join(items) + "\n" + indent * level + "}"
+    if isinstance(value, list):
+        if not value:
+            return "[]"
+        items = [leading(item) + inner + format_js_literal(item, level + 1, trivia, indent) for item in value]
+        return "[\n" + ",\n".join(items) + "\n" + indent * level + "]"
+    if isinstance(value, str):
+        return format_js_string(value)
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return repr(value)
+
+
+def find_tree_literal(source: str) -> int:
+    """返回 getDefaultKnowledgeTree() 中 return 的对象字面量起始位置"""
+    function_start = source.find(TREE_FUNCTION)
+    if function_start < 0:
+        raise ValueError(f"未找到 {TREE_FUNCTION}")
+    match = re.compile(r'return\s*\{').search(source, function_start)
+    if not match:
+        raise ValueError("未找到知识点树的对象字面量")
+    return match.end() - 1
+
+
+def load_knowledge_tree(path: Path = KNOWLEDGE_DATA_PATH) -> Dict[str, Any]:
+    """读取知识点树：{学科键: 学科对象}"""
+    source = Path(path).read_text(encoding='utf-8')
+    tree, _ = JSLiteralParser(source).parse(find_tree_literal(source))
+    return tree
+
+
+def iter_units(tree: Dict[str, Any]) -> Iterator[Tuple[Dict, Dict, Dict]]:
+    """按顺序遍历所有知识点，产出 (学科, 章节, 知识点)"""
+    for subject in tree.values():
+        for chapter in subject.get('chapters', []):
+            for unit in chapter.get('units', []):
+                yield subject, chapter, unit
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+知识点自动标注 - 考研数学学习助手
+基于 js/knowledge-data.js 中各知识点的名称、概念、公式、学习要点建立BM25索引，
+用稀疏矩阵批量计算题目与知识点的相关度，为题目写入得分最高的知识点ID
+
+用法: python scripts/knowledge_tagger.py data/real-exam-2024.candidate.json [--write] [--top-k 3]
+"""
+
+import json
+import time
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from knowledge_data import KNOWLEDGE_DATA_PATH, iter_units, load_knowledge_tree
+from search_terms import question_text, tokenize
+
+DEFAULT_INDEX_PATH = "tmp/knowledge_index.npz"
+
+# 索引格式版本，修改分词或权重逻辑时递增
+INDEX_VERSION = 1
+
+# 知识点各字段的权重（以重复次数计入词频）
+FIELD_WEIGHTS = {'name': 3, 'concept': 1, 'formulas': 2, 'keyPoints': 2}
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def unit_terms(unit: Dict) -> List[str]:
+    """知识点的加权检索词"""
+    content = unit.get('content', {})
+    fields = {
+        'name': unit.get('name', ''),
+        'concept': content.get('concept', ''),
+        'formulas': ' '.join(content.get('formulas', [])),
+        'keyPoints': ' '.join(content.get('keyPoints', [])),
+    }
+    terms = []
+    for field, text in fields.items():
+        terms.extend(tokenize(text) * FIELD_WEIGHTS[field])
+    return terms
+
+
+class KnowledgeIndex:
+    """知识点BM25索引：词表 + (词 × 知识点) 的稀疏权重矩阵"""
+
+    def __init__(self, unit_ids: List[str], vocab: Dict[str, int], weights: sparse.csr_matrix):
+        self.unit_ids = unit_ids
+        self.vocab = vocab
+        self.weights = weights  # 形状 (词表大小, 知识点数)，已包含 idf 和长度归一化
+
+    @classmethod
+    def build(cls, source_path: Path = KNOWLEDGE_DATA_PATH) -> 'KnowledgeIndex':
+        """从 knowledge-data.js 建立索引"""
+        unit_ids = []
+        vocab = {}
+        rows, cols, counts = [], [], []
+
+        for _, _, unit in iter_units(load_knowledge_tree(source_path)):
+            doc = len(unit_ids)
+            unit_ids.append(unit['id'])
+            term_counts = {}
+            for term in unit_terms(unit):
+                term_counts[term] = term_counts.get(term, 0) + 1
+            for term, count in term_counts.items():
+                rows.append(vocab.setdefault(term, len(vocab)))
+                cols.append(doc)
+                counts.append(count)
+
+        tf = sparse.csr_matrix((np.array(counts, dtype=np.float32), (rows, cols)),
+                               shape=(len(vocab), len(unit_ids)))
+
+        # BM25: idf(t) * tf * (k1 + 1) / (tf + k1 * (1 - b + b * dl / avgdl))
+        doc_len = np.asarray(tf.sum(axis=0)).ravel()
+        doc_freq = np.diff(tf.indptr)
+        idf = np.log1p((len(unit_ids) - doc_freq + 0.5) / (doc_freq + 0.5)).astype(np.float32)
+
+        coo = tf.tocoo()
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_len[coo.col] / doc_len.mean())
+        data = idf[coo.row] * coo.data * (BM25_K1 + 1) / (coo.data + norm)
+        weights = sparse.csr_matrix((data.astype(np.float32), (coo.row, coo.col)), shape=tf.shape)
+
+        return cls(unit_ids, vocab, weights)
+
+    @classmethod
+    def load_or_build(cls, index_path: str = DEFAULT_INDEX_PATH,
+                      source_path: Path = KNOWLEDGE_DATA_PATH) -> 'KnowledgeIndex':
+        """读取缓存的索引；knowledge-data.js 变化后自动重建"""
+        source_hash = hashlib.sha256(Path(source_path).read_bytes()).hexdigest()
+        index_path = Path(index_path)
+
+        if index_path.exists():
+            try:
+                with np.load(index_path, allow_pickle=False) as cached:
+                    if (str(cached['source_hash']) == source_hash
+                            and int(cached['version']) == INDEX_VERSION):
+                        vocab = {term: i for i, term in enumerate(cached['vocab'].tolist())}
+                        weights = sparse.csr_matrix(
+                            (cached['data'], cached['indices'], cached['indptr']),
+                            shape=tuple(cached['shape']))
+                        return cls(cached['unit_ids'].tolist(), vocab, weights)
+            except (OSError, KeyError, ValueError) as e:
+                print(f"读取知识点索引缓存失败，重新建立: {e}")
+
+        index = cls.build(source_path)
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        vocab_terms = sorted(index.vocab, key=index.vocab.get)
+        np.savez(index_path, source_hash=np.array(source_hash), version=np.array(INDEX_VERSION),
+                 unit_ids=np.array(index.unit_ids), vocab=np.array(vocab_terms),
+                 data=index.weights.data, indices=index.weights.indices,
+                 indptr=index.weights.indptr, shape=np.array(index.weights.shape))
+        return index
+
+    def query_matrix(self, texts: List[str]) -> sparse.csr_matrix:
+        """将一批文本转换为 (文本数 × 词表大小) 的词频矩阵，词表外的词忽略"""
+        rows, cols = [], []
+        vocab = self.vocab
+        for row, text in enumerate(texts):
+            for term in tokenize(text):
+                col = vocab.get(term)
+                if col is not None:
+                    rows.append(row)
+                    cols.append(col)
+        data = np.ones(len(rows), dtype=np.float32)
+        # 重复的 (行, 列) 在转换为CSR时自动累加为词频
+        return sparse.csr_matrix((data, (rows, cols)), shape=(len(texts), len(vocab)))
+
+    def score(self, texts: List[str]) -> np.ndarray:
+        """批量计算相关度，返回 (文本数 × 知识点数) 的得分矩阵"""
+        if not texts:
+            return np.zeros((0, len(self.unit_ids)), dtype=np.float32)
+        # 查询词频取 log 压缩，避免题目中重复出现的词主导得分
+        queries = self.query_matrix(texts)
+        queries.data = np.log1p(queries.data)
+        return (queries @ self.weights).toarray()
+
+
+class KnowledgeTagger:
+    """题目知识点自动标注器"""
+
+    # 只保留得分不低于最高分该比例的知识点，避免弱相关的知识点凑数
+    RELATIVE_CUTOFF = 0.5
+
+    def __init__(self, index: KnowledgeIndex = None, top_k: int = 3, batch_size: int = 32):
+        self.index = index or KnowledgeIndex.load_or_build()
+        self.top_k = top_k
+        self.batch_size = batch_size
+
+    def tag_texts(self, texts: List[str]) -> List[List[Tuple[str, float]]]:
+        """为一批文本返回 [(知识点ID, 得分), ...]，按得分降序"""
+        scores = self.index.score(texts)
+        k = min(self.top_k, scores.shape[1])
+        if k == 0:
+            return [[] for _ in texts]
+
+        # argpartition 取每行前k个，再只对这k个排序
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        results = []
+        for ids, values in zip(top, top_scores):
+            cutoff = values[0] * self.RELATIVE_CUTOFF
+            results.append([(self.index.unit_ids[i], round(float(v), 3))
+                             for i, v in zip(ids, values) if v > 0 and v >= cutoff])
+        return results
+
+    def tag_stream(self, questions: Iterable) -> Iterator:
+        """按批标注题目候选（QuestionCandidate），保持流式产出
+
+        收到结束于后一页的题目时，先标注并产出之前各页的题目，
+        因此每批不跨页，下游不会因凑满一批而滞后多页；batch_size 是单页题目过多时的上限
+        """
+        batch = []
+        for question in questions:
+            if batch and (question.page_end or question.page_num) > (batch[-1].page_end or batch[-1].page_num):
+                yield from self._tag_batch(batch)
+                batch = []
+            batch.append(question)
+            if len(batch) >= self.batch_size:
+                yield from self._tag_batch(batch)
+                batch = []
+        if batch:
+            yield from self._tag_batch(batch)
+
+    def _tag_batch(self, batch: List) -> List:
+        texts = [question_text(q.content, q.options, q.explanation) for q in batch]
+        for question, tags in zip(batch, self.tag_texts(texts)):
+            question.knowledge_points = [unit_id for unit_id, _ in tags]
+            question.knowledge_scores = dict(tags)
+        return batch
+
+
+def main():
+    """主函数"""
+    arg_parser = argparse.ArgumentParser(description="题目知识点自动标注")
+    arg_parser.add_argument("json_files", nargs="+", help="真题或候选JSON文件")
+    arg_parser.add_argument("--top-k", type=int, default=3, help="每题最多标注的知识点数（默认3）")
+    arg_parser.add_argument("--write", action="store_true", help="将标注结果写回JSON文件")
+    args = arg_parser.parse_args()
+
+    start = time.perf_counter()
+    tagger = KnowledgeTagger(top_k=args.top_k)
+    print(f"知识点索引: {len(tagger.index.unit_ids)} 个知识点, {len(tagger.index.vocab)} 个检索词 "
+          f"({(time.perf_counter() - start) * 1000:.0f} ms)")
+
+    for json_file in args.json_files:
+        with open(json_file, 'r', encoding='utf-8') as f:
+            questions = json.load(f)
+
+        start = time.perf_counter()
+        texts = [question_text(q.get('content'), q.get('options'), q.get('explanation')) for q in questions]
+        tags = tagger.tag_texts(texts)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        # 与已有人工标注对比：首选知识点命中人工标注的比例
+        labelled = [(q, t) for q, t in zip(questions, tags) if q.get('knowledgePoints') and t]
+        hits = sum(1 for q, t in labelled if t[0][0] in q['knowledgePoints'])
+        agreement = f", 与已有标注一致 {hits}/{len(labelled)}" if labelled else ""
+        print(f"{json_file}: {len(questions)} 题, {elapsed:.1f} ms{agreement}")
+
+        if args.write:
+            for question, question_tags in zip(questions, tags):
+                question['knowledgePoints'] = [unit_id for unit_id, _ in question_tags]
+                question['knowledgePointScores'] = dict(question_tags)
+            with open(json_file, 'w', encoding='utf-8') as f:
+                json.dump(questions, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,24 +2,34 @@
 # -*- coding: utf-8 -*-
 """
 规范化仓库中文本文件的编码为 UTF-8（无 BOM）
-自动备份原文件，支持回滚
+转换前的原文件存入内容寻址备份（encoding-backup/），可用 scripts/encoding_backup.py 整批回滚
+
+转换时只读一遍原文件：分块读取的同时写入备份、用各候选编码增量解码、UTF-8 输出写入同目录临时文件，
+落盘（fsync）后原子替换原文件，内存占用与文件大小无关，中途失败不会留下写了一半的文件
 """
 
 import os
 import sys
-import shutil
-import time
+import codecs
+import hashlib
+import tempfile
+import argparse
 from pathlib import Path
-import chardet
+from detect_encodings import detect_file_encoding
+from encoding_backup import BackupStore, BlobWriter
+from encoding_scanner import ScanCache, iter_files, scan_files
 
 # 需要转换的编码类型
 CONVERTIBLE_ENCODINGS = {
     'Windows-1254',  # 通常是GBK的误识别
     'GBK', 'GB2312', 'GB18030',
     'ISO-8859-1', 'latin1',
-    'ascii'  # 虽然ascii是UTF-8的子集，但为了统一也转换
+    # ascii 是 UTF-8 的子集，转换结果与原文件相同，不在此列
 }
 
+# 分块读取的大小
+CHUNK_SIZE = 64 * 1024
+
 # 排除的文件类型（不进行编码转换）
 EXCLUDE_EXTENSIONS = {
     '.png', '.jpg', '.jpeg', '.gif', '.ico',
@@ -30,38 +40,145 @@ EXCLUDE_EXTENSIONS = {
 # 排除的目录
 EXCLUDE_DIRS = {
     '.git', 'node_modules', '__pycache__', '.cursor',
-    'encoding-backup', '.vscode'  # 排除我们刚创建的目录
+    'encoding-backup', '.vscode',  # 排除我们刚创建的目录
+    'tmp'
 }
 
-def detect_file_encoding(filepath):
-    """检测文件编码"""
-    try:
-        with open(filepath, 'rb') as f:
-            raw_data = f.read()
-
-        result = chardet.detect(raw_data)
-        return result
-    except Exception as e:
-        return {'encoding': None, 'confidence': 0.0, 'error': str(e)}
-
 def should_convert_file(filepath):
-    """判断是否应该转换此文件"""
-    # 检查扩展名
-    if filepath.suffix.lower() in EXCLUDE_EXTENSIONS:
-        return False
-
-    # 检查是否在排除目录中
-    for part in filepath.parts:
-        if part in EXCLUDE_DIRS:
-            return False
-
-    return True
+    """判断是否应该转换此文件（排除目录在遍历时已跳过）"""
+    return filepath.suffix.lower() not in EXCLUDE_EXTENSIONS
+
+def candidate_encodings(encoding_info):
+    """按优先级列出解码时尝试的编码"""
+    # 优先尝试UTF-8（因为很多文件实际上已经是UTF-8但被误检测）；
+    # 检测时严格UTF-8解码已失败（交给chardet）的文件不再尝试
+    encodings_to_try = [] if encoding_info.get('method') == 'chardet' else ['utf-8', 'utf-8-sig']
+
+    # 如果检测到Windows-1254，很可能是GBK编码的中文文件
+    if encoding_info['encoding'] == 'Windows-1254':
+        encodings_to_try.extend(['gbk', 'gb2312', 'gb18030', 'Windows-1254'])
+    else:
+        encodings_to_try.append(encoding_info['encoding'])
+    return encodings_to_try
+
+def _fsync_directory(directory):
+    """落盘目录项，保证重命名在断电后仍然有效（Windows 不支持，跳过）"""
+    if os.name == 'nt':
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+class CandidateDecoder:
+    """在同一次读取中用多个候选编码同时增量解码，只为优先级最高、仍能解码的编码输出 UTF-8
+
+    当前输出的编码解码失败时改用下一个仍可用的编码，已读过的部分从 reread(字节数)
+    重新取得（通常只是文件开头的一小段），原文件只需读一遍
+    """
+
+    def __init__(self, encodings, out, reread):
+        self.alive = list(dict.fromkeys(encodings))
+        self.decoders = {encoding: codecs.getincrementaldecoder(encoding)(errors='strict')
+                         for encoding in self.alive}
+        self.out = out
+        self.reread = reread
+        self.hasher = hashlib.sha256()
+        self.consumed = 0
+
+    @property
+    def encoding(self):
+        """当前输出使用的编码；全部失败时为 None"""
+        return self.alive[0] if self.alive else None
+
+    def feed(self, chunk, final=False):
+        """解码一块原文件内容；全部编码都失败时抛出 UnicodeDecodeError"""
+        writing = self.encoding
+        error = None
+        for encoding in list(self.alive):
+            try:
+                text = self.decoders[encoding].decode(chunk, final)
+            except UnicodeDecodeError as e:
+                self.alive.remove(encoding)
+                error = e
+                continue
+            if encoding == writing:
+                self._write(text)
+        self.consumed += len(chunk)
+
+        if not self.alive:
+            raise error
+        if self.encoding != writing:
+            self._restart(final)
+
+    def _write(self, text):
+        data = text.encode('utf-8')
+        self.hasher.update(data)
+        self.out.write(data)
+
+    def _restart(self, final):
+        """改用下一个编码：清空已输出内容，用新的解码器重新解码已读部分"""
+        self.out.seek(0)
+        self.out.truncate()
+        self.hasher = hashlib.sha256()
+        decoder = codecs.getincrementaldecoder(self.encoding)(errors='strict')
+        self._write(decoder.decode(self.reread(self.consumed), final))
+        self.decoders[self.encoding] = decoder
+
+def transcode_file(filepath, encodings, backup_run):
+    """单次读取完成备份和转换：分块写入备份、按候选编码增量解码为UTF-8写入临时文件，成功后原子替换原文件
+
+    encodings 为按优先级排列的候选编码，取第一个能完整解码的编码（见 CandidateDecoder）；
+    全部编码都解码失败时抛出 UnicodeDecodeError，原文件不变。
+    返回 (编码, 备份内容的 sha256)；转换结果与原文件逐字节相同（如纯 ASCII 文件）时不备份、不替换，sha256 为 None
+    """
+    blob = BlobWriter(backup_run.store)
+    fd, tmp_name = tempfile.mkstemp(dir=filepath.parent, prefix=f".{filepath.name}.", suffix=".tmp")
+
+    def reread(size):
+        # 已读部分就在正在写入的备份临时文件中
+        blob.file.flush()
+        with open(blob.tmp_name, 'rb') as written:
+            return written.read(size)
 
-def convert_file_to_utf8(filepath, backup_dir):
-    """转换单个文件为UTF-8并备份"""
+    try:
+        with os.fdopen(fd, 'w+b') as out, open(filepath, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            decoder = CandidateDecoder(encodings, out, reread)
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                blob.write(chunk)
+                decoder.feed(chunk)
+            decoder.feed(b'', final=True)
+            unchanged = decoder.hasher.digest() == blob.hasher.digest()
+            if not unchanged:
+                out.flush()
+                os.fsync(out.fileno())
+
+        if unchanged:
+            blob.abort()
+            os.unlink(tmp_name)
+            return decoder.encoding, None
+
+        # 备份落盘并登记后才替换原文件
+        digest = blob.finish()
+        backup_run.record(filepath, digest, stat)
+        os.chmod(tmp_name, stat.st_mode & 0o777)
+        os.replace(tmp_name, filepath)
+        _fsync_directory(filepath.parent)
+        return decoder.encoding, digest
+    except BaseException:
+        blob.abort()
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+def convert_file_to_utf8(filepath, backup_run, encoding_info=None):
+    """转换单个文件为UTF-8并备份，encoding_info 为扫描时的检测结果（未提供时重新检测）"""
     try:
         # 检测编码
-        encoding_info = detect_file_encoding(filepath)
+        if encoding_info is None:
+            encoding_info = detect_file_encoding(filepath)
 
         # 如果已经是UTF-8（无BOM），跳过
         if (encoding_info['encoding'] and
@@ -73,114 +190,52 @@ def convert_file_to_utf8(filepath, backup_dir):
         if not encoding_info['encoding'] or encoding_info['encoding'] not in CONVERTIBLE_ENCODINGS:
             return {'status': 'skipped', 'reason': 'not_convertible'}
 
-        # 读取原文件
-        with open(filepath, 'rb') as f:
-            raw_data = f.read()
-
-        # 尝试用检测到的编码解码
-        text_content = None
-
-        # 优先尝试UTF-8（因为很多文件实际上已经是UTF-8但被误检测）
-        encodings_to_try = ['utf-8', 'utf-8-sig']
-
-        # 如果检测到Windows-1254，很可能是GBK编码的中文文件
-        if encoding_info['encoding'] == 'Windows-1254':
-            encodings_to_try.extend(['gbk', 'gb2312', 'gb18030', 'Windows-1254'])
-        else:
-            encodings_to_try.append(encoding_info['encoding'])
-
-        # 尝试各种编码
-        for encoding in encodings_to_try:
-            try:
-                text_content = raw_data.decode(encoding)
-                print(f"  成功解码使用编码: {encoding}")
-                break
-            except UnicodeDecodeError:
-                continue
-
-        if text_content is None:
-            return {'status': 'failed', 'reason': 'decode_error'}
-
-        # 创建备份
+        # 一次读取中同时尝试各候选编码，第一个能完整解码的编码完成备份和转换
         relative_path = filepath.relative_to(Path(__file__).parent.parent)
-        backup_path = backup_dir / relative_path
-        backup_path.parent.mkdir(parents=True, exist_ok=True)
-
-        shutil.copy2(filepath, backup_path)
-        print(f"  备份: {relative_path}")
-
-        # 写入UTF-8文件（无BOM）
-        with open(filepath, 'w', encoding='utf-8', newline='') as f:
-            f.write(text_content)
-
+        try:
+            encoding, digest = transcode_file(filepath, candidate_encodings(encoding_info), backup_run)
+        except UnicodeDecodeError:
+            return {'status': 'failed', 'reason': 'decode_error'}
+        if digest is None:
+            return {'status': 'skipped', 'reason': 'unchanged'}
+        print(f"  成功解码使用编码: {encoding}")
+        print(f"  备份: {relative_path} ({digest[:12]})")
         print(f"  转换: {relative_path} ({encoding_info['encoding']} -> UTF-8)")
         return {'status': 'converted', 'from_encoding': encoding_info['encoding']}
 
     except Exception as e:
         return {'status': 'failed', 'reason': str(e)}
 
-def create_backup_directory():
-    """创建带时间戳的备份目录"""
-    timestamp = time.strftime("%Y%m%d_%H%M%S")
-    backup_dir = Path(f"encoding-backup/backup_{timestamp}")
-    backup_dir.mkdir(parents=True, exist_ok=True)
-    return backup_dir
-
 def main():
     """主函数"""
+    arg_parser = argparse.ArgumentParser(description="规范化仓库中文本文件的编码为 UTF-8（无 BOM）")
+    arg_parser.add_argument("-j", "--workers", type=int, default=0, help="并行进程数（0表示使用全部CPU核心，默认0）")
+    arg_parser.add_argument("--no-cache", action="store_true", help="不使用扫描缓存，重新检测全部文件")
+    args = arg_parser.parse_args()
+
     repo_root = Path(__file__).parent.parent
 
     print("规范化仓库中文本文件编码为 UTF-8...")
     print(f"仓库根目录: {repo_root}")
     print("-" * 60)
 
-    # 创建备份目录
-    backup_dir = create_backup_directory()
-    print(f"备份目录: {backup_dir}")
+    # 本次运行的备份清单
+    backup_store = BackupStore(repo_root)
+    backup_run = backup_store.begin_run()
 
-    # 从检测报告中读取需要转换的文件列表
+    # 扫描需要转换的文件：与 detect_encodings.py 共用扫描缓存，只检测有变化的文件
     files_to_convert = []
-
-    # 首先尝试从报告文件中读取
-    report_file = repo_root / 'encoding_report.txt'
-    if report_file.exists():
-        print("从检测报告中读取文件列表...")
-        try:
-            with open(report_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # 解析报告文件中的文件路径
-            lines = content.split('\n')
-            in_detail_section = False
-            for line in lines:
-                line = line.strip()
-                if '详细列表:' in line:
-                    in_detail_section = True
-                    continue
-                elif in_detail_section and line.startswith('  ') and '(' in line and line.endswith(')'):
-                    # 提取文件路径
-                    filepath_str = line.split(' (')[0].strip()
-                    filepath = Path(filepath_str)
-                    if filepath.exists():
-                        files_to_convert.append(filepath)
-        except Exception as e:
-            print(f"读取报告文件失败: {e}")
-
-    # 如果报告文件没有找到足够的文件，手动扫描
-    if len(files_to_convert) < 5:  # 如果找到的文件太少，重新扫描
-        print("重新扫描仓库中的所有文本文件...")
-        files_to_convert = []
-        for filepath in repo_root.rglob('*'):
-            if not filepath.is_file():
-                continue
-            if should_convert_file(filepath):
-                # 检查是否需要转换
-                encoding_info = detect_file_encoding(filepath)
-                if (encoding_info['encoding'] and
-                    encoding_info['encoding'] not in ['UTF-8', 'UTF-8-SIG'] and
-                    encoding_info['confidence'] > 0.3 and
-                    encoding_info['encoding'] in CONVERTIBLE_ENCODINGS):
-                    files_to_convert.append(filepath)
+    cache = None if args.no_cache else ScanCache(repo_root)
+    files = iter_files(repo_root, EXCLUDE_DIRS, should_convert_file)
+    for filepath, encoding_info in scan_files(files, detect_file_encoding, workers=args.workers, cache=cache):
+        if (encoding_info['encoding'] and
+            encoding_info['encoding'] not in ['UTF-8', 'UTF-8-SIG'] and
+            encoding_info['confidence'] > 0.3 and
+            encoding_info['encoding'] in CONVERTIBLE_ENCODINGS):
+            files_to_convert.append((filepath, encoding_info))
+    if cache:
+        cache.save()
+        print(cache.format_stats())
 
     if not files_to_convert:
         print("没有找到需要转换的文件")
@@ -195,19 +250,22 @@ def main():
     failed_count = 0
     encoding_stats = {}
 
-    # 转换文件
-    for filepath in files_to_convert:
-        result = convert_file_to_utf8(filepath, backup_dir)
-
-        if result['status'] == 'converted':
-            converted_count += 1
-            from_encoding = result['from_encoding']
-            encoding_stats[from_encoding] = encoding_stats.get(from_encoding, 0) + 1
-        elif result['status'] == 'skipped':
-            skipped_count += 1
-        else:
-            failed_count += 1
-            print(f"  失败: {filepath} - {result['reason']}")
+    # 转换文件；中途出错也写入已备份文件的清单
+    try:
+        for filepath, encoding_info in files_to_convert:
+            result = convert_file_to_utf8(filepath, backup_run, encoding_info)
+
+            if result['status'] == 'converted':
+                converted_count += 1
+                from_encoding = result['from_encoding']
+                encoding_stats[from_encoding] = encoding_stats.get(from_encoding, 0) + 1
+            elif result['status'] == 'skipped':
+                skipped_count += 1
+            else:
+                failed_count += 1
+                print(f"  失败: {filepath} - {result['reason']}")
+    finally:
+        backup_run.commit()
 
     # 输出统计信息
     print(f"\n{'='*60}")
@@ -222,28 +280,9 @@ def main():
         for encoding, count in sorted(encoding_stats.items()):
             print(f"  {encoding} -> UTF-8: {count} 个文件")
 
-    # 创建恢复脚本
-    restore_script = backup_dir / "restore.bat"
-    with open(restore_script, 'w', encoding='utf-8') as f:
-        f.write("@echo off\n")
-        f.write("echo 正在恢复文件...\n")
-        f.write("setlocal enabledelayedexpansion\n")
-        f.write("set \"SOURCE_DIR=%~dp0\"\n")
-        f.write("set \"TARGET_DIR=..\\..\\..\"\n")
-        f.write("for /r \"%SOURCE_DIR%\" %%f in (*) do (\n")
-        f.write("    set \"rel_path=%%f\"\n")
-        f.write("    set \"rel_path=!rel_path:%SOURCE_DIR%=!\"\n")
-        f.write("    if not \"!rel_path!\"==\"restore.bat\" (\n")
-        f.write("        copy \"%%f\" \"%TARGET_DIR%!rel_path!\" >nul 2>&1\n")
-        f.write("        echo 恢复: !rel_path!\n")
-        f.write("    )\n")
-        f.write(")\n")
-        f.write("echo 恢复完成!\n")
-        f.write("pause\n")
-
-    print(f"\n备份位置: {backup_dir}")
-    print(f"恢复脚本: {backup_dir}/restore.bat")
-    print("\n如需恢复原文件，请运行恢复脚本。")
+    if backup_run.files:
+        print(f"\n备份: {backup_store.root} (运行ID {backup_run.run_id}, {len(backup_run.files)} 个文件)")
+        print(f"如需恢复原文件，请运行: python scripts/encoding_backup.py restore {backup_run.run_id}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+页面文本打包存储 - 考研数学学习助手
+一个源PDF的全部页面文本顺序写入单个数据文件（.pages），另附偏移索引（.pages.idx），
+读取时通过 mmap 按页随机访问，不需要逐页打开文件；导入工具重新导入未变化的PDF（或合集中的某一年份）时直接从中读取
+
+索引格式: 头部 PGIX + 版本 + 页数，之后每页一条 (页码 u32, 偏移 u64, 字节长度 u32)，小端序
+
+用法: python scripts/page_store.py tmp/exam_pages/<键>.pages [页码 ...] [--grep 关键词]
+"""
+
+import os
+import re
+import mmap
+import struct
+import argparse
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+MAGIC = b"PGIX"
+STORE_VERSION = 1
+
+HEADER = struct.Struct("<4sII")
+ENTRY = struct.Struct("<IQI")
+
+
+def index_path(store_path: Path) -> Path:
+    return store_path.with_name(store_path.name + ".idx")
+
+
+class PageStoreWriter:
+    """顺序追加页面文本，关闭时写出索引并原子替换正式文件"""
+
+    def __init__(self, store_path: Path):
+        self.store_path = Path(store_path)
+        self.entries: List[Tuple[int, int, int]] = []
+        self.offset = 0
+        self._tmp_path = self.store_path.with_name(self.store_path.name + ".tmp")
+        self.store_path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self._tmp_path, 'wb')
+
+    @property
+    def count(self) -> int:
+        return len(self.entries)
+
+    def add(self, page_num: int, text: str):
+        data = text.encode('utf-8')
+        self._file.write(data)
+        self.entries.append((page_num, self.offset, len(data)))
+        self.offset += len(data)
+
+    def close(self, commit: bool = True):
+        """关闭文件；commit 为 False 时丢弃已写入的内容，保留旧文件"""
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+
+        if not commit:
+            self._tmp_path.unlink()
+            return
+
+        idx_tmp_path = self._tmp_path.with_name(self._tmp_path.name + ".idx")
+        with open(idx_tmp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, STORE_VERSION, len(self.entries)))
+            f.write(b"".join(ENTRY.pack(*entry) for entry in self.entries))
+
+        # 先替换数据文件再替换索引：索引只会指向已完整写入的数据
+        os.replace(self._tmp_path, self.store_path)
+        os.replace(idx_tmp_path, index_path(self.store_path))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(commit=exc_type is None)
+
+
+class PageStore:
+    """只读页面文本存储，通过 mmap 按页码随机访问"""
+
+    def __init__(self, store_path: Path):
+        self.store_path = Path(store_path)
+
+        with open(index_path(self.store_path), 'rb') as f:
+            raw = f.read()
+        magic, version, count = HEADER.unpack_from(raw)
+        if magic != MAGIC or version != STORE_VERSION:
+            raise ValueError(f"无效的页面索引: {index_path(self.store_path)}")
+
+        self.entries: Dict[int, Tuple[int, int]] = {
+            page_num: (offset, length)
+            for page_num, offset, length in ENTRY.iter_unpack(raw[HEADER.size:HEADER.size + count * ENTRY.size])
+        }
+
+        self._file = open(self.store_path, 'rb')
+        # 空文件无法 mmap
+        if os.fstat(self._file.fileno()).st_size:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._data = b""
+
+    def page_numbers(self) -> List[int]:
+        return list(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, page_num: int) -> bool:
+        return page_num in self.entries
+
+    def __getitem__(self, page_num: int) -> str:
+        offset, length = self.entries[page_num]
+        return self._data[offset:offset + length].decode('utf-8')
+
+    def __iter__(self) -> Iterator[Tuple[int, str]]:
+        """按写入顺序产出 (页码, 文本)，可直接交给 QuestionParser.iter_questions"""
+        for page_num in self.entries:
+            yield page_num, self[page_num]
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def main():
+    """主函数"""
+    arg_parser = argparse.ArgumentParser(description="查看打包的页面文本")
+    arg_parser.add_argument("store", help="页面存储文件，如 tmp/exam_pages/<键>.pages（导入时输出路径）")
+    arg_parser.add_argument("pages", nargs="*", type=int, help="要输出文本的页码，省略时列出所有页")
+    arg_parser.add_argument("--grep", help="列出包含该正则表达式的页及匹配行")
+    args = arg_parser.parse_args()
+
+    with PageStore(args.store) as store:
+        if args.grep:
+            pattern = re.compile(args.grep)
+            for page_num, text in store:
+                for line in text.splitlines():
+                    if pattern.search(line):
+                        print(f"{page_num:4d}: {line.strip()}")
+        elif args.pages:
+            for page_num in args.pages:
+                if page_num not in store:
+                    print(f"=== 第 {page_num} 页不存在 ===")
+                    continue
+                print(f"=== 第 {page_num} 页 ===")
+                print(store[page_num])
+        else:
+            print(f"{args.store}: {len(store)} 页")
+            for page_num, (offset, length) in store.entries.items():
+                print(f"  第 {page_num:4d} 页  偏移 {offset:>10d}  {length:>8d} 字节")
+
+
+if __name__ == "__main__":
+    main()
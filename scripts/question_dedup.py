@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+题目近似重复检测 - 考研数学学习助手
+对规范化后的题干计算 MinHash 签名（字符n元组 + LaTeX命令），用LSH分桶找出候选对，
+只对同桶题目估计相似度，近似线性时间内发现同一年份及跨年份的近似重复题目
+
+签名索引保存在 tmp/dedup_index.npz，新导入的年份只需与已有签名比较；
+索引键为 "来源:题目ID"（来源为 final 或 candidate，与题目数据库相同），
+正式数据和导入候选的同ID题目互不覆盖
+
+用法: python scripts/question_dedup.py [data/real-exam-2024.json ...] [--threshold 0.6]
+"""
+
+import re
+import json
+import zlib
+import argparse
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from validate_real_exam import is_candidate_path
+
+DEFAULT_INDEX_PATH = "tmp/dedup_index.npz"
+
+# 索引格式版本，修改规范化、签名参数或索引键格式时递增
+INDEX_VERSION = 2
+
+NUM_PERM = 128
+LSH_BANDS = 32  # 32个带 × 每带4行，约在 Jaccard≈0.42 处开始成为候选对
+SHINGLE_SIZE = 3
+MIN_SHINGLES = 5  # 过短的题干（如公式提取失败）不参与比较，避免误报
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = 0xFFFFFFFF
+
+LATEX_COMMAND_PATTERN = re.compile(r'\\[A-Za-z]+')
+NOISE_PATTERN = re.compile(r'[\s$,.;:!?()\[\]{}_，。、；：！？（）【】“”‘’《》…]+')
+
+
+def index_key(source: str, question_id: str) -> str:
+    """索引键：来源:题目ID，如 final:2024-c-1"""
+    return f"{source}:{question_id}"
+
+
+def split_key(key: str) -> Tuple[str, str]:
+    """索引键拆分为 (来源, 题目ID)"""
+    source, _, question_id = key.partition(':')
+    return source, question_id
+
+
+def normalize(text: str) -> Tuple[str, List[str]]:
+    """规范化题干：返回 (去除标点空白后的文本, LaTeX命令列表)"""
+    text = unicodedata.normalize('NFKC', text or "").lower()
+    commands = LATEX_COMMAND_PATTERN.findall(text)
+    # LaTeX命令替换为单个占位符，使n元组反映公式结构而不被命令名的字母淹没
+    text = LATEX_COMMAND_PATTERN.sub('\\\\', text)
+    return NOISE_PATTERN.sub('', text), commands
+
+
+def shingle_hashes(text: str) -> np.ndarray:
+    """题干的特征集合（字符n元组 + LaTeX命令）的32位哈希"""
+    normalized, commands = normalize(text)
+    shingles = {normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+    shingles.update(commands)
+    return np.array(sorted(zlib.crc32(s.encode('utf-8')) for s in shingles), dtype=np.uint64)
+
+
+class MinHasher:
+    """MinHash签名：NUM_PERM 个 (a·x + b) mod p 形式的随机哈希函数"""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        self.a = rng.randint(1, MAX_HASH, size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, MAX_HASH, size=num_perm, dtype=np.uint64)
+
+    def signature(self, hashes: np.ndarray) -> np.ndarray:
+        """对一组特征哈希计算签名，各哈希函数取最小值"""
+        permuted = (np.outer(self.a, hashes) + self.b[:, None]) % MERSENNE_PRIME & MAX_HASH
+        return permuted.min(axis=1).astype(np.uint32)
+
+
+class DuplicateIndex:
+    """MinHash + LSH 近似重复索引"""
+
+    def __init__(self, threshold: float = 0.6, bands: int = LSH_BANDS):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = NUM_PERM // bands
+        self.hasher = MinHasher()
+        self.ids: List[str] = []
+        self.signatures: List[np.ndarray] = []
+        self.positions: Dict[str, int] = {}
+        self.buckets: Dict[Tuple[int, bytes], Set[int]] = {}
+        # 题目ID -> 所在的分桶键，删除时只需访问这些桶
+        self.bucket_keys: Dict[str, List[Tuple[int, bytes]]] = {}
+
+    @classmethod
+    def load(cls, index_path: str = DEFAULT_INDEX_PATH, threshold: float = 0.6) -> 'DuplicateIndex':
+        """读取保存的签名并重建LSH分桶；文件不存在或版本不符时返回空索引"""
+        index = cls(threshold=threshold)
+        index_path = Path(index_path)
+        if not index_path.exists():
+            return index
+
+        try:
+            with np.load(index_path, allow_pickle=False) as saved:
+                if int(saved['version']) != INDEX_VERSION:
+                    return index
+                for question_id, signature in zip(saved['ids'].tolist(), saved['signatures']):
+                    index._insert(question_id, signature)
+        except (OSError, KeyError, ValueError) as e:
+            print(f"读取重复检测索引失败，重新建立: {e}")
+            return cls(threshold=threshold)
+        return index
+
+    def save(self, index_path: str = DEFAULT_INDEX_PATH):
+        index_path = Path(index_path)
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        signatures = np.stack(self.signatures) if self.signatures else np.zeros((0, NUM_PERM), dtype=np.uint32)
+        np.savez(index_path, version=np.array(INDEX_VERSION), ids=np.array(self.ids, dtype=str),
+                 signatures=signatures)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """题干签名；特征过少时返回None"""
+        hashes = shingle_hashes(text)
+        if len(hashes) < MIN_SHINGLES:
+            return None
+        return self.hasher.signature(hashes)
+
+    def _band_keys(self, signature: np.ndarray) -> Iterator[Tuple[int, bytes]]:
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def _insert(self, question_id: str, signature: np.ndarray):
+        position = len(self.ids)
+        self.ids.append(question_id)
+        self.signatures.append(signature)
+        self.positions[question_id] = position
+        keys = self.bucket_keys[question_id] = list(self._band_keys(signature))
+        for key in keys:
+            self.buckets.setdefault(key, set()).add(position)
+
+    def _delete(self, question_id: str):
+        """从分桶中删除一道题，并把最后一道题移到空出的位置，不影响其他题目"""
+        position = self.positions.pop(question_id)
+        for key in self.bucket_keys.pop(question_id):
+            bucket = self.buckets[key]
+            bucket.discard(position)
+            if not bucket:
+                del self.buckets[key]
+
+        last = len(self.ids) - 1
+        if position != last:
+            moved_id = self.ids[last]
+            self.ids[position] = moved_id
+            self.signatures[position] = self.signatures[last]
+            self.positions[moved_id] = position
+            for key in self.bucket_keys[moved_id]:
+                bucket = self.buckets[key]
+                bucket.discard(last)
+                bucket.add(position)
+        self.ids.pop()
+        self.signatures.pop()
+
+    def query(self, signature: np.ndarray) -> List[Tuple[str, float]]:
+        """查找相似度不低于阈值的已索引题目，返回 [(题目ID, 估计相似度), ...]，按相似度降序"""
+        candidates = set()
+        for key in self._band_keys(signature):
+            candidates.update(self.buckets.get(key, ()))
+        if not candidates:
+            return []
+
+        # 只对同桶候选估计 Jaccard 相似度（签名中相等位置的比例）
+        positions = sorted(candidates)
+        similarity = (np.stack([self.signatures[p] for p in positions]) == signature).mean(axis=1)
+        matches = [(self.ids[p], round(float(s), 3))
+                   for p, s in zip(positions, similarity) if s >= self.threshold]
+        return sorted(matches, key=lambda m: -m[1])
+
+    def add(self, question_id: str, text: str, source: str = 'final') -> List[Tuple[str, float]]:
+        """先查询再加入索引，返回与此前已索引题目的近似重复 [(索引键, 相似度), ...]"""
+        signature = self.signature(text)
+        key = index_key(source, question_id)
+        if key in self.positions:
+            self._delete(key)
+        if signature is None:
+            return []
+        matches = self.query(signature)
+        self._insert(key, signature)
+        return matches
+
+    def remove(self, predicate):
+        """删除满足条件的题目，只更新这些题目所在的分桶"""
+        for question_id in [i for i in self.ids if predicate(i)]:
+            self._delete(question_id)
+
+    def remove_year(self, year: int, source: Optional[str] = None):
+        """删除某年份某来源（省略时为全部来源）的题目（重新导入该年份前、或该年份的源PDF删除后调用）"""
+        sources = [source] if source else ['final', 'candidate']
+        prefixes = tuple(index_key(s, f"{year}-") for s in sources)
+        self.remove(lambda key: key.startswith(prefixes))
+
+    def year_entries(self, year: int, source: str) -> List[Tuple[str, np.ndarray]]:
+        """某年份某来源的 [(索引键, 签名)]，供导入失败时恢复"""
+        prefix = index_key(source, f"{year}-")
+        return [(key, signature) for key, signature in zip(self.ids, self.signatures) if key.startswith(prefix)]
+
+    def restore_year(self, year: int, source: str, entries: List[Tuple[str, np.ndarray]]):
+        """丢弃某年份某来源的当前条目，恢复为 year_entries 保存的内容"""
+        self.remove_year(year, source)
+        for key, signature in entries:
+            self._insert(key, signature)
+
+    def annotate_stream(self, questions: Iterable, year: int) -> Iterator:
+        """为流经的题目候选（QuestionCandidate）写入 duplicates 并加入索引；只替换该年份的候选，正式数据保留"""
+        self.remove_year(year, 'candidate')
+        for question in questions:
+            duplicates = []
+            for key, similarity in self.add(question.id, question.content, 'candidate'):
+                source, question_id = split_key(key)
+                duplicates.append({"id": question_id, "source": source, "similarity": similarity})
+            question.duplicates = duplicates
+            yield question
+
+    def pairs(self) -> List[Tuple[str, str, float]]:
+        """索引内全部近似重复对（每对只列一次）"""
+        result = []
+        for position, signature in enumerate(self.signatures):
+            for other, similarity in self.query(signature):
+                if self.positions[other] > position:
+                    result.append((self.ids[position], other, similarity))
+        return sorted(result, key=lambda p: -p[2])
+
+
+def main():
+    """主函数"""
+    arg_parser = argparse.ArgumentParser(description="题目近似重复检测")
+    arg_parser.add_argument("json_files", nargs="*",
+                            help="加入索引的真题或候选JSON文件（默认 data/real-exam-*.json），文件名含 .candidate. 的按候选数据索引")
+    arg_parser.add_argument("--index", default=DEFAULT_INDEX_PATH, help="索引文件路径")
+    arg_parser.add_argument("--threshold", type=float, default=0.6, help="相似度阈值（默认0.6）")
+    arg_parser.add_argument("--rebuild", action="store_true", help="忽略已保存的索引重新建立")
+    args = arg_parser.parse_args()
+
+    if args.rebuild:
+        index = DuplicateIndex(threshold=args.threshold)
+    else:
+        index = DuplicateIndex.load(args.index, threshold=args.threshold)
+
+    json_files = args.json_files or sorted(str(p) for p in Path("data").glob("real-exam-[0-9][0-9][0-9][0-9].json"))
+    for json_file in json_files:
+        with open(json_file, 'r', encoding='utf-8') as f:
+            questions = json.load(f)
+        source = 'candidate' if is_candidate_path(Path(json_file)) else 'final'
+        for question in questions:
+            index.add(question['id'], question.get('content', ''), source)
+        print(f"已索引 {json_file}: {len(questions)} 题")
+
+    index.save(args.index)
+
+    pairs = index.pairs()
+    print(f"索引共 {len(index.ids)} 题，发现 {len(pairs)} 对近似重复")
+    for first, second, similarity in pairs:
+        print(f"  {first}  ~  {second}  ({similarity:.2f})")
+
+
+if __name__ == "__main__":
+    main()
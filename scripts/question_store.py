@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+题目数据库 - 考研数学学习助手
+将历年真题（已确认的 real-exam-YYYY.json 和导入生成的候选数据）写入SQLite，
+年份、题型、知识点、置信度建立索引，题干和解析建立FTS5全文索引
+
+FTS5 自带的分词器不切分连续的中文，这里写入前先切成字二元组（与知识点标注相同的分词），
+查询时同样切分后按短语匹配，因此任意长度不少于2字的中文片段都能检索
+
+用法:
+  python scripts/question_store.py --load                # 载入 data/ 下的全部JSON和NDJSON
+  python scripts/question_store.py 条件收敛 [--year 2023] [--type choice] [--kp calc-9-2]
+"""
+
+import sys
+import json
+import time
+import sqlite3
+import argparse
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from search_terms import tokenize
+from validate_real_exam import YEAR_FILE_PATTERN, parse_questions
+
+DEFAULT_STORE_PATH = "tmp/questions.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+    id TEXT NOT NULL,
+    source TEXT NOT NULL,          -- 'final' 已确认数据 / 'candidate' 导入候选
+    year INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    confidence REAL,
+    page_num INTEGER,
+    content TEXT NOT NULL,
+    explanation TEXT NOT NULL,
+    data TEXT NOT NULL,            -- 完整的题目JSON
+    UNIQUE (source, id)
+);
+CREATE INDEX IF NOT EXISTS idx_questions_year_type ON questions(year, type);
+CREATE INDEX IF NOT EXISTS idx_questions_type ON questions(type);
+CREATE INDEX IF NOT EXISTS idx_questions_confidence ON questions(confidence);
+
+CREATE TABLE IF NOT EXISTS question_knowledge (
+    question_rowid INTEGER NOT NULL,
+    knowledge_point TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_knowledge_point ON question_knowledge(knowledge_point, question_rowid);
+CREATE INDEX IF NOT EXISTS idx_knowledge_question ON question_knowledge(question_rowid);
+
+-- rowid 与 questions.rowid 一致，保存切分后的检索词
+CREATE VIRTUAL TABLE IF NOT EXISTS questions_fts USING fts5(content, explanation, tokenize='unicode61');
+"""
+
+
+def fts_text(text: str) -> str:
+    """写入全文索引的文本：检索词以空格分隔"""
+    return " ".join(tokenize(text or ""))
+
+
+def fts_query(text: str) -> str:
+    """将查询文本转换为FTS5表达式：空格分隔的每段作为一个短语，各段同时满足"""
+    phrases = []
+    for part in text.split():
+        terms = tokenize(part)
+        if terms:
+            phrases.append('"' + " ".join(terms) + '"')
+    return " AND ".join(phrases)
+
+
+class QuestionStore:
+    """基于SQLite的题目数据库"""
+
+    def __init__(self, db_path: str = DEFAULT_STORE_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.executescript(SCHEMA)
+
+    def replace_year(self, year: int, source: str, questions: List[Dict]):
+        """在一个事务中替换某年份某来源的全部题目"""
+        with self.conn:
+            old_rowids = {rowid for rowid, in self.conn.execute(
+                "SELECT rowid FROM questions WHERE year = ? AND source = ?", (year, source))}
+            # 同ID的题目可能登记在其他年份下（如年份推断有误），一并删除，避免全文索引残留
+            ids = [q['id'] for q in questions]
+            for start in range(0, len(ids), 500):
+                batch = ids[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                old_rowids.update(rowid for rowid, in self.conn.execute(
+                    f"SELECT rowid FROM questions WHERE source = ? AND id IN ({placeholders})", [source] + batch))
+
+            old_rowids = [(rowid,) for rowid in old_rowids]
+            self.conn.executemany("DELETE FROM questions_fts WHERE rowid = ?", old_rowids)
+            self.conn.executemany("DELETE FROM question_knowledge WHERE question_rowid = ?", old_rowids)
+            self.conn.executemany("DELETE FROM questions WHERE rowid = ?", old_rowids)
+
+            for q in questions:
+                cursor = self.conn.execute(
+                    "INSERT INTO questions "
+                    "(id, source, year, type, confidence, page_num, content, explanation, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (q['id'], source, year, q['type'], q.get('confidence'), q.get('page_num'),
+                     q.get('content') or "", q.get('explanation') or "",
+                     json.dumps(q, ensure_ascii=False)))
+                rowid = cursor.lastrowid
+                self.conn.execute(
+                    "INSERT INTO questions_fts (rowid, content, explanation) VALUES (?, ?, ?)",
+                    (rowid, fts_text(q.get('content')), fts_text(q.get('explanation'))))
+                self.conn.executemany(
+                    "INSERT INTO question_knowledge (question_rowid, knowledge_point) VALUES (?, ?)",
+                    [(rowid, kp) for kp in q.get('knowledgePoints') or []])
+
+    def delete_year(self, year: int, source: str):
+        """删除某年份某来源的全部题目（该年份的源PDF已删除）"""
+        self.replace_year(year, source, [])
+
+    def stream_year(self, questions: Iterable, year: int, to_dict: Callable,
+                    source: str = 'candidate') -> Iterator:
+        """原样产出流经的题目，全部产出后整年一次写入数据库（中途出错则不写入）"""
+        rows = []
+        for question in questions:
+            rows.append(to_dict(question))
+            yield question
+        self.replace_year(year, source, rows)
+
+    def load_json_dir(self, data_dir: str = "data") -> Dict[str, int]:
+        """载入目录下所有 real-exam-YYYY.json 和 real-exam-YYYY.candidate.(json|ndjson)，返回 {文件名: 题目数}
+
+        同一年份同时存在 JSON 和 NDJSON 候选文件时无法确定哪个是最新导入的，不载入任何文件并抛出 ValueError
+        """
+        files = {}  # (年份, 来源) -> [路径, ...]
+        for path in sorted(Path(data_dir).iterdir()):
+            match = YEAR_FILE_PATTERN.match(path.name)
+            if match:
+                source = 'candidate' if match.group(2) else 'final'
+                files.setdefault((int(match.group(1)), source), []).append(path)
+
+        conflicts = [" 和 ".join(path.name for path in paths) for paths in files.values() if len(paths) > 1]
+        if conflicts:
+            raise ValueError(f"同一年份存在多个候选文件，请删除过期的一个: {'; '.join(conflicts)}")
+
+        loaded = {}
+        for (year, source), (path,) in files.items():
+            with open(path, 'r', encoding='utf-8') as f:
+                questions = parse_questions(f.read(), path)
+            self.replace_year(year, source, questions)
+            loaded[path.name] = len(questions)
+        return loaded
+
+    def search(self, text: str = "", year: Optional[int] = None, question_type: Optional[str] = None,
+               knowledge_point: Optional[str] = None, min_confidence: Optional[float] = None,
+               source: Optional[str] = None, limit: int = 50) -> List[Dict]:
+        """按全文和条件查询，有全文条件时按相关度排序，否则按年份、题号排序
+
+        检索文本中没有可检索的词（如只有标点、单个字母）时返回空结果，不会忽略全文条件
+        """
+        conditions, params = [], []
+        query = fts_query(text) if text.strip() else ""
+        if text.strip() and not query:
+            return []
+
+        if query:
+            sql = ("SELECT q.id, q.source, q.year, q.type, q.confidence, q.content, q.explanation "
+                   "FROM questions_fts f JOIN questions q ON q.rowid = f.rowid")
+            conditions.append("questions_fts MATCH ?")
+            params.append(query)
+            order = "f.rank"
+        else:
+            sql = ("SELECT q.id, q.source, q.year, q.type, q.confidence, q.content, q.explanation "
+                   "FROM questions q")
+            order = "q.year DESC, q.rowid"
+
+        if year is not None:
+            conditions.append("q.year = ?")
+            params.append(year)
+        if question_type:
+            conditions.append("q.type = ?")
+            params.append(question_type)
+        if knowledge_point:
+            conditions.append("q.rowid IN (SELECT question_rowid FROM question_knowledge WHERE knowledge_point = ?)")
+            params.append(knowledge_point)
+        if min_confidence is not None:
+            conditions.append("q.confidence >= ?")
+            params.append(min_confidence)
+        if source:
+            conditions.append("q.source = ?")
+            params.append(source)
+
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += f" ORDER BY {order} LIMIT ?"
+        params.append(limit)
+
+        columns = ['id', 'source', 'year', 'type', 'confidence', 'content', 'explanation']
+        return [dict(zip(columns, row)) for row in self.conn.execute(sql, params)]
+
+    def get(self, question_id: str, source: str = 'final') -> Optional[Dict]:
+        row = self.conn.execute("SELECT data FROM questions WHERE source = ? AND id = ?",
+                                (source, question_id)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def close(self):
+        self.conn.close()
+
+
+def preview(text: str, keyword: str, width: int = 30) -> str:
+    """截取关键词附近的文本"""
+    text = text.replace('\n', ' ')
+    position = text.find(keyword) if keyword else -1
+    if position < 0:
+        return text[:width * 2] + ('...' if len(text) > width * 2 else '')
+    start = max(0, position - width)
+    return ('...' if start else '') + text[start:position + len(keyword) + width] + '...'
+
+
+def main():
+    """主函数"""
+    arg_parser = argparse.ArgumentParser(description="题目数据库查询")
+    arg_parser.add_argument("text", nargs="?", default="", help="检索文本（中文至少2字，空格分隔表示同时包含）")
+    arg_parser.add_argument("--db", default=DEFAULT_STORE_PATH, help="数据库路径")
+    arg_parser.add_argument("--load", action="store_true", help="载入 data/ 下的真题和候选JSON（含NDJSON）")
+    arg_parser.add_argument("--year", type=int, help="年份")
+    arg_parser.add_argument("--type", choices=['choice', 'blank', 'solve'], help="题型")
+    arg_parser.add_argument("--kp", help="知识点ID")
+    arg_parser.add_argument("--min-confidence", type=float, help="最低置信度")
+    arg_parser.add_argument("--source", choices=['final', 'candidate'], help="只查已确认数据或导入候选")
+    arg_parser.add_argument("--limit", type=int, default=50, help="最多显示条数（默认50）")
+    args = arg_parser.parse_args()
+
+    store = QuestionStore(args.db)
+
+    if args.load:
+        try:
+            loaded = store.load_json_dir()
+        except ValueError as e:
+            print(f"❌ {e}")
+            store.close()
+            sys.exit(1)
+        for name, count in loaded.items():
+            print(f"已载入 {name}: {count} 题")
+
+    if args.text or any(v is not None for v in (args.year, args.type, args.kp, args.min_confidence, args.source)):
+        start = time.perf_counter()
+        results = store.search(args.text, year=args.year, question_type=args.type, knowledge_point=args.kp,
+                               min_confidence=args.min_confidence, source=args.source, limit=args.limit)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        if args.text.strip() and not fts_query(args.text):
+            print("⚠️ 检索文本中没有可检索的词（中文、LaTeX命令或至少2个字母的英文单词）")
+
+        keyword = args.text.split()[0] if args.text.split() else ""
+        for r in results:
+            text = r['content'] if keyword in r['content'] or keyword not in r['explanation'] else r['explanation']
+            print(f"{r['id']:<12} {r['source']:<9} {r['type']:<6} {preview(text, keyword)}")
+        print(f"共 {len(results)} 条 ({elapsed:.1f} ms)")
+
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+检索词切分 - 考研数学学习助手
+知识点标注、题目数据库和全文检索索引共用的分词规则，只依赖标准库：
+中文按字二元组切分，LaTeX命令和英文单词作为整体
+"""
+
+import re
+from typing import List
+
+# 中文按字二元组切分，LaTeX命令和英文单词作为整体
+TERM_PATTERN = re.compile(r'[一-鿿]+|\\[A-Za-z]+|[A-Za-z]{2,}')
+
+
+def tokenize(text: str) -> List[str]:
+    """切分为检索词：中文字二元组、LaTeX命令、英文单词"""
+    terms = []
+    for match in TERM_PATTERN.finditer(text):
+        token = match.group()
+        if '一' <= token[0] <= '鿿':
+            if len(token) == 1:
+                terms.append(token)
+            else:
+                terms.extend(token[i:i + 2] for i in range(len(token) - 1))
+        else:
+            terms.append(token.lower())
+    return terms
+
+
+def question_text(content: str, options: List[str] = None, explanation: str = "") -> str:
+    """参与检索和标注的题目文本：题干 + 选项 + 解析"""
+    return "\n".join([content or ""] + list(options or []) + [explanation or ""])
@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+"""
+历年真题数据验证 - 考研数学学习助手
+与 scripts/validate_real_exam.js 规则相同（题目数量、ID格式、候选/正式文件的严格程度），
+可在导入脚本中直接调用，无需 Node
+
+- 正则表达式在模块加载时编译一次，各题型的校验函数按类型分派
+- 多个文件并行校验（进程池）
+- 校验结果按 文件内容哈希 + 年份 + 是否候选 + 规则版本 缓存在 tmp/validation_cache.json，
+  只有内容变化的文件才重新校验
+
+用法:
+  python scripts/validate_real_exam.py                       # 与 validate_real_exam.js 相同：逐年校验并生成审核报告
+  python scripts/validate_real_exam.py data/real-exam-2024.candidate.json [...]
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+REVIEW_DIR = Path(__file__).parent.parent / "review"
+DEFAULT_CACHE_PATH = "tmp/validation_cache.json"
+
+EXPECTED_YEARS = [2022, 2023, 2024, 2025, 2026]
+EXPECTED_QUESTION_COUNTS = {
+    'choice': 10,  # 选择题
+    'blank': 6,    # 填空题
+    'solve': 9     # 解答题
+}
+
+# 校验规则版本，修改规则时递增，使缓存的结果失效
+VALIDATOR_VERSION = 2
+
+QUESTION_ID_PATTERN = re.compile(r'^(\d+)-[cbs]-\d+$')
+# 与 validate_real_exam.js 相同：只有 A. 要求位于开头
+OPTION_PATTERN = re.compile(r'^A\.|B\.|C\.|D\.|A |B |C |D ')
+
+YEAR_FILE_PATTERN = re.compile(r'^real-exam-(\d{4})\.(candidate\.)?(json|ndjson)$')
+
+
+# ========== 验证规则 ==========
+
+def js_str(value) -> str:
+    """按JS模板字符串的方式显示值，使提示信息与 validate_real_exam.js 一致"""
+    if value is None:
+        return 'undefined'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, list):
+        return ','.join('' if item is None else js_str(item) for item in value)
+    return str(value)
+
+
+def is_blank(value) -> bool:
+    """对应JS中的 !value || value.trim().length === 0"""
+    return not value or not str(value).strip()
+
+
+def is_positive_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0
+
+
+def validate_question_id(question_id, year: int) -> bool:
+    match = QUESTION_ID_PATTERN.match(question_id) if isinstance(question_id, str) else None
+    return bool(match) and match.group(1) == str(year)
+
+
+def check_common(question: Dict, year: int, question_type: str, type_name: str, errors: List[str]):
+    """各题型共同的ID、类型、题干检查"""
+    if not question.get('id') or not validate_question_id(question.get('id'), year):
+        errors.append(f"无效的题目ID: {js_str(question.get('id'))}")
+    if question.get('type') != question_type:
+        errors.append(f"{type_name}类型应为 '{question_type}', 实际为: {js_str(question.get('type'))}")
+    if is_blank(question.get('content')):
+        errors.append('题目内容不能为空')
+
+
+def check_required(condition: bool, is_candidate: bool, errors: List[str], warnings: List[str],
+                   error: str, warning: str):
+    """正式文件中不满足的条件记为错误，候选文件中记为警告"""
+    if not condition:
+        if is_candidate:
+            warnings.append(warning)
+        else:
+            errors.append(error)
+
+
+def has_knowledge_points(question: Dict) -> bool:
+    points = question.get('knowledgePoints')
+    return isinstance(points, list) and len(points) > 0
+
+
+def validate_choice_question(question: Dict, year: int, is_candidate: bool = False) -> Dict:
+    """验证选择题"""
+    errors, warnings = [], []
+    check_common(question, year, 'choice', '选择题', errors)
+
+    options = question.get('options')
+    if not isinstance(options, list) or len(options) != 4:
+        # 与JS的 options ? options.length : 0 相同
+        count = len(options) if isinstance(options, (list, str)) else 'undefined' if options else 0
+        check_required(False, is_candidate, errors, warnings,
+                       '选择题必须有4个选项', f"选择题选项数量不正确: 期望4个, 实际{count}个")
+    else:
+        for index, option in enumerate(options):
+            if not OPTION_PATTERN.search(js_str(option)):
+                warnings.append(f"选项 {index + 1} 格式不正确: {js_str(option)}")
+
+    answer = question.get('answer')
+    check_required(answer in ('A', 'B', 'C', 'D'), is_candidate, errors, warnings,
+                   f"答案必须是A/B/C/D之一, 实际为: {js_str(answer)}", f"答案格式不正确: {js_str(answer)}")
+
+    # 候选文件可以没有解析和知识点
+    check_required(not is_blank(question.get('explanation')), is_candidate, errors, warnings,
+                   '解析内容不能为空', '解析内容为空')
+    check_required(has_knowledge_points(question), is_candidate, errors, warnings,
+                   '知识点不能为空', '知识点为空')
+
+    return {'valid': not errors, 'errors': errors, 'warnings': warnings}
+
+
+def validate_blank_question(question: Dict, year: int, is_candidate: bool = False) -> Dict:
+    """验证填空题"""
+    errors, warnings = [], []
+    check_common(question, year, 'blank', '填空题', errors)
+
+    check_required(not is_blank(question.get('answer')), is_candidate, errors, warnings,
+                   '答案不能为空', '答案为空')
+
+    # 候选文件可以没有解析和知识点
+    check_required(not is_blank(question.get('explanation')), is_candidate, errors, warnings,
+                   '解析内容不能为空', '解析内容为空')
+    check_required(has_knowledge_points(question), is_candidate, errors, warnings,
+                   '知识点不能为空', '知识点为空')
+
+    return {'valid': not errors, 'errors': errors, 'warnings': warnings}
+
+
+def validate_solve_question(question: Dict, year: int, is_candidate: bool = False) -> Dict:
+    """验证解答题"""
+    errors, warnings = [], []
+    check_common(question, year, 'solve', '解答题', errors)
+
+    check_required(not is_blank(question.get('solution')), is_candidate, errors, warnings,
+                   '解题步骤不能为空', '解题步骤为空')
+
+    score = question.get('score')
+    check_required(is_positive_number(score), is_candidate, errors, warnings,
+                   f"分数必须是正数, 实际为: {js_str(score)}", f"分数格式不正确: {js_str(score)}")
+
+    # 候选文件可以没有知识点
+    check_required(has_knowledge_points(question), is_candidate, errors, warnings,
+                   '知识点不能为空', '知识点为空')
+
+    return {'valid': not errors, 'errors': errors, 'warnings': warnings}
+
+
+QUESTION_VALIDATORS: Dict[str, Callable[[Dict, int, bool], Dict]] = {
+    'choice': validate_choice_question,
+    'blank': validate_blank_question,
+    'solve': validate_solve_question,
+}
+
+
+def validate_question(question: Dict, year: int, is_candidate: bool = False) -> Dict:
+    """验证单个题目"""
+    validator = QUESTION_VALIDATORS.get(question.get('type'))
+    if validator is None:
+        return {'valid': False, 'errors': [f"未知的题目类型: {js_str(question.get('type'))}"], 'warnings': []}
+    return validator(question, year, is_candidate)
+
+
+def base_result(year: int, is_candidate: bool, total_questions: int = 0) -> Dict:
+    """校验结果的公共字段，题目统计为0"""
+    return {
+        'year': year,
+        'valid': True,
+        'totalQuestions': total_questions,
+        'questionCounts': {'choice': 0, 'blank': 0, 'solve': 0},
+        'errors': [],
+        'warnings': [],
+        'isCandidate': is_candidate,
+    }
+
+
+def failed_result(year: int, path: Path, error: str) -> Dict:
+    """文件无法读取或解析时的校验结果，字段与正常结果相同，可直接生成审核报告"""
+    result = base_result(year, is_candidate_path(path))
+    result['valid'] = False
+    result['errors'].append(error)
+    return result
+
+
+def validate_year_data(questions: List[Dict], year: int, is_candidate: bool = False) -> Dict:
+    """验证整个年份的题目"""
+    results = base_result(year, is_candidate, len(questions))
+
+    for q in questions:
+        if q.get('type') in results['questionCounts']:
+            results['questionCounts'][q['type']] += 1
+
+    # 检查题目数量（仅对正式文件）
+    if not is_candidate:
+        for question_type, expected in EXPECTED_QUESTION_COUNTS.items():
+            actual = results['questionCounts'][question_type]
+            if actual != expected:
+                results['warnings'].append(f"{question_type}题数量不匹配: 期望{expected}题, 实际{actual}题")
+
+    for index, question in enumerate(questions):
+        question_result = validate_question(question, year, is_candidate)
+        if not question_result['valid']:
+            results['valid'] = False
+            results['errors'].append(f"第{index + 1}题 ({js_str(question.get('id'))}): {', '.join(question_result['errors'])}")
+        if question_result['warnings']:
+            results['warnings'].append(f"第{index + 1}题 ({js_str(question.get('id'))}): {', '.join(question_result['warnings'])}")
+
+    # 检查ID唯一性
+    seen, duplicate_ids = set(), []
+    for q in questions:
+        if q.get('id') in seen:
+            duplicate_ids.append(js_str([q.get('id')]))
+        seen.add(q.get('id'))
+    if duplicate_ids:
+        results['valid'] = False
+        results['errors'].append(f"发现重复的题目ID: {', '.join(duplicate_ids)}")
+
+    return results
+
+
+def is_candidate_path(path: Path) -> bool:
+    return '.candidate.' in Path(path).name
+
+
+def parse_questions(text: str, path: Path):
+    """解析JSON数组或NDJSON（每行一题）"""
+    if Path(path).suffix == '.ndjson':
+        # 不使用 splitlines：题目文本中的 \x1c 等字符也会被当作换行
+        return [json.loads(line) for line in text.split('\n') if line.strip()]
+    return json.loads(text)
+
+
+def validate_text(text: str, path: str, year: int) -> Dict:
+    """验证文件内容（可在子进程中执行）"""
+    try:
+        questions = parse_questions(text, Path(path))
+    except ValueError as e:
+        return failed_result(year, Path(path), f"文件解析失败: {e}")
+
+    if not isinstance(questions, list) or not all(isinstance(q, dict) for q in questions):
+        return failed_result(year, Path(path), '文件内容必须是题目数组')
+    return validate_year_data(questions, year, is_candidate_path(Path(path)))
+
+
+# ========== 批量校验和缓存 ==========
+
+class RealExamValidator:
+    """并行校验多个文件，按内容哈希缓存结果"""
+
+    def __init__(self, cache_path: Optional[str] = DEFAULT_CACHE_PATH, workers: int = 0):
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.hits = 0
+        self.misses = 0
+        # {文件路径: {"key": 缓存键, "result": 校验结果}}，每个文件只保留最近一次结果
+        self.entries: Dict[str, Dict] = {}
+        if self.cache_path and self.cache_path.exists():
+            try:
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+
+    @staticmethod
+    def make_key(data: bytes, year: int, is_candidate: bool) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        return f"{digest}:{year}:{int(is_candidate)}:{VALIDATOR_VERSION}"
+
+    def validate_files(self, files: List[Tuple[Path, int]]) -> List[Dict]:
+        """校验 [(路径, 年份)]，按输入顺序返回结果；未变化的文件直接使用缓存"""
+        results: List[Optional[Dict]] = [None] * len(files)
+        pending = []  # (序号, 路径, 文本, 缓存键)
+
+        for i, (path, year) in enumerate(files):
+            path = Path(path)
+            try:
+                data = path.read_bytes()
+            except OSError as e:
+                results[i] = failed_result(year, path, f"文件读取失败: {e}")
+                continue
+
+            key = self.make_key(data, year, is_candidate_path(path))
+            entry = self.entries.get(str(path))
+            if entry and entry['key'] == key:
+                self.hits += 1
+                results[i] = entry['result']
+                continue
+
+            self.misses += 1
+            try:
+                text = data.decode('utf-8')
+            except UnicodeDecodeError as e:
+                results[i] = failed_result(year, path, f"文件解析失败: {e}")
+                self.entries[str(path)] = {'key': key, 'result': results[i]}
+                continue
+            pending.append((i, path, text, key))
+
+        if len(pending) > 1 and self.workers > 1:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(pending))) as pool:
+                futures = [pool.submit(validate_text, text, str(path), files[i][1]) for i, path, text, _ in pending]
+                computed = [future.result() for future in futures]
+        else:
+            computed = [validate_text(text, str(path), files[i][1]) for i, path, text, _ in pending]
+
+        for (i, path, _, key), result in zip(pending, computed):
+            results[i] = result
+            self.entries[str(path)] = {'key': key, 'result': result}
+        return results
+
+    def validate_file(self, path: Path, year: int) -> Dict:
+        return self.validate_files([(path, year)])[0]
+
+    def save(self):
+        """写入缓存，删除已不存在的文件的记录"""
+        if not self.cache_path:
+            return
+        entries = {path: entry for path, entry in self.entries.items() if Path(path).exists()}
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, ensure_ascii=False)
+        os.replace(tmp_path, self.cache_path)
+
+    def format_stats(self) -> str:
+        return f"校验缓存: 命中 {self.hits}, 重新校验 {self.misses}"
+
+
+# ========== 文件查找和报告 ==========
+
+def find_year_file(year: int, data_dir: Path = DATA_DIR) -> Optional[Path]:
+    """某年份要校验的文件：优先候选文件（JSON或NDJSON），否则正式文件
+
+    JSON 和 NDJSON 候选文件同时存在时无法确定哪个是最新导入的，抛出 ValueError
+    """
+    candidates = [path for path in (Path(data_dir) / f"real-exam-{year}.candidate.json",
+                                    Path(data_dir) / f"real-exam-{year}.candidate.ndjson")
+                  if path.exists()]
+    if len(candidates) > 1:
+        raise ValueError(f"{year} 年同时存在 {candidates[0].name} 和 {candidates[1].name}，"
+                         f"无法确定以哪个为准，请删除过期的一个")
+    if candidates:
+        return candidates[0]
+    path = Path(data_dir) / f"real-exam-{year}.json"
+    return path if path.exists() else None
+
+
+def year_from_path(path: Path) -> Optional[int]:
+    match = YEAR_FILE_PATTERN.match(Path(path).name)
+    return int(match.group(1)) if match else None
+
+
+def format_review_report(result: Dict) -> str:
+    """候选文件审核报告（与 validate_real_exam.js 格式相同）"""
+    counts = result['questionCounts']
+    lines = [
+        f"考研数学一 {result['year']} 年真题候选数据审核报告",
+        '=' * 50,
+        '',
+        f"生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        f"验证状态: {'✅ 通过' if result['valid'] else '❌ 失败'}",
+        f"题目总数: {result['totalQuestions']}",
+        f"题目统计: {counts['choice']}选择 + {counts['blank']}填空 + {counts['solve']}解答",
+        '',
+    ]
+
+    if result['errors']:
+        lines.append('🔴 错误列表:')
+        lines.extend(f"   {index}. {error}" for index, error in enumerate(result['errors'], 1))
+        lines.append('')
+
+    if result['warnings']:
+        lines.append('🟡 警告列表 (需要人工审核):')
+        lines.extend(f"   {index}. {warning}" for index, warning in enumerate(result['warnings'], 1))
+        lines.append('')
+
+    lines.append('📝 审核建议:')
+    if result['errors']:
+        lines.append('   - 修复上述错误后重新验证')
+    if result['warnings']:
+        lines.append('   - 检查警告项，完善题目数据')
+        lines.append('   - 确认答案格式和解析内容')
+        lines.append('   - 添加正确的知识点标签')
+    if result['valid'] and not result['warnings']:
+        lines.append('   - 数据质量良好，可以转换为正式文件')
+    return '\n'.join(lines) + '\n'
+
+
+def review_report_path(year: int, review_dir: Path = REVIEW_DIR) -> Path:
+    return Path(review_dir) / f"{year}_review_report.txt"
+
+
+def write_review_report(result: Dict, review_dir: Path = REVIEW_DIR) -> Path:
+    report_path = review_report_path(result['year'], review_dir)
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(format_review_report(result), encoding='utf-8')
+    return report_path
+
+
+def print_result(result: Dict):
+    year = result['year']
+    print(f"{'✅' if result['valid'] else '❌'} {year} 年{'候选' if result['isCandidate'] else ''}数据验证"
+          f"{'通过' if result['valid'] else '失败'}")
+    if result['errors']:
+        print('   错误:')
+        for error in result['errors']:
+            print(f"     - {error}")
+    if result['warnings']:
+        print('   警告:')
+        for warning in result['warnings']:
+            print(f"     - {warning}")
+    if 'questionCounts' in result:
+        counts = result['questionCounts']
+        print(f"   题目统计: {counts['choice']}选择 + {counts['blank']}填空 + {counts['solve']}解答 = "
+              f"{result['totalQuestions']}题")
+    print()
+
+
+def main():
+    """主函数"""
+    arg_parser = argparse.ArgumentParser(description="历年真题数据验证")
+    arg_parser.add_argument("files", nargs="*", help="要校验的文件，省略时按年份校验 data/ 下的文件")
+    arg_parser.add_argument("-j", "--workers", type=int, default=0, help="并行进程数（0表示使用全部CPU核心，默认0）")
+    arg_parser.add_argument("--no-cache", action="store_true", help="不使用校验缓存，全部重新校验")
+    arg_parser.add_argument("--no-report", action="store_true", help="不生成候选文件审核报告")
+    args = arg_parser.parse_args()
+
+    validator = RealExamValidator(cache_path=None if args.no_cache else DEFAULT_CACHE_PATH, workers=args.workers)
+
+    print('🔍 开始验证历年真题数据...\n')
+    files, missing_years, conflict_years = [], [], []
+    if args.files:
+        for name in args.files:
+            year = year_from_path(Path(name))
+            if year is None:
+                print(f"❌ 无法从文件名推断年份: {name}")
+                sys.exit(1)
+            files.append((Path(name), year))
+    else:
+        for year in EXPECTED_YEARS:
+            try:
+                path = find_year_file(year)
+            except ValueError as e:
+                print(f"❌ {e}")
+                conflict_years.append(year)
+                continue
+            if path is None:
+                print(f"❌ {year} 年数据文件不存在")
+                missing_years.append(year)
+            else:
+                files.append((path, year))
+
+    results = validator.validate_files(files)
+    validator.save()
+
+    for (path, _), result in zip(files, results):
+        print(f"📄 {path}")
+        print_result(result)
+        if result['isCandidate'] and not args.no_report:
+            print(f"   📄 已生成审核报告: {write_review_report(result)}\n")
+
+    invalid_count = len(missing_years) + len(conflict_years) + sum(1 for r in results if not r['valid'])
+    print('📊 验证结果摘要:')
+    print(f"   总文件数: {len(results)}")
+    print(f"   ✅ 验证通过: {sum(1 for r in results if r['valid'])}")
+    print(f"   ❌ 验证失败: {invalid_count}")
+    print(f"   📝 候选文件: {sum(1 for r in results if r['isCandidate'])}")
+    print(f"   🔴 总错误数: {sum(len(r['errors']) for r in results)}")
+    print(f"   🟡 总警告数: {sum(len(r['warnings']) for r in results)}")
+    print(f"   💾 {validator.format_stats()}")
+
+    if invalid_count == 0:
+        print('\n🎉 所有数据文件验证通过！')
+    else:
+        print('\n⚠️  发现数据问题，请检查上述错误信息。')
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()